@@ -5,13 +5,36 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
 import ollama
-import subprocess
-import threading
 import time
 import webbrowser
-import os
 import json
 
+# Χρόνος εκκίνησης της διεργασίας, για τη μέτρηση του cold start
+_T_START = time.perf_counter()
+
+# Headless πυρήνας: το GUI είναι απλός καταναλωτής των ίδιων generators με το CLI
+from ollama_studio.engine import DEFAULT_CONTEXTS, run_stress
+from ollama_studio.pulls import run_pull_queue
+from ollama_studio.loadtest import run_load_sweep
+from ollama_studio.chatbench import chat_curve, eviction_hint, run_chat_bench
+from ollama_studio.fleet import Fleet, HostRegistry, fleet_run
+from ollama_studio.embeddings import CONSISTENCY_MIN, best_batches, run_embed_sweep
+from ollama_studio.telemetry import GpuSampler
+from ollama_studio.sweep import SweepSpace, modelfile_block, run_sweep
+from ollama_studio.watchdog import LatencyWatchdog, WatchdogPolicy
+from ollama_studio.metrics import DEFAULT_PORT, MetricsExporter, MetricsServer, configured_port
+from ollama_studio.history import HistoryStore, recorded, check_regressions, format_finding
+from ollama_studio.server import run_context
+from ollama_studio.trials import TrialPolicy, aggregate_trials
+from ollama_studio.thermal import THROTTLE_MASK, ThermalPolicy, throttle_names, throttle_summary
+from ollama_studio.autotune import AutotuneStore, run_autotune
+from ollama_studio.tournament import run_tournament, summarize_tournament
+from ollama_studio.dispatch import UiDispatcher
+from ollama_studio.catalog import ModelCache, format_model_info
+from ollama_studio.paths import data_path
+from ollama_studio.workloads import CORPORA, Workload
+from ollama_studio.vram import VramCalibration, annotate_vram, fitting_contexts, preflight, vram_budget
+
 # --- ΡΥΘΜΙΣΗ ΓΙΑ ΚΑΘΑΡΑ ΓΡΑΜΜΑΤΑ (DPI AWARENESS) ---
 try:
     from ctypes import windll
@@ -19,6 +42,57 @@ try:
 except Exception:
     pass
 
+# Μέγιστες γραμμές της κονσόλας (ring buffer: οι παλαιότερες σβήνονται)
+LOG_MAX_LINES = 1000
+
+# --- ΜΟΡΦΟΠΟΙΗΣΗ ΓΙΑ ΤΟΥΣ ΠΙΝΑΚΕΣ ---
+def format_gpu_window(rec):
+    """Κείμενα (VRAM, Temp, Util/Clock) για μια γραμμή πίνακα από ένα stress record."""
+    vram_info = f"{rec['vram_peak']:.0f} MB (μ {rec['vram_mean']:.0f})" if rec.get('vram_peak') is not None else "N/A"
+    temp_info = f"{rec['temp_peak']:.0f}°C" if rec.get('temp_peak') is not None else "N/A"
+    util_info = f"{rec['util_mean']:.0f}%" if rec.get('util_mean') is not None else "N/A"
+    if rec.get('sm_clock_min') is not None:
+        util_info += f" / {rec['sm_clock_min']:.0f} MHz"
+    return (vram_info, temp_info, util_info)
+
+def format_embed_row(rec, status):
+    """Γραμμή του πίνακα Embeddings από ένα embed record."""
+    return (rec["input_tokens"], rec["batch"], rec["dim"], f"{rec['vectors_per_s']:.1f}", f"{rec['tokens_per_s']:.0f}",
+            f"{rec['lat_p50'] * 1000:.0f} ms", f"{rec['lat_p95'] * 1000:.0f} ms", f"{rec['consistency']:.4f}", status)
+
+def format_sweep_row(rec, status):
+    """Γραμμή του πίνακα Options Sweep από ένα sweep record."""
+    def opt(key):
+        return rec[key] if rec.get(key) is not None else "—"
+    fa = {True: "on", False: "off"}.get(rec.get("flash_attention"), "—")
+    tps = f"{rec['eval_tps']:.2f}" if rec.get("eval_tps") is not None else "N/A"
+    ttft = f"{rec['ttft'] * 1000:.0f} ms" if rec.get("ttft") is not None else "N/A"
+    memory = f"{rec['memory_mb']:.0f} MB" if rec.get("memory_mb") is not None else "N/A"
+    return (rec["model"], opt("quantization"), opt("num_batch"), opt("num_thread"), opt("num_gpu"), fa,
+            opt("kv_cache_type"), tps, ttft, memory, status)
+
+def format_vram_estimate(rec):
+    """Κείμενο "εκτίμηση / size_vram του ps" σε MB για μια γραμμή πίνακα."""
+    if rec.get('vram_predicted') is None:
+        return "N/A"
+    observed = f"{rec['vram_observed']:.0f}" if rec.get('vram_observed') is not None else "—"
+    return f"{rec['vram_predicted']:.0f} / {observed} MB"
+
+def format_prefill(rec):
+    """Κείμενο "Prefill TPS (tokens prompt)"."""
+    if not rec.get('prompt_eval_count'):
+        return "N/A"
+    return f"{rec['prefill_tps']:.0f} ({rec['prompt_eval_count']:.0f})"
+
+def format_latency(rec):
+    """Κείμενα (Wall TPS, TTFT, p50, p95, p99) ή N/A όταν το run δεν ήταν streaming."""
+    if rec.get('ttft') is None:
+        return ("N/A",) * 5
+    return (
+        f"{rec['wall_tps']:.2f}", f"{rec['ttft'] * 1000:.0f} ms",
+        f"{rec['gap_p50']:.1f} ms", f"{rec['gap_p95']:.1f} ms", f"{rec['gap_p99']:.1f} ms"
+    )
+
 class OllamaMasterStudio:
     def __init__(self, root):
         self.root = root
@@ -28,6 +102,8 @@ class OllamaMasterStudio:
 
         # Αρχικοποίηση μεταβλητών
         self.running_test = False
+        # Worker pool + batched UI ενημερώσεις (κανένα widget δεν αγγίζεται από worker thread)
+        self.ui = UiDispatcher(root)
         self.create_help_guide()
         
         # Ρύθμιση Styles
@@ -38,12 +114,64 @@ class OllamaMasterStudio:
         # Κατασκευή του UI
         self.setup_main_layout()
         self.setup_tabs_content() # <--- FIXED: Call setup_tabs_content here
+        self.ui.log_sink = self._write_log
+        self.ui.start()
         
-        # Έναρξη Live Hardware Monitoring
+        # Προτάσεις num_ctx ανά digest από τον Auto-Tuner
+        self.autotune_store = AutotuneStore()
+        # Ζεύγη εκτίμησης/μέτρησης VRAM για τη βαθμονόμηση του pre-flight
+        self.vram_calibration = VramCalibration()
+        # Registry hosts για το Fleet mode (ένα pooled client ανά host)
+        self.host_registry = HostRegistry()
+        self.fleet = Fleet(self.host_registry.hosts())
+        self._show_hosts()
+        
+        # Μόνιμο ιστορικό αποτελεσμάτων (SQLite) για ανίχνευση regressions
+        try:
+            self.history = HistoryStore()
+        except Exception as e:
+            self.history = None
+            self.log(f"⚠️ Αδυναμία ανοίγματος ιστορικού: {e}", "error")
+        
+        # Cache του endpoint μετρικών: το ps έρχεται από τα probes του watchdog, όχι από τα scrapes
+        self.metrics = MetricsExporter()
+        self.metrics_server = None
+        
+        # Watchdog του API: probe ανά 5 s, p50/p99 και error rate (χωρίς αυτόματη επανεκκίνηση εκτός αν ζητηθεί)
+        self.watchdog = LatencyWatchdog(
+            policy=WatchdogPolicy(p99_ms=2000, error_rate=0.5), log=self.log,
+            on_restart=lambda rec: self.ui.call(self._after_restart, rec), tap=self.metrics.ps_tap
+        )
+        self.watchdog.start()
+        
+        # Έναρξη Live Hardware Monitoring (ένα μακρόβιο nvidia-smi για όλη την εφαρμογή)
+        self.gpu_sampler = GpuSampler()
+        self.gpu_sampler.start()
+        self.metrics.sampler, self.metrics.watchdog = self.gpu_sampler, self.watchdog
+        if configured_port() is not None:
+            self.metrics_var.set(True)
+            self.toggle_metrics_server()
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
         self.update_live_hw()
         
-        # Φόρτωση μοντέλων
+        # Φόρτωση μοντέλων: άμεσα από τη cache, μετά reconcile στο παρασκήνιο
+        self.model_cache = ModelCache()
+        self.model_info = {}
+        cached = self.model_cache.models()
+        if cached:
+            self._apply_model_list(cached, announce=False)
         self.load_models_to_combos()
+        self.root.after_idle(self._report_cold_start, len(cached))
+
+    def _report_cold_start(self, cached):
+        """Καταγράφει τον χρόνο μέχρι το πρώτο idle του main loop (παράθυρο έτοιμο)."""
+        elapsed = time.perf_counter() - _T_START
+        self.log(f"⏱️ Cold start: {elapsed * 1000:.0f} ms ({cached} μοντέλα από cache)")
+        try:
+            with open(data_path("startup.jsonl"), "a", encoding="utf-8") as f:
+                f.write(json.dumps({"ts": time.time(), "cold_start": elapsed, "cached_models": cached}) + "\n")
+        except OSError:
+            pass
 
     def configure_styles(self):
         """Ρυθμίσεις εμφάνισης για όλα τα γραφικά στοιχεία."""
@@ -91,7 +219,7 @@ class OllamaMasterStudio:
         )
 
     def create_help_guide(self):
-        """Δημιουργεί αυτόματα ένα αρχείο οδηγιών για τον χρήστη."""
+        """Δημιουργεί το αρχείο οδηγιών για τον χρήστη, μόνο αν λείπει ή έχει αλλάξει."""
         path = "Ollama_User_Guide.txt"
         content = (
             "OLLAMA AI STUDIO v12.5 - ΟΔΗΓΙΕΣ ΧΡΗΣΗΣ\n"
@@ -102,6 +230,12 @@ class OllamaMasterStudio:
             "4. KEEP ALIVE: Η τιμή -1 κρατάει το μοντέλο φορτωμένο επ' αόριστον.\n"
             "5. HARDWARE: Αν η θερμοκρασία GPU ξεπεράσει τους 80C, κάντε διάλειμμα.\n"
         )
+        try:
+            with open(path, encoding="utf-8") as f:
+                if f.read() == content:
+                    return
+        except Exception:
+            pass
         try:
             with open(path, "w", encoding="utf-8") as f:
                 f.write(content)
@@ -124,6 +258,12 @@ class OllamaMasterStudio:
         )
         self.gpu_label.pack(side=tk.LEFT, padx=25)
 
+        # Label για το watchdog του API (latency p50/p99 και σφάλματα)
+        self.api_label = tk.Label(
+            self.top_bar, text="📡 API: αναμονή probes...", bg="white", font=("Segoe UI", 10), fg="#64748b"
+        )
+        self.api_label.pack(side=tk.LEFT, padx=10)
+
         # Frame για τα System Buttons (Δεξιά στο Top Bar)
         sys_btn_frame = tk.Frame(self.top_bar, bg="white")
         sys_btn_frame.pack(side=tk.RIGHT, padx=20)
@@ -185,6 +325,21 @@ class OllamaMasterStudio:
         self.keep_alive_combo.set("15m")
         self.keep_alive_combo.pack(side=tk.LEFT, padx=5)
 
+        # Αυτόματη επανεκκίνηση όταν ο watchdog βρει τον server κολλημένο
+        self.auto_restart_var = tk.BooleanVar(value=False)
+        tk.Checkbutton(
+            self.api_panel, text="Auto-restart (watchdog)", variable=self.auto_restart_var,
+            command=lambda: setattr(self.watchdog.policy, "auto_restart", self.auto_restart_var.get()),
+            bg="white", font=("Segoe UI", 9)
+        ).pack(side=tk.LEFT, padx=10)
+
+        # Endpoint Prometheus/OpenMetrics (σερβίρει τις τιμές που ήδη συλλέγονται)
+        self.metrics_var = tk.BooleanVar(value=False)
+        tk.Checkbutton(
+            self.api_panel, text=f"📈 Metrics :{configured_port() or DEFAULT_PORT}", variable=self.metrics_var,
+            command=self.toggle_metrics_server, bg="white", font=("Segoe UI", 9)
+        ).pack(side=tk.LEFT, padx=10)
+
         # Κουμπί Force Unload (Κόκκινο)
         self.btn_unload = tk.Button(
             self.api_panel, text="🛑 Επιβολή Unload", 
@@ -200,50 +355,106 @@ class OllamaMasterStudio:
 
     # --- ΣΥΝΑΡΤΗΣΕΙΣ HARDWARE & API (Γραμμές 160-200) ---
     def get_gpu_status(self):
-        """Εκτελεί το nvidia-smi για να πάρει ζωντανά δεδομένα."""
-        try:
-            cmd = ["nvidia-smi", "--query-gpu=gpu_name,memory.used,memory.total,temperature.gpu", "--format=csv,noheader,nounits"]
-            output = subprocess.check_output(cmd, encoding='utf-8', creationflags=subprocess.CREATE_NO_WINDOW)
-            name, used, total, temp = output.strip().split(", ")
-            return {
-                "name": name,
-                "used": int(used),
-                "total": int(total),
-                "temp": temp,
-                "display": f"🎮 {name} | 🌡️ {temp}°C | 💾 VRAM: {used}/{total} MB"
-            }
-        except FileNotFoundError:
-            return None
-        except Exception as e:
-            # self.log(f"GPU Error: {e}", "error") # Avoid flooding logs here
+        """Τελευταίο δείγμα από τον GpuSampler (χωρίς νέο nvidia-smi process)."""
+        sample = self.gpu_sampler.latest()
+        if not sample or sample["used"] is None:
             return None
+        used, total = int(sample["used"]), int(sample["total"] or 0)
+        temp = int(sample["temp"] or 0)
+        display = f"🎮 {sample['name']} | 🌡️ {temp}°C | 💾 VRAM: {used}/{total} MB"
+        if sample.get("sm_clock"):
+            display += f" | ⏱️ {sample['sm_clock']:.0f} MHz"
+        # Μόνο θερμικοί / hardware λόγοι (το power cap υπό φορτίο είναι φυσιολογικό)
+        reasons = throttle_names((sample.get("throttle") or 0) & THROTTLE_MASK)
+        if reasons:
+            display += f" | 🔥 {', '.join(reasons)}"
+        return {
+            "name": sample["name"],
+            "used": used,
+            "total": total,
+            "temp": temp,
+            "throttled": bool(reasons),
+            "display": display
+        }
 
     def update_live_hw(self):
         """Ανανεώνει την ετικέτα της GPU κάθε 2 δευτερόλεπτα."""
         status = self.get_gpu_status()
         if status:
             self.gpu_label.config(text=status["display"])
-            # Αλλαγή χρώματος αν η GPU ζεσταθεί πολύ (>75C)
-            if int(status["temp"]) > 75:
+            # Αλλαγή χρώματος αν η GPU ζεσταθεί πολύ (>75C) ή ρίχνει clocks
+            if int(status["temp"]) > 75 or status["throttled"]:
                 self.gpu_label.config(fg="#ef4444")
             else:
                 self.gpu_label.config(fg="#1e40af")
         else:
             self.gpu_label.config(text="⚠️ GPU: Μη διαθέσιμη (NVIDIA-SMI Error)")
+        self.update_api_label()
         
         self.root.after(2000, self.update_live_hw)
 
+    def update_api_label(self):
+        """Στατιστικά του watchdog (από τη μνήμη, χωρίς νέο αίτημα στον server)."""
+        st = self.watchdog.stats()
+        if self.watchdog.restarting:
+            self.api_label.config(text="📡 API: επανεκκίνηση...", fg="#f59e0b")
+        elif not st["samples"]:
+            return
+        elif st["p50_ms"] is None or st["failures"]:
+            self.api_label.config(text=f"📡 API: χωρίς απόκριση ({st['failures']} αποτυχίες)", fg="#ef4444")
+        else:
+            errors = f" | σφάλματα {st['error_rate'] * 100:.0f}%" if st["error_rate"] else ""
+            self.api_label.config(text=f"📡 API: p50 {st['p50_ms']:.0f} ms / p99 {st['p99_ms']:.0f} ms{errors}",
+                                  fg="#ef4444" if self.watchdog.last_breach else "#15803d")
+
+    def toggle_metrics_server(self):
+        """Ανοίγει / κλείνει το /metrics (ο server τρέχει σε δικό του thread)."""
+        if self.metrics_var.get() and not self.metrics_server:
+            try:
+                self.metrics_server = MetricsServer(self.metrics, configured_port() or DEFAULT_PORT).start()
+            except OSError as e:
+                self.metrics_var.set(False)
+                self.log(f"❌ Metrics endpoint: {e}", "error")
+                return
+            self.log(f"📈 Metrics στο {self.metrics_server.url}", "success")
+        elif not self.metrics_var.get() and self.metrics_server:
+            self.metrics_server.stop()
+            self.metrics_server = None
+            self.log("📈 Το metrics endpoint έκλεισε.")
+
+    def on_close(self):
+        """Τερματίζει τον GPU sampler και το ιστορικό πριν κλείσει το παράθυρο."""
+        self.gpu_sampler.stop()
+        self.watchdog.stop()
+        if self.metrics_server:
+            self.metrics_server.stop()
+        self.ui.shutdown()
+        self.fleet.close()
+        if self.history:
+            self.history.close()
+        self.root.destroy()
+
     def log(self, message, type="info"):
-        """Κεντρική συνάρτηση καταγραφής στο Log Area."""
+        """Κεντρική συνάρτηση καταγραφής στο Log Area (ασφαλής από οποιοδήποτε thread)."""
         timestamp = time.strftime("%H:%M:%S")
+        self.ui.log(f"[{timestamp}] {message}", type)
+
+    def _write_log(self, lines):
+        """Γράφει όλες τις γραμμές ενός frame με ένα insert και κόβει την κονσόλα στις LOG_MAX_LINES."""
         self.log_text.config(state="normal")
-        color_tag = "cyan"
-        if type == "error": color_tag = "red"
-        if type == "success": color_tag = "green"
-        
-        self.log_text.insert(tk.END, f"[{timestamp}] {message}\n")
+        args = []
+        for line, type in lines:
+            color_tag = "cyan"
+            if type == "error": color_tag = "red"
+            if type == "success": color_tag = "green"
+            args += [line + "\n", color_tag]
+        self.log_text.insert(tk.END, *args)
+        excess = int(self.log_text.index("end-1c").split(".")[0]) - 1 - LOG_MAX_LINES
+        if excess > 0:
+            self.log_text.delete("1.0", f"{excess + 1}.0")
         self.log_text.see(tk.END)
         self.log_text.config(state="disabled")
+
     def setup_tabs_content(self):
         """Δημιουργία των περιεχομένων για κάθε Tab."""
         # --- TAB 1: STRESS TEST ---
@@ -264,57 +475,381 @@ class OllamaMasterStudio:
         )
         self.btn_run_stress.pack(side=tk.LEFT, padx=15)
 
+        self.btn_autotune = tk.Button(
+            stress_ctrl, text="🎯 Auto-Tune num_ctx",
+            command=self.start_autotune_thread,
+            bg="#6366f1", fg="white", relief="flat", padx=15, font=("Segoe UI Bold", 9)
+        )
+        self.btn_autotune.pack(side=tk.LEFT, padx=5)
+
+        # Streaming mode: μέτρηση TTFT και inter-token latency ανά chunk
+        self.stream_var = tk.BooleanVar(value=True)
+        tk.Checkbutton(
+            stress_ctrl, text="Streaming (TTFT / Latency)", variable=self.stream_var,
+            bg="#f8fafc", font=("Segoe UI", 9)
+        ).pack(side=tk.LEFT, padx=5)
+
+        # Pre-flight VRAM: παράλειψη (αντί για απλή προειδοποίηση) ρυθμίσεων που θα ξεχείλιζαν στη CPU
+        self.preflight_skip = tk.BooleanVar(value=False)
+        tk.Checkbutton(
+            stress_ctrl, text="Παράλειψη contexts που δεν χωρούν στη VRAM", variable=self.preflight_skip,
+            bg="#f8fafc", font=("Segoe UI", 9)
+        ).pack(side=tk.LEFT, padx=5)
+
+        # Trial controller: warm-up, cold/warm και επανάληψη μέχρι στενό CI
+        trial_ctrl = tk.Frame(self.tab_stress, bg="#f8fafc")
+        trial_ctrl.pack(fill="x")
+        tk.Label(trial_ctrl, text="Warm-up:", bg="#f8fafc", font=("Segoe UI", 9)).pack(side=tk.LEFT, padx=(20, 5))
+        self.trial_warmup = ttk.Spinbox(trial_ctrl, from_=0, to=10, width=4)
+        self.trial_warmup.set(1)
+        self.trial_warmup.pack(side=tk.LEFT)
+        tk.Label(trial_ctrl, text="Λειτουργία:", bg="#f8fafc", font=("Segoe UI", 9)).pack(side=tk.LEFT, padx=(15, 5))
+        self.trial_mode = ttk.Combobox(trial_ctrl, values=["Warm", "Cold (keep_alive=0)"], width=18, state="readonly")
+        self.trial_mode.set("Warm")
+        self.trial_mode.pack(side=tk.LEFT)
+        tk.Label(trial_ctrl, text="Στόχος CI ±%:", bg="#f8fafc", font=("Segoe UI", 9)).pack(side=tk.LEFT, padx=(15, 5))
+        self.trial_ci = ttk.Spinbox(trial_ctrl, from_=1, to=50, width=4)
+        self.trial_ci.set(5)
+        self.trial_ci.pack(side=tk.LEFT)
+        tk.Label(trial_ctrl, text="Trials (min-max):", bg="#f8fafc", font=("Segoe UI", 9)).pack(side=tk.LEFT, padx=(15, 5))
+        self.trial_min = ttk.Spinbox(trial_ctrl, from_=1, to=50, width=4)
+        self.trial_min.set(3)
+        self.trial_min.pack(side=tk.LEFT)
+        self.trial_max = ttk.Spinbox(trial_ctrl, from_=1, to=100, width=4)
+        self.trial_max.set(10)
+        self.trial_max.pack(side=tk.LEFT, padx=5)
+
+        # Αποθηκευμένη πρόταση του Auto-Tuner για το επιλεγμένο μοντέλο
+        self.autotune_label = tk.Label(trial_ctrl, text="", bg="#f8fafc", fg="#4f46e5", font=("Segoe UI Semibold", 9))
+        self.autotune_label.pack(side=tk.LEFT, padx=20)
+        # Στοιχεία μοντέλου από την cache (παράμετροι, quantization, context, μέγεθος)
+        self.model_info_label = tk.Label(trial_ctrl, text="", bg="#f8fafc", fg="#64748b", font=("Segoe UI", 9))
+        self.model_info_label.pack(side=tk.RIGHT, padx=20)
+        self.stress_combo.bind("<<ComboboxSelected>>", lambda e: self.show_autotune_hint())
+
+        # Workload: prompt που γεμίζει ποσοστό του num_ctx (prefill) με σταθερό num_predict (decode)
+        workload_ctrl = tk.Frame(self.tab_stress, bg="#f8fafc")
+        workload_ctrl.pack(fill="x", pady=(8, 0))
+        tk.Label(workload_ctrl, text="Workload:", bg="#f8fafc", font=("Segoe UI", 9)).pack(side=tk.LEFT, padx=(20, 5))
+        self.workload_corpus = ttk.Combobox(workload_ctrl, values=["Σύντομο prompt"] + list(CORPORA), width=16, state="readonly")
+        self.workload_corpus.set("Σύντομο prompt")
+        self.workload_corpus.pack(side=tk.LEFT)
+        tk.Label(workload_ctrl, text="Γέμισμα context:", bg="#f8fafc", font=("Segoe UI", 9)).pack(side=tk.LEFT, padx=(15, 5))
+        self.workload_fill = ttk.Combobox(workload_ctrl, values=["25%", "50%", "90%"], width=6, state="readonly")
+        self.workload_fill.set("50%")
+        self.workload_fill.pack(side=tk.LEFT)
+        tk.Label(workload_ctrl, text="num_predict:", bg="#f8fafc", font=("Segoe UI", 9)).pack(side=tk.LEFT, padx=(15, 5))
+        self.workload_predict = ttk.Spinbox(workload_ctrl, from_=16, to=2048, width=6)
+        self.workload_predict.set(128)
+        self.workload_predict.pack(side=tk.LEFT)
+        tk.Label(workload_ctrl, text="(ισχύει και για το Τουρνουά)", bg="#f8fafc", fg="#64748b", font=("Segoe UI", 9)).pack(side=tk.LEFT, padx=10)
+
+        # Thermal scheduler: αναμονή ψύξης πριν από κάθε trial (Stress Test και Τουρνουά)
+        self.cool_var = tk.BooleanVar(value=False)
+        tk.Checkbutton(
+            workload_ctrl, text="❄️ Αναμονή ψύξης κάτω από", variable=self.cool_var,
+            bg="#f8fafc", font=("Segoe UI", 9)
+        ).pack(side=tk.LEFT, padx=(15, 0))
+        self.cool_below = ttk.Spinbox(workload_ctrl, from_=40, to=90, width=4)
+        self.cool_below.set(65)
+        self.cool_below.pack(side=tk.LEFT)
+        tk.Label(workload_ctrl, text="°C", bg="#f8fafc", font=("Segoe UI", 9)).pack(side=tk.LEFT, padx=(2, 0))
+
         # Μπάρα Προόδου Τεστ
         self.stress_progress = ttk.Progressbar(self.tab_stress, orient=tk.HORIZONTAL, mode='determinate', style="Blue.Horizontal.TProgressbar")
         self.stress_progress.pack(fill="x", padx=25, pady=5)
 
         # Πίνακας Αποτελεσμάτων Stress Test
-        self.tree_stress = ttk.Treeview(self.tab_stress, columns=("ctx", "tps", "vram", "temp", "status"), show="headings")
         columns = [
-            ("ctx", "Context (Tokens)"), ("tps", "Speed (Tokens/sec)"), 
-            ("vram", "VRAM Usage"), ("temp", "GPU Temp"), ("status", "Κατάσταση")
+            ("ctx", "Context (Tokens)"), ("tps", "Eval TPS (μ ± CI)"), ("prefill", "Prefill TPS (tokens)"), ("n", "Trials"),
+            ("phases", "Load/Prompt/Eval ms"), ("wall_tps", "Wall TPS"),
+            ("ttft", "TTFT"), ("p50", "Gap p50"), ("p95", "Gap p95"), ("p99", "Gap p99"),
+            ("vram", "VRAM Peak"), ("vram_est", "VRAM εκτ./ps"), ("temp", "Temp Peak"),
+            ("gpu_util", "Util / SM Clock"), ("status", "Κατάσταση")
         ]
+        self.tree_stress = ttk.Treeview(self.tab_stress, columns=[c for c, _ in columns], show="headings")
         for col, head in columns:
             self.tree_stress.heading(col, text=head)
-            self.tree_stress.column(col, anchor="center", width=120)
+            self.tree_stress.column(col, anchor="center", width=95)
         self.tree_stress.pack(fill="both", expand=True, padx=20, pady=10)
 
         # --- TAB 2: MODEL COMPARISON ---
         self.tab_compare = tk.Frame(self.notebook, bg="#f8fafc")
         self.notebook.add(self.tab_compare, text="  ⚖️ Σύγκριση Μοντέλων  ")
         
-        comp_ctrl = tk.Frame(self.tab_compare, bg="#f8fafc", pady=20)
+        comp_ctrl = tk.Frame(self.tab_compare, bg="#f8fafc", pady=15)
         comp_ctrl.pack(fill="x")
 
-        # Επιλογή Μοντέλου Α
-        tk.Label(comp_ctrl, text="Model A:", bg="#f8fafc").grid(row=0, column=0, padx=10)
-        self.combo_a = ttk.Combobox(comp_ctrl, width=25, state="readonly")
-        self.combo_a.grid(row=0, column=1)
+        # Επιλογή N μοντέλων για το τουρνουά (πολλαπλή επιλογή)
+        tk.Label(comp_ctrl, text="Μοντέλα:", bg="#f8fafc").grid(row=0, column=0, padx=10, sticky="n")
+        self.compare_list = tk.Listbox(comp_ctrl, selectmode="multiple", height=5, width=40, exportselection=False,
+                                       font=("Segoe UI", 9), relief="solid", borderwidth=1)
+        self.compare_list.grid(row=0, column=1, rowspan=2)
 
-        # Επιλογή Μοντέλου Β
-        tk.Label(comp_ctrl, text="Model B:", bg="#f8fafc").grid(row=0, column=2, padx=10)
-        self.combo_b = ttk.Combobox(comp_ctrl, width=25, state="readonly")
-        self.combo_b.grid(row=0, column=3)
+        tk.Label(comp_ctrl, text="Contexts:", bg="#f8fafc").grid(row=0, column=2, padx=10)
+        self.compare_ctx = ttk.Entry(comp_ctrl, width=16)
+        self.compare_ctx.insert(0, "8192,16384")
+        self.compare_ctx.grid(row=0, column=3)
+        tk.Label(comp_ctrl, text="Trials (max):", bg="#f8fafc").grid(row=1, column=2, padx=10)
+        self.compare_trials = ttk.Spinbox(comp_ctrl, from_=2, to=50, width=5)
+        self.compare_trials.set(10)
+        self.compare_trials.grid(row=1, column=3, sticky="w")
 
         self.btn_compare = tk.Button(
-            comp_ctrl, text="Σύγκριση Ταχύτητας", 
+            comp_ctrl, text="🏆 Έναρξη Τουρνουά", 
             command=self.start_compare_thread, 
             bg="#8b5cf6", fg="white", relief="flat", padx=20
         )
-        self.btn_compare.grid(row=0, column=4, padx=20)
+        self.btn_compare.grid(row=0, column=4, rowspan=2, padx=20)
+        tk.Checkbutton(
+            comp_ctrl, text="Παράλειψη contexts που δεν χωρούν στη VRAM", variable=self.preflight_skip,
+            bg="#f8fafc", font=("Segoe UI", 9)
+        ).grid(row=0, column=5, rowspan=2)
+
+        # Κατάταξη ανά μοντέλο και context
+        standings_cols = [
+            ("rank", "#"), ("ctx", "Context"), ("model", "Μοντέλο"), ("tps", "TPS (μ ± CI)"),
+            ("n", "Trials"), ("load", "Load (ms)")
+        ]
+        self.tree_standings = ttk.Treeview(self.tab_compare, columns=[c for c, _ in standings_cols], show="headings", height=6)
+        for col, head in standings_cols:
+            self.tree_standings.heading(col, text=head)
+            self.tree_standings.column(col, anchor="center")
+        self.tree_standings.pack(fill="both", expand=True, padx=20, pady=(10, 5))
 
-        # Πίνακας Σύγκρισης
-        self.tree_compare = ttk.Treeview(self.tab_compare, columns=("ctx", "tps_a", "tps_b", "diff", "winner"), show="headings")
+        # Πίνακας Σύγκρισης (pairwise σημαντικότητα)
         comp_cols = [
-            ("ctx", "Context"), ("tps_a", "TPS (Model A)"), 
-            ("tps_b", "TPS (Model B)"), ("diff", "Διαφορά %"), ("winner", "Νικητής")
+            ("ctx", "Context"), ("model_x", "Μοντέλο X"), ("model_y", "Μοντέλο Y"),
+            ("diff", "Διαφορά %"), ("p", "p (Holm)"), ("winner", "Νικητής")
         ]
+        self.tree_compare = ttk.Treeview(self.tab_compare, columns=[c for c, _ in comp_cols], show="headings", height=6)
         for col, head in comp_cols:
             self.tree_compare.heading(col, text=head)
             self.tree_compare.column(col, anchor="center")
-        self.tree_compare.pack(fill="both", expand=True, padx=20, pady=10)
+        self.tree_compare.pack(fill="both", expand=True, padx=20, pady=(5, 10))
+
+        # --- TAB 3: LOAD TEST (Throughput vs Concurrency) ---
+        self.tab_load = tk.Frame(self.notebook, bg="#f8fafc")
+        self.notebook.add(self.tab_load, text="  📈 Load Test  ")
+
+        load_ctrl = tk.Frame(self.tab_load, bg="#f8fafc", pady=15)
+        load_ctrl.pack(fill="x")
+
+        tk.Label(load_ctrl, text="Concurrency:", bg="#f8fafc", font=("Segoe UI Semibold", 10)).pack(side=tk.LEFT, padx=(20, 5))
+        self.load_levels = ttk.Entry(load_ctrl, width=18)
+        self.load_levels.insert(0, "1,2,4,8,16")
+        self.load_levels.pack(side=tk.LEFT, padx=5)
+
+        tk.Label(load_ctrl, text="Όριο:", bg="#f8fafc", font=("Segoe UI Semibold", 10)).pack(side=tk.LEFT, padx=(15, 5))
+        self.load_budget = ttk.Entry(load_ctrl, width=8)
+        self.load_budget.insert(0, "32")
+        self.load_budget.pack(side=tk.LEFT, padx=5)
+        self.load_mode = ttk.Combobox(load_ctrl, values=["αιτήματα", "δευτερόλεπτα"], width=12, state="readonly")
+        self.load_mode.set("αιτήματα")
+        self.load_mode.pack(side=tk.LEFT, padx=5)
+
+        self.btn_load = tk.Button(
+            load_ctrl, text="⚡ Έναρξη Load Test",
+            command=self.start_load_thread,
+            bg="#0ea5e9", fg="white", relief="flat", padx=20, font=("Segoe UI Bold", 9)
+        )
+        self.btn_load.pack(side=tk.LEFT, padx=15)
+        tk.Label(load_ctrl, text="(Μοντέλο από το Stress Test)", bg="#f8fafc", fg="#64748b", font=("Segoe UI", 9)).pack(side=tk.LEFT)
+
+        load_cols = [
+            ("conc", "Concurrency"), ("agg_tps", "Aggregate TPS"), ("rps", "Req/sec"),
+            ("scaling", "Scaling"), ("lat_p50", "Latency p50"), ("lat_p95", "Latency p95"),
+            ("lat_p99", "Latency p99"), ("ttft_p95", "TTFT p95"), ("queue", "Queue p50/p95"),
+            ("errors", "Errors")
+        ]
+        self.tree_load = ttk.Treeview(self.tab_load, columns=[c for c, _ in load_cols], show="headings")
+        for col, head in load_cols:
+            self.tree_load.heading(col, text=head)
+            self.tree_load.column(col, anchor="center", width=105)
+        self.tree_load.pack(fill="both", expand=True, padx=20, pady=10)
+
+        # --- TAB: CHAT BENCHMARK (Prefix cache reuse / eviction) ---
+        self.tab_chat = tk.Frame(self.notebook, bg="#f8fafc")
+        self.notebook.add(self.tab_chat, text="  💬 Chat Benchmark  ")
+
+        chat_ctrl = tk.Frame(self.tab_chat, bg="#f8fafc", pady=15)
+        chat_ctrl.pack(fill="x")
+
+        tk.Label(chat_ctrl, text="Sessions:", bg="#f8fafc", font=("Segoe UI Semibold", 10)).pack(side=tk.LEFT, padx=(20, 5))
+        self.chat_sessions = ttk.Spinbox(chat_ctrl, from_=1, to=16, width=4)
+        self.chat_sessions.set(3)
+        self.chat_sessions.pack(side=tk.LEFT, padx=5)
+        tk.Label(chat_ctrl, text="Turns:", bg="#f8fafc", font=("Segoe UI Semibold", 10)).pack(side=tk.LEFT, padx=(15, 5))
+        self.chat_turns = ttk.Spinbox(chat_ctrl, from_=1, to=50, width=4)
+        self.chat_turns.set(8)
+        self.chat_turns.pack(side=tk.LEFT, padx=5)
+        tk.Label(chat_ctrl, text="num_ctx:", bg="#f8fafc", font=("Segoe UI Semibold", 10)).pack(side=tk.LEFT, padx=(15, 5))
+        self.chat_ctx = ttk.Entry(chat_ctrl, width=8)
+        self.chat_ctx.insert(0, "8192")
+        self.chat_ctx.pack(side=tk.LEFT, padx=5)
+
+        self.btn_chat = tk.Button(
+            chat_ctrl, text="💬 Έναρξη Chat Benchmark",
+            command=self.start_chat_thread,
+            bg="#0ea5e9", fg="white", relief="flat", padx=20, font=("Segoe UI Bold", 9)
+        )
+        self.btn_chat.pack(side=tk.LEFT, padx=15)
+        tk.Label(chat_ctrl, text="(Μοντέλο από το Stress Test)", bg="#f8fafc", fg="#64748b", font=("Segoe UI", 9)).pack(side=tk.LEFT)
+
+        chat_cols = [
+            ("turn", "Turn"), ("cold_ttft", "TTFT cold"), ("seq_ttft", "TTFT sequential"),
+            ("inter_ttft", "TTFT interleaved"), ("cold_prompt", "Prompt cold"), ("seq_prompt", "Prompt seq"),
+            ("inter_prompt", "Prompt inter"), ("seq_reuse", "Reuse seq"), ("inter_reuse", "Reuse inter")
+        ]
+        self.tree_chat = ttk.Treeview(self.tab_chat, columns=[c for c, _ in chat_cols], show="headings")
+        for col, head in chat_cols:
+            self.tree_chat.heading(col, text=head)
+            self.tree_chat.column(col, anchor="center", width=105)
+        self.tree_chat.pack(fill="both", expand=True, padx=20, pady=10)
+
+        # --- TAB: EMBEDDINGS (Batch size × μήκος εισόδου) ---
+        self.tab_embed = tk.Frame(self.notebook, bg="#f8fafc")
+        self.notebook.add(self.tab_embed, text="  🧬 Embeddings  ")
+
+        embed_ctrl = tk.Frame(self.tab_embed, bg="#f8fafc", pady=15)
+        embed_ctrl.pack(fill="x")
+
+        tk.Label(embed_ctrl, text="Μοντέλο:", bg="#f8fafc", font=("Segoe UI Semibold", 10)).pack(side=tk.LEFT, padx=(20, 5))
+        self.embed_combo = ttk.Combobox(embed_ctrl, width=28, state="readonly")
+        self.embed_combo.pack(side=tk.LEFT, padx=5)
+        tk.Label(embed_ctrl, text="Batch:", bg="#f8fafc", font=("Segoe UI Semibold", 10)).pack(side=tk.LEFT, padx=(15, 5))
+        self.embed_batches = ttk.Entry(embed_ctrl, width=12)
+        self.embed_batches.insert(0, "1,4,16,64")
+        self.embed_batches.pack(side=tk.LEFT, padx=5)
+        tk.Label(embed_ctrl, text="Tokens/είσοδο:", bg="#f8fafc", font=("Segoe UI Semibold", 10)).pack(side=tk.LEFT, padx=(15, 5))
+        self.embed_lengths = ttk.Entry(embed_ctrl, width=12)
+        self.embed_lengths.insert(0, "64,256,1024")
+        self.embed_lengths.pack(side=tk.LEFT, padx=5)
+        tk.Label(embed_ctrl, text="Επαναλήψεις:", bg="#f8fafc", font=("Segoe UI Semibold", 10)).pack(side=tk.LEFT, padx=(15, 5))
+        self.embed_repeats = ttk.Spinbox(embed_ctrl, from_=2, to=50, width=4)
+        self.embed_repeats.set(5)
+        self.embed_repeats.pack(side=tk.LEFT, padx=5)
+
+        self.btn_embed = tk.Button(
+            embed_ctrl, text="🧬 Έναρξη Embeddings",
+            command=self.start_embed_thread,
+            bg="#0ea5e9", fg="white", relief="flat", padx=20, font=("Segoe UI Bold", 9)
+        )
+        self.btn_embed.pack(side=tk.LEFT, padx=15)
 
-        # --- TAB 3: MODEL MANAGER (Προετοιμασία) ---
+        embed_cols = [
+            ("tokens", "Tokens/είσοδο"), ("batch", "Batch"), ("dim", "Διάσταση"), ("vps", "Vectors/s"),
+            ("tps", "Tokens/s"), ("p50", "Latency p50"), ("p95", "Latency p95"), ("cons", "Συνέπεια (cos)"),
+            ("status", "Κατάσταση")
+        ]
+        self.tree_embed = ttk.Treeview(self.tab_embed, columns=[c for c, _ in embed_cols], show="headings")
+        for col, head in embed_cols:
+            self.tree_embed.heading(col, text=head)
+            self.tree_embed.column(col, anchor="center", width=105)
+        self.tree_embed.pack(fill="both", expand=True, padx=20, pady=10)
+
+        # --- TAB: FLEET (Πολλοί Ollama hosts) ---
+        self.tab_fleet = tk.Frame(self.notebook, bg="#f8fafc")
+        self.notebook.add(self.tab_fleet, text="  🌐 Fleet  ")
+
+        fleet_ctrl = tk.Frame(self.tab_fleet, bg="#f8fafc", pady=15)
+        fleet_ctrl.pack(fill="x")
+        tk.Label(fleet_ctrl, text="Όνομα:", bg="#f8fafc", font=("Segoe UI Semibold", 10)).pack(side=tk.LEFT, padx=(20, 5))
+        self.host_name = ttk.Entry(fleet_ctrl, width=12)
+        self.host_name.pack(side=tk.LEFT, padx=5)
+        tk.Label(fleet_ctrl, text="URL:", bg="#f8fafc", font=("Segoe UI Semibold", 10)).pack(side=tk.LEFT, padx=(10, 5))
+        self.host_url = ttk.Entry(fleet_ctrl, width=26)
+        self.host_url.insert(0, "192.168.1.20:11434")
+        self.host_url.pack(side=tk.LEFT, padx=5)
+        tk.Button(fleet_ctrl, text="➕ Προσθήκη", command=self.add_host, bg="#10b981", fg="white", relief="flat", padx=12).pack(side=tk.LEFT, padx=5)
+        tk.Button(fleet_ctrl, text="➖ Αφαίρεση", command=self.remove_host, bg="#ef4444", fg="white", relief="flat", padx=12).pack(side=tk.LEFT, padx=5)
+        tk.Button(fleet_ctrl, text="🔄 Ανανέωση", command=self.refresh_fleet, bg="#3b82f6", fg="white", relief="flat", padx=12).pack(side=tk.LEFT, padx=5)
+        self.btn_fleet_stress = tk.Button(
+            fleet_ctrl, text="⚡ Stress στους επιλεγμένους",
+            command=self.start_fleet_stress_thread,
+            bg="#0ea5e9", fg="white", relief="flat", padx=15, font=("Segoe UI Bold", 9)
+        )
+        self.btn_fleet_stress.pack(side=tk.LEFT, padx=15)
+        tk.Label(fleet_ctrl, text="(Μοντέλο από το Stress Test)", bg="#f8fafc", fg="#64748b", font=("Segoe UI", 9)).pack(side=tk.LEFT)
+
+        host_cols = [
+            ("name", "Host"), ("url", "URL"), ("version", "Έκδοση"), ("models", "Μοντέλα"),
+            ("loaded", "Φορτωμένα"), ("vram", "VRAM (ps)"), ("latency", "Latency"), ("status", "Κατάσταση")
+        ]
+        self.tree_hosts = ttk.Treeview(self.tab_fleet, columns=[c for c, _ in host_cols], show="headings", height=5)
+        for col, head in host_cols:
+            self.tree_hosts.heading(col, text=head)
+            self.tree_hosts.column(col, anchor="center", width=110)
+        self.tree_hosts.pack(fill="x", padx=20, pady=5)
+
+        fleet_ps_cols = [
+            ("host", "Host"), ("model", "Φορτωμένο μοντέλο"), ("size", "Μέγεθος"), ("vram", "Στη VRAM"),
+            ("gpu", "GPU %"), ("expires", "Λήξη keep_alive")
+        ]
+        self.tree_fleet_ps = ttk.Treeview(self.tab_fleet, columns=[c for c, _ in fleet_ps_cols], show="headings", height=5)
+        for col, head in fleet_ps_cols:
+            self.tree_fleet_ps.heading(col, text=head)
+            self.tree_fleet_ps.column(col, anchor="center", width=120)
+        self.tree_fleet_ps.pack(fill="x", padx=20, pady=5)
+
+        fleet_run_cols = [
+            ("host", "Host"), ("ctx", "Context"), ("tps", "Eval TPS (μ ± CI)"), ("n", "Trials"),
+            ("ttft", "TTFT"), ("status", "Κατάσταση")
+        ]
+        self.tree_fleet_runs = ttk.Treeview(self.tab_fleet, columns=[c for c, _ in fleet_run_cols], show="headings")
+        for col, head in fleet_run_cols:
+            self.tree_fleet_runs.heading(col, text=head)
+            self.tree_fleet_runs.column(col, anchor="center", width=120)
+        self.tree_fleet_runs.pack(fill="both", expand=True, padx=20, pady=(5, 10))
+
+        # --- TAB: OPTIONS SWEEP (runtime options -> Pareto front) ---
+        self.tab_sweep = tk.Frame(self.notebook, bg="#f8fafc")
+        self.notebook.add(self.tab_sweep, text="  ⚙️ Options Sweep  ")
+
+        sweep_ctrl = tk.Frame(self.tab_sweep, bg="#f8fafc", pady=15)
+        sweep_ctrl.pack(fill="x")
+        tk.Label(sweep_ctrl, text="Παραλλαγές:", bg="#f8fafc", font=("Segoe UI Semibold", 10)).pack(side=tk.LEFT, padx=(20, 5))
+        self.sweep_list = tk.Listbox(sweep_ctrl, selectmode="multiple", height=4, width=32, exportselection=False,
+                                     font=("Segoe UI", 9), relief="solid", borderwidth=1)
+        self.sweep_list.pack(side=tk.LEFT, padx=5)
+        sweep_fields = [("num_batch:", "sweep_batch", "256,512,1024"), ("num_thread:", "sweep_thread", ""),
+                        ("num_gpu:", "sweep_gpu", ""), ("KV cache:", "sweep_kv", "")]
+        for i, (label, attr, default) in enumerate(sweep_fields):
+            tk.Label(sweep_ctrl, text=label, bg="#f8fafc", font=("Segoe UI Semibold", 10)).pack(side=tk.LEFT, padx=(10, 5))
+            entry = ttk.Entry(sweep_ctrl, width=12)
+            entry.insert(0, default)
+            entry.pack(side=tk.LEFT, padx=5)
+            setattr(self, attr, entry)
+        self.sweep_fa_var = tk.BooleanVar(value=False)
+        tk.Checkbutton(sweep_ctrl, text="Flash attention on/off", variable=self.sweep_fa_var, bg="#f8fafc").pack(side=tk.LEFT, padx=10)
+        tk.Label(sweep_ctrl, text="Random:", bg="#f8fafc", font=("Segoe UI Semibold", 10)).pack(side=tk.LEFT, padx=(10, 5))
+        self.sweep_random = ttk.Spinbox(sweep_ctrl, from_=0, to=200, width=4)
+        self.sweep_random.set(0)
+        self.sweep_random.pack(side=tk.LEFT, padx=5)
+
+        self.btn_sweep = tk.Button(
+            sweep_ctrl, text="⚙️ Έναρξη Sweep",
+            command=self.start_sweep_thread,
+            bg="#0ea5e9", fg="white", relief="flat", padx=20, font=("Segoe UI Bold", 9)
+        )
+        self.btn_sweep.pack(side=tk.LEFT, padx=15)
+        tk.Button(sweep_ctrl, text="📋 Modelfile", command=self.copy_sweep_modelfile, bg="#3b82f6", fg="white", relief="flat", padx=12).pack(side=tk.LEFT, padx=5)
+        tk.Label(self.tab_sweep, text="Παραλλαγές: ένα tag ανά quantization του ίδιου μοντέλου · KV cache: f16,q8_0,q4_0 (θέλει flash attention) · Random 0 = όλο το grid · FA / KV επανεκκινούν τον τοπικό server",
+                 bg="#f8fafc", fg="#64748b", font=("Segoe UI", 9)).pack(anchor="w", padx=20)
+
+        sweep_cols = [
+            ("model", "Μοντέλο"), ("quant", "Quant"), ("batch", "num_batch"), ("thread", "num_thread"),
+            ("gpu", "num_gpu"), ("fa", "Flash attn"), ("kv", "KV cache"), ("tps", "Eval TPS"), ("ttft", "TTFT"),
+            ("memory", "VRAM μοντέλου"), ("status", "Κατάσταση")
+        ]
+        self.tree_sweep = ttk.Treeview(self.tab_sweep, columns=[c for c, _ in sweep_cols], show="headings")
+        for col, head in sweep_cols:
+            self.tree_sweep.heading(col, text=head)
+            self.tree_sweep.column(col, anchor="center", width=95)
+        self.tree_sweep.pack(fill="both", expand=True, padx=20, pady=10)
+        self.sweep_modelfiles = {}
+
+        # --- TAB 4: MODEL MANAGER (Προετοιμασία) ---
         self.tab_manager = tk.Frame(self.notebook, bg="#f8fafc")
         self.notebook.add(self.tab_manager, text="  📦 Model Manager  ")
         self.setup_manager_ui()
@@ -328,11 +863,19 @@ class OllamaMasterStudio:
         self.dl_input = ttk.Combobox(dl_frame, values=["deepseek-r1:7b", "llama3.2:3b", "mistral:latest", "phi3:latest"], width=40)
         self.dl_input.set("deepseek-r1:7b")
         self.dl_input.pack(side=tk.LEFT, padx=10)
-        tk.Button(dl_frame, text="⬇ Pull Model", command=self.run_download_thread, bg="#10b981", fg="white", relief="flat", padx=20).pack(side=tk.LEFT)
+        # Πολλά μοντέλα χωρίζονται με κόμμα· κατεβαίνουν παράλληλα
+        tk.Label(dl_frame, text="Παράλληλα:", bg="white", font=("Segoe UI", 9)).pack(side=tk.LEFT, padx=(0, 5))
+        self.dl_concurrency = ttk.Spinbox(dl_frame, from_=1, to=8, width=4)
+        self.dl_concurrency.set(2)
+        self.dl_concurrency.pack(side=tk.LEFT, padx=(0, 10))
+        self.btn_pull = tk.Button(dl_frame, text="⬇ Pull Model", command=self.run_download_thread, bg="#10b981", fg="white", relief="flat", padx=20)
+        self.btn_pull.pack(side=tk.LEFT)
         tk.Button(dl_frame, text="🌐 Ollama Library", command=lambda: webbrowser.open("https://ollama.com/library"), bg="#3b82f6", fg="white", relief="flat", padx=15).pack(side=tk.LEFT, padx=10)
 
         self.dl_progress = ttk.Progressbar(dl_frame, orient=tk.HORIZONTAL, mode='determinate', style="Green.Horizontal.TProgressbar")
-        self.dl_progress.pack(fill="x", pady=15, side=tk.BOTTOM)
+        self.dl_progress.pack(fill="x", pady=(15, 0), side=tk.BOTTOM)
+        self.dl_stats = tk.Label(self.tab_manager, text="", bg="#f8fafc", fg="#047857", font=("Segoe UI Semibold", 9))
+        self.dl_stats.pack(anchor="w", padx=25)
 
         # Frame Διαγραφής
         del_frame = tk.LabelFrame(self.tab_manager, text=" 🗑️ Διαγραφή Μοντέλου ", bg="white", padx=20, pady=15, font=("Segoe UI Bold", 9))
@@ -347,70 +890,115 @@ class OllamaMasterStudio:
         log_label.pack(anchor="w", padx=25)
         self.log_text = tk.Text(self.root, height=8, bg="#1e293b", fg="#38bdf8", font=("Consolas", 10), padx=15, pady=10)
         self.log_text.pack(fill="x", padx=20, pady=(0, 20))
+        self.log_text.tag_configure("cyan", foreground="#38bdf8")
+        self.log_text.tag_configure("red", foreground="#f87171")
+        self.log_text.tag_configure("green", foreground="#4ade80")
         self.log_text.config(state="disabled")
 
     # --- ΣΥΝΑΡΤΗΣΕΙΣ ΛΟΓΙΚΗΣ (API & ACTIONS) ---
+    # Οι κλήσεις στο API τρέχουν στο worker pool· τα αποτελέσματα εφαρμόζονται στο main thread
     def check_api_health(self):
-        try:
-            ollama.list()
-            self.log("✅ API Connection: OK (Port 11434)", "success")
-            messagebox.showinfo("API Check", "Ο Ollama Server είναι ενεργός και αποκρίνεται!")
-        except Exception as e:
-            self.log(f"❌ API Connection: FAILED ({e})", "error")
+        self.ui.submit(self.watchdog.probe_once, on_done=self._api_ok,
+                       on_error=lambda e: self.log(f"❌ API Connection: FAILED ({e})", "error"))
+
+    def _api_ok(self, sample):
+        if sample["error"]:
+            self.log(f"❌ API Connection: FAILED ({sample['error']})", "error")
+            return
+        st = self.watchdog.stats()
+        self.log(f"✅ API Connection: OK ({self.watchdog.host}, {sample['latency'] * 1000:.0f} ms | "
+                 f"p50 {st['p50_ms']:.0f} ms, p99 {st['p99_ms']:.0f} ms, σφάλματα {st['error_rate'] * 100:.0f}%)", "success")
+        messagebox.showinfo("API Check", f"Ο Ollama Server είναι ενεργός και αποκρίνεται σε {sample['latency'] * 1000:.0f} ms!")
 
     def get_active_models_ps(self):
-        try:
-            active = ollama.ps()
-            if not active.models:
-                self.log("💤 Καμία διεργασία στη VRAM αυτή τη στιγμή.")
-            for m in active.models:
-                vram_gb = m.size_vram / (1024**3)
-                self.log(f"🔥 ACTIVE: {m.model} | VRAM: {vram_gb:.2f} GB | Expires: {m.expires_at}")
-        except Exception as e:
-            self.log(f"❌ PS Error: {e}", "error")
+        self.ui.submit(ollama.ps, on_done=self._show_ps,
+                       on_error=lambda e: self.log(f"❌ PS Error: {e}", "error"))
+
+    def _show_ps(self, active):
+        if not active.models:
+            self.log("💤 Καμία διεργασία στη VRAM αυτή τη στιγμή.")
+        for m in active.models:
+            vram_gb = m.size_vram / (1024**3)
+            self.log(f"🔥 ACTIVE: {m.model} | VRAM: {vram_gb:.2f} GB | Expires: {m.expires_at}")
 
     def force_unload_model(self):
         model = self.stress_combo.get()
         if not model: return
         self.log(f"🛑 Αποστολή αιτήματος Unload για: {model}...")
-        try:
-            ollama.generate(model=model, keep_alive=0)
-            self.log(f"✅ Το μοντέλο {model} αφαιρέθηκε από τη μνήμη.")
-        except Exception as e:
-            self.log(f"❌ Unload Failed: {e}", "error")
+        self.ui.submit(
+            lambda: ollama.generate(model=model, keep_alive=0),
+            on_done=lambda _: self.log(f"✅ Το μοντέλο {model} αφαιρέθηκε από τη μνήμη."),
+            on_error=lambda e: self.log(f"❌ Unload Failed: {e}", "error")
+        )
 
     def restart_ollama_service(self):
-        self.log("🔄 Επανεκκίνηση υπηρεσίας Ollama...")
-        os.system("taskkill /f /im ollama.exe")
-        time.sleep(2)
-        subprocess.Popen(["ollama", "serve"], creationflags=subprocess.CREATE_NO_WINDOW)
-        self.log("⏳ Αναμονή 5 δευτερολέπτων για αρχικοποίηση...")
-        self.root.after(5000, self.load_models_to_combos)
+        # Μέσω του watchdog: μία επανεκκίνηση τη φορά, με αναμονή ετοιμότητας αντί για σταθερά sleeps
+        self.btn_restart.config(state="disabled")
+        self.ui.submit(self.watchdog.restart, on_done=lambda _: self.btn_restart.config(state="normal"),
+                       on_error=self._restart_failed)
+
+    def _restart_failed(self, e):
+        self.btn_restart.config(state="normal")
+        self.log(f"❌ Επανεκκίνηση: {e}", "error")
+
+    def _after_restart(self, rec):
+        # Καλείται και για τις αυτόματες επανεκκινήσεις του watchdog
+        if rec["status"] == "ok":
+            self.load_models_to_combos()
 
     def load_models_to_combos(self):
-        try:
-            models_data = ollama.list()
-            all_names = [m.model for m in models_data.models]
-            # Φιλτράρισμα cloud μοντέλων για Stress Test & Comparison
-            local_names = [n for n in all_names if ":cloud" not in n.lower()]
-            
-            self.stress_combo['values'] = local_names
-            self.del_combo['values'] = all_names # Τα cloud μοντέλα παραμένουν στη διαγραφή
-            self.combo_a['values'] = local_names
-            self.combo_b['values'] = local_names
-            
-            if local_names:
-                self.stress_combo.current(0)
-                self.combo_a.current(0)
-                if len(local_names) > 1:
-                    self.combo_b.current(1)
+        # Reconcile με το ollama.list(): ollama.show() μόνο για νέα digests
+        self.ui.submit(self.model_cache.reconcile, None, self.log, on_done=self._apply_model_list,
+                       on_error=lambda e: self.log(f"⚠️ Αδυναμία λήψης λίστας μοντέλων: {e}", "error"))
+
+    def _apply_model_list(self, entries, announce=True):
+        self.model_info = {e["model"]: e for e in entries}
+        all_names = [e["model"] for e in entries]
+        # Φιλτράρισμα cloud μοντέλων για Stress Test & Comparison
+        local_names = [n for n in all_names if ":cloud" not in n.lower()]
+        # Διατήρηση των επιλογών του χρήστη όταν η λίστα ανανεώνεται (cache -> reconcile)
+        prev_stress, prev_del = self.stress_combo.get(), self.del_combo.get()
+        prev_compare = {self.compare_list.get(i) for i in self.compare_list.curselection()}
+        prev_sweep = {self.sweep_list.get(i) for i in self.sweep_list.curselection()}
+        prev_embed = self.embed_combo.get()
+        
+        self.stress_combo['values'] = local_names
+        # Στα embeddings προτιμώνται μοντέλα embedding (όνομα "embed" ή οικογένεια BERT)
+        embed_names = sorted(local_names, key=lambda n: not ("embed" in n.lower() or "bert" in str(self.model_info.get(n, {}).get("family") or "")))
+        self.embed_combo['values'] = embed_names
+        if embed_names:
+            self.embed_combo.set(prev_embed if prev_embed in embed_names else embed_names[0])
+        else:
+            self.embed_combo.set("")
+        self.del_combo['values'] = all_names # Τα cloud μοντέλα παραμένουν στη διαγραφή
+        self.compare_list.delete(0, tk.END)
+        self.sweep_list.delete(0, tk.END)
+        for name in local_names:
+            self.compare_list.insert(tk.END, name)
+            self.sweep_list.insert(tk.END, name)
+            if name in prev_sweep:
+                self.sweep_list.selection_set(tk.END)
+        
+        if local_names:
+            self.stress_combo.current(local_names.index(prev_stress) if prev_stress in local_names else 0)
+            self.show_autotune_hint()
+            kept = [i for i, n in enumerate(local_names) if n in prev_compare]
+            if len(kept) >= 2:
+                for i in kept:
+                    self.compare_list.selection_set(i)
+            else:
+                self.compare_list.selection_set(0, min(1, len(local_names) - 1))
+        else:
+            self.stress_combo.set("")
+            self.show_autotune_hint()
+        
+        if all_names:
+            self.del_combo.current(all_names.index(prev_del) if prev_del in all_names else 0)
+        else:
+            self.del_combo.set("")
             
-            if all_names:
-                self.del_combo.current(0)
-                
+        if announce:
             self.log(f"📦 Φορτώθηκαν {len(all_names)} μοντέλα ({len(local_names)} τοπικά).")
-        except Exception as e:
-            self.log(f"⚠️ Αδυναμία λήψης λίστας μοντέλων: {e}", "error")
 
     # --- THREADED TASKS ---
     def start_stress_thread(self):
@@ -418,112 +1006,487 @@ class OllamaMasterStudio:
         if not m: return
         self.btn_run_stress.config(state="disabled")
         for i in self.tree_stress.get_children(): self.tree_stress.delete(i)
-        threading.Thread(target=self._stress_logic, args=(m,), daemon=True).start()
-
-    def _stress_logic(self, model):
-        # Δοκιμή σε 4 επίπεδα context
-        context_levels = [4096, 8192, 16384, 32768]
+        try:
+            policy = TrialPolicy(
+                warmup=int(self.trial_warmup.get()),
+                cold=self.trial_mode.get().startswith("Cold"),
+                min_trials=int(self.trial_min.get()),
+                max_trials=int(self.trial_max.get()),
+                ci_target=float(self.trial_ci.get()) / 100
+            )
+        except ValueError:
+            self.btn_run_stress.config(state="normal")
+            messagebox.showerror("Stress Test", "Μη έγκυρες ρυθμίσεις trials.")
+            return
         keep_alive = self.keep_alive_combo.get().split(" ")[0]
+        self.ui.submit(self._stress_logic, m, self.stream_var.get(), policy, keep_alive, self._workload(), self._thermal(),
+                       self.preflight_skip.get(), on_error=self._worker_failed("Stress Test", self.btn_run_stress))
+
+    def _worker_failed(self, title, button):
+        """on_error για ui.submit: γράφει το σφάλμα και ξαναενεργοποιεί το κουμπί της εργασίας."""
+        def failed(e):
+            self.log(f"❌ {title}: {e}", "error")
+            button.config(state="normal")
+        return failed
+
+    def _thermal(self):
+        """ThermalPolicy από τις ρυθμίσεις (χωρίς αναμονή ψύξης αν δεν είναι επιλεγμένη)."""
+        try:
+            cool_below = float(self.cool_below.get()) if self.cool_var.get() else None
+        except ValueError:
+            cool_below = None
+        return ThermalPolicy(cool_below=cool_below)
+
+    def _workload(self):
+        """Workload από τις ρυθμίσεις του Stress Test (None = σύντομο σταθερό prompt)."""
+        corpus = self.workload_corpus.get()
+        if corpus not in CORPORA:
+            return None
+        try:
+            num_predict = int(self.workload_predict.get())
+        except ValueError:
+            num_predict = 128
+        return Workload(corpus, fill=int(self.workload_fill.get().rstrip("%")) / 100, num_predict=num_predict)
+
+    def _upsert_row(self, tree, iid, values):
+        """Εισάγει ή ενημερώνει μια γραμμή πίνακα (μία γραμμή ανά σημείο μέτρησης)."""
+        if tree.exists(iid):
+            tree.item(iid, values=values)
+        else:
+            tree.insert("", "end", iid=iid, values=values)
+
+    def _preflight(self, models, contexts, skip_unfit=False):
+        """Pre-flight VRAM στο worker: (contexts που θα τρέξουν, εκτιμήσεις ανά (μοντέλο, ctx))."""
+        budget = vram_budget(self.gpu_sampler)
+        if budget is None:
+            self.log("⚠️ Pre-flight: άγνωστη διαθέσιμη VRAM (χωρίς GPU telemetry).", "error")
+        estimates = preflight(models, contexts, budget, self.vram_calibration, log=self.log)
+        if skip_unfit:
+            kept = fitting_contexts(estimates, models, contexts)
+            if kept != list(contexts):
+                self.log(f"⏭️ Παράλειψη contexts που δεν χωρούν: {sorted(set(contexts) - set(kept))}")
+            contexts = kept
+        return contexts, estimates
+
+    def _annotate_vram(self, records, estimates):
+        digests = {name: e.get("digest") for name, e in self.model_info.items()}
+        return annotate_vram(records, estimates, calibration=self.vram_calibration, digests=digests)
+
+    def _stress_logic(self, model, stream_mode=True, policy=None, keep_alive="15m", workload=None, thermal=None,
+                      skip_unfit=False):
+        # Δοκιμή στα προεπιλεγμένα επίπεδα context του engine
+        contexts, estimates = self._preflight([model], DEFAULT_CONTEXTS, skip_unfit)
+        for ctx in sorted(set(DEFAULT_CONTEXTS) - set(contexts)):
+            est = estimates[(model, ctx)]
+            row = (ctx, "—", "N/A", 0, "—", *("N/A",) * 5, "N/A", f"{est['predicted_mb']:.0f} / — MB", "N/A", "N/A",
+                   "⏭️ Δεν χωρά στη VRAM")
+            self.ui.upsert(self.tree_stress, f"ctx{ctx}", row)
+        if not contexts:
+            self.log(f"❌ Κανένα context δεν χωρά στη VRAM για το {model}.", "error")
+            self.ui.configure(self.btn_run_stress, state="normal")
+            return
+        ids = []
+        trials = {}
+        records = self._annotate_vram(run_stress(model, contexts, stream=stream_mode, keep_alive=keep_alive,
+                                                 sampler=self.gpu_sampler, log=self.log, policy=policy,
+                                                 workload=workload, thermal=thermal), estimates)
         
-        for i, ctx in enumerate(context_levels):
-            try:
-                self.log(f"🧪 Τεστ: {model} @ {ctx} context...")
-                start_t = time.time()
-                # Αποστολή αιτήματος generate
-                res = ollama.generate(model=model, prompt="Explain the theory of relativity in 100 words.", 
-                                      options={"num_ctx": ctx}, keep_alive=keep_alive)
-                
-                # Υπολογισμός ταχύτητας με ασφάλεια
-                eval_duration = res.get('eval_duration') or 0
-                eval_count = res.get('eval_count') or 0
-                
-                if eval_duration > 0:
-                    duration = eval_duration / 1e9
-                    tps = eval_count / duration
-                else:
-                    tps = 0
-                
-                # Λήψη VRAM/Temp από το nvidia-smi
-                gpu = self.get_gpu_status()
-                vram_info = f"{gpu['used']} MB" if gpu else "N/A"
-                temp_info = f"{gpu['temp']}°C" if gpu else "N/A"
-                
-                self.root.after(0, lambda c=ctx, t=tps, v=vram_info, te=temp_info: 
-                               self.tree_stress.insert("", "end", values=(c, f"{t:.2f}", v, te, "✅ OK")))
-                
-                # Ενημέρωση Progress Bar
-                self.root.after(0, lambda v=(i+1)*25: self.stress_progress.configure(value=v))
-            except Exception as e:
-                self.log(f"❌ Error @ {ctx} ctx: {e}", "error")
+        for rec in recorded(self.metrics.observed(records), self.history, run_context([model]), ids):
+            if rec["status"] != "ok":
                 break
+            ctx = rec["num_ctx"]
+            trials.setdefault(ctx, []).append(rec)
+            agg = aggregate_trials(trials[ctx])
+            tps = f"{rec['metric_mean']:.2f}"
+            if rec["metric_ci"] is not None:
+                tps += f" ± {rec['metric_ci']:.2f}"
+            phases = "/".join(f"{(agg[k] or 0) / 1e6:.0f}" for k in ("load_duration", "prompt_eval_duration", "eval_duration"))
+            if estimates.get((model, ctx), {}).get("fits") is False:
+                status = "⚠️ Εκτίμηση offload"
+            elif rec["converged"] is not False:
+                status = "✅ OK"
+            elif policy and rec["trials_n"] >= policy.max_trials:
+                status = "⚠️ Ευρύ CI"
+            else:
+                status = "⏳ Σύγκλιση..."
+            hot, total, _ = throttle_summary(trials[ctx])
+            if hot:
+                status += f" | 🔥 {hot}/{total} throttled"
+            vram_info, temp_info, util_info = format_gpu_window(agg)
+            row = (ctx, tps, format_prefill(agg), rec["trials_n"], phases, *format_latency(agg), vram_info,
+                   format_vram_estimate(rec), temp_info, util_info, status)
+            self.ui.upsert(self.tree_stress, f"ctx{ctx}", row)
+            
+            # Ενημέρωση Progress Bar
+            self.ui.configure(self.stress_progress, value=(contexts.index(ctx) + 1) * 100 / len(contexts))
         
-        self.root.after(0, lambda: self.btn_run_stress.config(state="normal"))
-        self.log(f"🏁 Το Stress Test για το {model} ολοκληρώθηκε.")
+        # Σύγκριση με το κυλιόμενο baseline του ίδιου digest / ρύθμισης
+        for f in check_regressions(self.history, ids):
+            self.log(format_finding(f), "error")
+            self.ui.call(self.tree_stress.set, f"ctx{f['num_ctx']}", "status", "⚠️ Regression")
+        self.ui.configure(self.btn_run_stress, state="normal")
 
-    def run_download_thread(self):
-        name = self.dl_input.get().strip()
-        if not name: return
-        threading.Thread(target=self._download_logic, args=(name,), daemon=True).start()
+    def show_autotune_hint(self):
+        """Εμφανίζει τα στοιχεία (cache) και την αποθηκευμένη πρόταση num_ctx για το μοντέλο του Stress Test."""
+        model = self.stress_combo.get()
+        self.model_info_label.config(text=format_model_info(self.model_info.get(model, {})))
+        result = self.autotune_store.for_model(model)
+        if not result:
+            self.autotune_label.config(text="")
+        elif result["recommended_num_gpu"] is not None:
+            self.autotune_label.config(text=f"🎯 Πρόταση: num_ctx {result['recommended_ctx']}, num_gpu {result['recommended_num_gpu']} (μερικό offload)")
+        else:
+            self.autotune_label.config(text=f"🎯 Πρόταση: num_ctx {result['recommended_ctx']} (100% GPU)")
+
+    def start_autotune_thread(self):
+        m = self.stress_combo.get()
+        if not m: return
+        self.btn_autotune.config(state="disabled")
+        self.ui.submit(self._autotune_logic, m, on_error=self._worker_failed("Auto-Tune", self.btn_autotune))
+
+    def _autotune_logic(self, model):
+        for rec in run_autotune(model, search_num_gpu=True, store=self.autotune_store, log=self.log):
+            if rec["kind"] == "autotune_probe" and rec["status"] == "ok":
+                where = "100% GPU" if rec["gpu_fraction"] and rec["gpu_fraction"] >= 0.999 else f"{(rec['gpu_fraction'] or 0) * 100:.0f}% GPU"
+                self.log(f"   ↳ num_ctx={rec['num_ctx']}: {rec['eval_tps']:.2f} TPS, {where}")
+            elif rec["kind"] == "autotune_probe":
+                self.log(f"   ↳ num_ctx={rec['num_ctx']}: {rec['error']}", "error")
+        self.ui.call(self.show_autotune_hint)
+        self.ui.configure(self.btn_autotune, state="normal")
 
-    def _download_logic(self, name):
+    def start_load_thread(self):
+        m = self.stress_combo.get()
+        if not m: return
         try:
-            self.log(f"📥 Έναρξη λήψης: {name}...")
-            for progress in ollama.pull(name, stream=True):
-                if 'total' in progress and 'completed' in progress:
-                    pct = (progress['completed'] / progress['total']) * 100
-                    self.root.after(0, lambda v=pct: self.dl_progress.configure(value=v))
-                elif 'status' in progress:
-                    # Προαιρετικά: Ενημέρωση log με το status (π.χ. "pulling manifest")
-                    pass
-            self.log(f"✅ Το μοντέλο {name} εγκαταστάθηκε!", "success")
-            self.root.after(0, self.load_models_to_combos)
-        except Exception as e:
-            self.log(f"❌ Σφάλμα λήψης {name}: {e}", "error")
+            levels = [int(x) for x in self.load_levels.get().split(",") if x.strip()]
+            budget = float(self.load_budget.get())
+        except ValueError:
+            messagebox.showerror("Load Test", "Μη έγκυρα επίπεδα concurrency ή όριο.")
+            return
+        if not levels or budget <= 0 or min(levels) < 1: return
+        by_time = self.load_mode.get() == "δευτερόλεπτα"
+        self.btn_load.config(state="disabled")
+        for i in self.tree_load.get_children(): self.tree_load.delete(i)
+        keep_alive = self.keep_alive_combo.get().split(" ")[0]
+        self.ui.submit(self._load_logic, m, levels, budget, by_time, keep_alive,
+                       on_error=self._worker_failed("Load Test", self.btn_load))
+
+    def _load_logic(self, model, levels, budget, by_time, keep_alive):
+        for r in run_load_sweep(model, levels, keep_alive=keep_alive,
+                                max_requests=None if by_time else int(budget),
+                                duration=budget if by_time else None, log=self.log):
+            row = (
+                r["concurrency"], f"{r['agg_tps']:.2f}", f"{r['rps']:.2f}", f"{r['scaling']:.2f}x",
+                f"{r['lat_p50']:.2f} s", f"{r['lat_p95']:.2f} s", f"{r['lat_p99']:.2f} s",
+                f"{r['ttft_p95'] * 1000:.0f} ms",
+                f"{r['queue_p50'] * 1000:.0f}/{r['queue_p95'] * 1000:.0f} ms", r["errors"]
+            )
+            self.ui.append(self.tree_load, row)
+        self.ui.configure(self.btn_load, state="normal")
+
+    def start_embed_thread(self):
+        m = self.embed_combo.get()
+        if not m: return
+        try:
+            batches = [int(x) for x in self.embed_batches.get().split(",") if x.strip()]
+            lengths = [int(x) for x in self.embed_lengths.get().split(",") if x.strip()]
+            repeats = int(self.embed_repeats.get())
+        except ValueError:
+            messagebox.showerror("Embeddings", "Μη έγκυρα batch sizes, μήκη ή επαναλήψεις.")
+            return
+        if not batches or not lengths or min(batches + lengths) < 1 or repeats < 2: return
+        self.btn_embed.config(state="disabled")
+        for i in self.tree_embed.get_children(): self.tree_embed.delete(i)
+        keep_alive = self.keep_alive_combo.get().split(" ")[0]
+        self.ui.submit(self._embed_logic, m, batches, lengths, repeats, keep_alive,
+                       on_error=self._embed_failed)
+
+    def _embed_failed(self, e):
+        self.log(f"❌ Embeddings: {e}", "error")
+        self.btn_embed.config(state="normal")
+
+    def _embed_logic(self, model, batches, lengths, repeats, keep_alive):
+        records = []
+        for rec in run_embed_sweep(model, batches=batches, lengths=lengths, repeats=repeats,
+                                   keep_alive=keep_alive if keep_alive != "0" else "10m", log=self.log):
+            if rec["status"] != "ok":
+                continue
+            records.append(rec)
+            status = "✅ OK" if rec["consistency"] >= CONSISTENCY_MIN else "⚠️ Ασυνεπή vectors"
+            self.ui.upsert(self.tree_embed, f"{rec['input_tokens']}x{rec['batch']}", format_embed_row(rec, status))
+        # Το batch με το μεγαλύτερο throughput για κάθε μήκος σημειώνεται στον πίνακα
+        for tokens, (batch, value) in best_batches(records).items():
+            rec = next(r for r in records if r["input_tokens"] == tokens and r["batch"] == batch)
+            self.ui.upsert(self.tree_embed, f"{tokens}x{batch}", format_embed_row(rec, "🏆 Καλύτερο batch"))
+            self.log(f"🏆 ~{tokens} tokens/είσοδο: καλύτερο batch {batch} ({value:.0f} tokens/s)", "success")
+        self.ui.configure(self.btn_embed, state="normal")
+
+    # --- FLEET (πολλοί hosts) ---
+    def _show_hosts(self):
+        """Γραμμή ανά host του registry (η κατάσταση συμπληρώνεται στο refresh)."""
+        for i in self.tree_hosts.get_children(): self.tree_hosts.delete(i)
+        for name, url in self.fleet.hosts.items():
+            self.tree_hosts.insert("", "end", iid=name, values=(name, url, "—", "—", "—", "—", "—", "—"))
+
+    def _reset_fleet(self):
+        self.fleet.close()
+        self.fleet = Fleet(self.host_registry.hosts())
+        self._show_hosts()
+
+    def add_host(self):
+        name, url = self.host_name.get().strip(), self.host_url.get().strip()
+        if not name or not url: return
+        self.log(f"🌐 Host {name} → {self.host_registry.add(name, url)}")
+        self._reset_fleet()
+        self.refresh_fleet()
+
+    def remove_host(self):
+        for name in self.tree_hosts.selection():
+            if self.host_registry.remove(name):
+                self.log(f"🌐 Αφαιρέθηκε ο host {name}")
+        self._reset_fleet()
+
+    def refresh_fleet(self):
+        self.ui.submit(self._fleet_snapshot, self.fleet, on_done=self._apply_fleet_snapshot)
+
+    def _fleet_snapshot(self, fleet):
+        # Το status και το ps ρωτούν όλους τους hosts ταυτόχρονα
+        return fleet.status(), fleet.ps(log=self.log)
+
+    def _apply_fleet_snapshot(self, snapshot):
+        status, ps = snapshot
+        for r in status:
+            if not self.tree_hosts.exists(r["host_name"]):
+                continue
+            if r["status"] == "ok":
+                values = (r["host_name"], r["host"], r["version"] or "N/A", r["models"], r["loaded"],
+                          f"{r['size_vram'] / 1024**3:.1f} GB", f"{r['latency_ms']:.0f} ms", "✅ Online")
+            else:
+                values = (r["host_name"], r["host"], "—", "—", "—", "—", "—", "❌ Offline")
+            self.tree_hosts.item(r["host_name"], values=values)
+        for i in self.tree_fleet_ps.get_children(): self.tree_fleet_ps.delete(i)
+        for r in ps:
+            gpu = f"{r['gpu_pct']:.0f}%" if r["gpu_pct"] is not None else "N/A"
+            self.tree_fleet_ps.insert("", "end", values=(
+                r["host_name"], r["model"], f"{r['size'] / 1024**3:.1f} GB",
+                f"{(r['size_vram'] or 0) / 1024**3:.1f} GB", gpu, r["expires_at"] or "—"
+            ))
+        online = sum(r["status"] == "ok" for r in status)
+        self.log(f"🌐 Fleet: {online}/{len(status)} hosts online, {len(ps)} φορτωμένα μοντέλα")
+
+    def start_fleet_stress_thread(self):
+        m = self.stress_combo.get()
+        names = list(self.tree_hosts.selection()) or list(self.fleet.hosts)
+        if not m or not names: return
+        self.btn_fleet_stress.config(state="disabled")
+        for i in self.tree_fleet_runs.get_children(): self.tree_fleet_runs.delete(i)
+        keep_alive = self.keep_alive_combo.get().split(" ")[0]
+        policy = TrialPolicy(warmup=1, min_trials=3, max_trials=10, ci_target=0.05)
+        self.ui.submit(self._fleet_stress_logic, m, names, policy, keep_alive, self._workload(),
+                       on_error=self._worker_failed("Fleet", self.btn_fleet_stress))
+
+    def _fleet_stress_logic(self, model, names, policy, keep_alive, workload=None):
+        # Απομακρυσμένοι hosts: χωρίς τοπική GPU telemetry και pre-flight
+        ids = []
+        records = fleet_run(self.fleet, run_stress, model, DEFAULT_CONTEXTS, names=names, keep_alive=keep_alive,
+                            policy=policy, workload=workload, log=self.log)
+        for rec in recorded(self.metrics.observed(records), self.history, run_context([model]), ids):
+            if rec["status"] != "ok":
+                self.ui.upsert(self.tree_fleet_runs, f"{rec['host_name']}@err",
+                               (rec["host_name"], rec.get("num_ctx") or "—", "—", "—", "—", f"❌ {rec['error']}"))
+                continue
+            tps = f"{rec['metric_mean']:.2f}"
+            if rec["metric_ci"] is not None:
+                tps += f" ± {rec['metric_ci']:.2f}"
+            ttft = f"{rec['ttft'] * 1000:.0f} ms" if rec.get("ttft") is not None else "N/A"
+            status = "✅ OK" if rec["converged"] is not False else "⏳ Σύγκλιση..."
+            row = (rec["host_name"], rec["num_ctx"], tps, rec["trials_n"], ttft, status)
+            self.ui.upsert(self.tree_fleet_runs, f"{rec['host_name']}@{rec['num_ctx']}", row)
+        for f in check_regressions(self.history, ids):
+            self.log(format_finding(f), "error")
+        self.ui.configure(self.btn_fleet_stress, state="normal")
+
+    # --- OPTIONS SWEEP ---
+    def start_sweep_thread(self):
+        models = [self.sweep_list.get(i) for i in self.sweep_list.curselection()]
+        if not models: return
+        try:
+            lists = [[int(x) for x in e.get().split(",") if x.strip()] for e in (self.sweep_batch, self.sweep_thread, self.sweep_gpu)]
+            n_random = int(self.sweep_random.get())
+        except ValueError:
+            messagebox.showerror("Options Sweep", "Μη έγκυρες τιμές num_batch, num_thread, num_gpu ή random.")
+            return
+        kv = [x.strip() for x in self.sweep_kv.get().split(",") if x.strip()]
+        space = SweepSpace(models, *lists, flash_attention=[False, True] if self.sweep_fa_var.get() else None,
+                           kv_cache_type=kv or None)
+        points = space.sample(n_random) if n_random > 0 else None
+        self.btn_sweep.config(state="disabled")
+        for i in self.tree_sweep.get_children(): self.tree_sweep.delete(i)
+        self.sweep_modelfiles = {}
+        keep_alive = self.keep_alive_combo.get().split(" ")[0]
+        self.ui.submit(self._sweep_logic, space, points, keep_alive, on_error=self._sweep_failed)
+
+    def _sweep_failed(self, e):
+        self.log(f"❌ Options Sweep: {e}", "error")
+        self.btn_sweep.config(state="normal")
+
+    def _sweep_restart(self, env):
+        # Μέσω του watchdog: τα probes του παύουν όσο ο server επανεκκινείται
+        return self.watchdog.restart(env=env) or {"status": "error", "error": "Η επανεκκίνηση βρίσκεται ήδη σε εξέλιξη"}
+
+    def _sweep_logic(self, space, points, keep_alive):
+        records = run_sweep(space, points=points, keep_alive=keep_alive if keep_alive != "0" else "5m",
+                            sampler=self.gpu_sampler, restart=self._sweep_restart, log=self.log)
+        for rec in self.metrics.observed(records):
+            # Μία γραμμή ανά σημείο· τα records του Pareto front ενημερώνουν την ίδια γραμμή
+            iid = "|".join(str(rec[k]) for k in ("model", "num_batch", "num_thread", "num_gpu", "flash_attention", "kv_cache_type"))
+            if rec["kind"] == "sweep":
+                status = "✅ OK" if rec["status"] == "ok" else f"❌ {rec['error']}"
+            else:
+                status = "🏆 Πρόταση" if rec["recommended"] else "★ Pareto"
+            self.ui.upsert(self.tree_sweep, iid, format_sweep_row(rec, status))
+            if rec["recommended"]:
+                self.sweep_modelfiles[rec["model"]] = modelfile_block(rec)
+        self.ui.configure(self.btn_sweep, state="normal")
+
+    def copy_sweep_modelfile(self):
+        if not self.sweep_modelfiles:
+            self.log("⚠️ Δεν υπάρχει ακόμα πρόταση από το Options Sweep.", "error")
+            return
+        self.root.clipboard_clear()
+        self.root.clipboard_append("\n".join(self.sweep_modelfiles.values()))
+        self.log(f"📋 Modelfile για {', '.join(self.sweep_modelfiles)} στο πρόχειρο.", "success")
+
+    def start_chat_thread(self):
+        m = self.stress_combo.get()
+        if not m: return
+        try:
+            sessions, turns, num_ctx = int(self.chat_sessions.get()), int(self.chat_turns.get()), int(self.chat_ctx.get())
+        except ValueError:
+            messagebox.showerror("Chat Benchmark", "Μη έγκυρα sessions, turns ή num_ctx.")
+            return
+        if sessions < 1 or turns < 1 or num_ctx < 256: return
+        self.btn_chat.config(state="disabled")
+        for i in self.tree_chat.get_children(): self.tree_chat.delete(i)
+        keep_alive = self.keep_alive_combo.get().split(" ")[0]
+        self.ui.submit(self._chat_logic, m, sessions, turns, num_ctx, keep_alive,
+                       on_error=self._worker_failed("Chat Benchmark", self.btn_chat))
+
+    def _chat_logic(self, model, sessions, turns, num_ctx, keep_alive):
+        def ms(v): return f"{v * 1000:.0f} ms" if v is not None else "-"
+        def tok(v): return f"{v:.0f}" if v is not None else "-"
+        def pct(v): return f"{v * 100:.0f}%" if v is not None else "-"
+
+        records = []
+        for rec in run_chat_bench(model, sessions=sessions, turns=turns, num_ctx=num_ctx,
+                                  keep_alive=keep_alive, log=self.log):
+            records.append(rec)
+            if rec["status"] != "ok":
+                continue
+            # Η καμπύλη ξαναϋπολογίζεται· η γραμμή του turn ενημερώνεται επιτόπου
+            p = next(p for p in chat_curve(records) if p["turn"] == rec["turn"])
+            row = (
+                p["turn"] + 1, ms(p.get("cold_ttft")), ms(p.get("sequential_ttft")), ms(p.get("interleaved_ttft")),
+                tok(p.get("cold_prompt")), tok(p.get("sequential_prompt")), tok(p.get("interleaved_prompt")),
+                pct(p.get("sequential_reuse")), pct(p.get("interleaved_reuse"))
+            )
+            self.ui.upsert(self.tree_chat, f"turn{p['turn']}", row)
+        hint = eviction_hint(chat_curve(records))
+        if hint:
+            self.log(f"⚠️ {hint}", "error")
+        self.ui.configure(self.btn_chat, state="normal")
+
+    def run_download_thread(self):
+        names = [n.strip() for n in self.dl_input.get().split(",") if n.strip()]
+        if not names: return
+        try:
+            concurrency = int(self.dl_concurrency.get())
+        except ValueError:
+            concurrency = 2
+        self.btn_pull.config(state="disabled")
+        self.dl_progress.configure(value=0)
+        self.ui.submit(self._download_logic, names, concurrency, on_error=self._worker_failed("Λήψη", self.btn_pull))
+
+    def _download_logic(self, names, concurrency):
+        # Τα records έρχονται ήδη με όριο συχνότητας από την ουρά λήψεων
+        for p in run_pull_queue(names, concurrency=concurrency, log=self.log):
+            if p["queue_pct"] is not None:
+                self.ui.configure(self.dl_progress, value=p["queue_pct"])
+            eta = f"{p['eta']:.0f} s" if p["eta"] is not None else "—"
+            self.ui.configure(self.dl_stats, text=(
+                f"📦 {p['models_done']}/{p['models_total']} μοντέλα | "
+                f"{p['queue_completed'] / 1e6:.0f}/{p['queue_total'] / 1e6:.0f} MB | "
+                f"{p['mbps']:.1f} MB/s | ETA {eta} | {p['skipped_layers']} layers ήδη τοπικά"
+            ))
+        self.ui.call(self.load_models_to_combos)
+        self.ui.configure(self.btn_pull, state="normal")
 
     def delete_model_action(self):
         m = self.del_combo.get()
         if m and messagebox.askyesno("Επιβεβαίωση", f"Είστε σίγουροι ότι θέλετε να διαγράψετε το μοντέλο {m};"):
-            try:
-                ollama.delete(m)
-                self.log(f"🗑️ Το μοντέλο {m} διαγράφηκε επιτυχώς.")
-                self.load_models_to_combos()
-            except Exception as e:
-                self.log(f"❌ Αποτυχία διαγραφής: {e}", "error")
+            self.ui.submit(ollama.delete, m, on_done=lambda _: self._model_deleted(m),
+                           on_error=lambda e: self.log(f"❌ Αποτυχία διαγραφής: {e}", "error"))
+
+    def _model_deleted(self, m):
+        self.log(f"🗑️ Το μοντέλο {m} διαγράφηκε επιτυχώς.")
+        self.load_models_to_combos()
 
     # --- TAB COMPARISON LOGIC (Συντομογραφία για το benchmark) ---
     def start_compare_thread(self):
-        a, b = self.combo_a.get(), self.combo_b.get()
-        if not a or not b: return
-        threading.Thread(target=self._compare_logic, args=(a, b), daemon=True).start()
-
-    def _compare_logic(self, model_a, model_b):
-        self.log(f"⚖️ Σύγκριση: {model_a} vs {model_b}")
-        # Δοκιμή σε standard 8K context
-        for ctx in [8192, 16384]:
-            try:
-                # Test Model A
-                res_a = ollama.generate(model=model_a, prompt="Say Hello", options={"num_ctx": ctx})
-                duration_a = res_a.get('eval_duration') or 0
-                count_a = res_a.get('eval_count') or 0
-                tps_a = (count_a / (duration_a / 1e9)) if duration_a > 0 else 0
-                
-                # Test Model B
-                res_b = ollama.generate(model=model_b, prompt="Say Hello", options={"num_ctx": ctx})
-                duration_b = res_b.get('eval_duration') or 0
-                count_b = res_b.get('eval_count') or 0
-                tps_b = (count_b / (duration_b / 1e9)) if duration_b > 0 else 0
-                
-                if tps_b > 0:
-                    diff = ((tps_a - tps_b) / tps_b) * 100
-                else:
-                    diff = 0
-                
-                winner = model_a if tps_a > tps_b else model_b
-                
-                self.root.after(0, lambda c=ctx, t1=tps_a, t2=tps_b, d=diff, w=winner: 
-                               self.tree_compare.insert("", "end", values=(c, f"{t1:.2f}", f"{t2:.2f}", f"{d:.1f}%", w)))
-            except Exception as e:
-                self.log(f"❌ Error comparing {model_a} and {model_b}: {e}", "error")
+        models = [self.compare_list.get(i) for i in self.compare_list.curselection()]
+        if len(models) < 2: return
+        try:
+            contexts = [int(x) for x in self.compare_ctx.get().split(",") if x.strip()]
+            policy = TrialPolicy(warmup=1, min_trials=3, max_trials=max(3, int(self.compare_trials.get())), ci_target=0.05)
+        except ValueError:
+            messagebox.showerror("Τουρνουά", "Μη έγκυρα contexts ή trials.")
+            return
+        if not contexts: return
+        self.btn_compare.config(state="disabled")
+        for tree in (self.tree_standings, self.tree_compare):
+            for i in tree.get_children(): tree.delete(i)
+        keep_alive = self.keep_alive_combo.get().split(" ")[0]
+        self.ui.submit(self._compare_logic, models, contexts, policy, keep_alive, self._workload(), self._thermal(),
+                       self.preflight_skip.get(), on_error=self._worker_failed("Τουρνουά", self.btn_compare))
+
+    def _compare_logic(self, models, contexts, policy, keep_alive, workload=None, thermal=None, skip_unfit=False):
+        ids = []
+        results = []
+        # Σε λειτουργία παράλειψης μένουν μόνο contexts όπου χωρούν όλα τα μοντέλα (δίκαιη σύγκριση)
+        contexts, estimates = self._preflight(models, contexts, skip_unfit)
+        if not contexts:
+            self.log("❌ Κανένα context δεν χωρά στη VRAM για όλα τα μοντέλα.", "error")
+            self.ui.configure(self.btn_compare, state="normal")
+            return
+        # Χωρίς keep_alive=0: ο scheduler κάνει ο ίδιος unload μετά από κάθε μοντέλο
+        records = self._annotate_vram(run_tournament(
+            models, contexts, policy=policy, keep_alive=keep_alive if keep_alive != "0" else "10m",
+            sampler=self.gpu_sampler, log=self.log, workload=workload, thermal=thermal
+        ), estimates)
+        for rec in recorded(self.metrics.observed(records), self.history, run_context(models), ids):
+            if rec["status"] == "ok":
+                results.append(rec)
+                self.ui.call(self._show_standings, results[:])
+        
+        _, pairs = summarize_tournament(results)
+        for p in pairs:
+            winner = p["winner"] or "➖ Μη σημαντική"
+            row = (p["num_ctx"], p["model_x"], p["model_y"], f"{p['diff_pct']:+.1f}%", f"{p['p_adj']:.3f}", winner)
+            self.ui.append(self.tree_compare, row)
+        for f in check_regressions(self.history, ids):
+            self.log(format_finding(f), "error")
+        self.ui.configure(self.btn_compare, state="normal")
+
+    def _show_standings(self, results):
+        """Ξαναγράφει τον πίνακα κατάταξης από τα trials που έχουν ολοκληρωθεί."""
+        standings, _ = summarize_tournament(results)
+        for index, s in enumerate(standings):
+            tps = f"{s['mean']:.2f}" + (f" ± {s['ci']:.2f}" if s["ci"] is not None else "")
+            load = f"{s['load_ms']:.0f}" if s["load_ms"] is not None else "N/A"
+            values = (s["rank"], s["num_ctx"], s["model"], tps, s["n"], load)
+            iid = f"{s['model']}@{s['num_ctx']}"
+            self._upsert_row(self.tree_standings, iid, values)
+            self.tree_standings.move(iid, "", index)
 
     def show_about(self):
         """Εμφανίζει το παράθυρο με τις πληροφορίες και την άδεια MIT."""
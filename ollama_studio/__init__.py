@@ -0,0 +1,11 @@
+# Ollama Diamond Studio v12.5
+# Copyright (c) 2026 Marinos
+# Licensed under the MIT License (see LICENSE file for details)
+
+"""Headless πυρήνας του Ollama AI Studio (benchmark engine, telemetry, CLI).
+
+Το πακέτο δεν εισάγει ποτέ το tkinter, ώστε να τρέχει σε headless μηχανήματα
+και σε nightly jobs (`python -m ollama_studio bench ...`).
+"""
+
+__version__ = "12.5"
@@ -0,0 +1,7 @@
+# Ollama Diamond Studio v12.5
+# Copyright (c) 2026 Marinos
+# Licensed under the MIT License (see LICENSE file for details)
+
+from .cli import main
+
+raise SystemExit(main())
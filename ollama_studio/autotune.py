@@ -0,0 +1,195 @@
+# Ollama Diamond Studio v12.5
+# Copyright (c) 2026 Marinos
+# Licensed under the MIT License (see LICENSE file for details)
+
+"""Auto-tuner: μέγιστο num_ctx (και προαιρετικά num_gpu) που μένει 100% στη GPU.
+
+Σε κάθε βήμα της binary search γίνεται ένα generate και μετά ένα ollama.ps():
+αν size_vram < size, ο Ollama έχει μεταφέρει layers στη CPU. Μαζί με το
+μετρημένο TPS (απότομη πτώση = offload) αποφασίζεται αν το σημείο "χωράει".
+Τα αποτελέσματα αποθηκεύονται ανά digest μοντέλου.
+"""
+
+import json
+import threading
+import time
+
+import ollama
+
+from .engine import STRESS_PROMPT, timed_generate, _noop_log
+from .paths import data_path
+from .server import model_digests
+
+# Το num_ctx ευθυγραμμίζεται σε πολλαπλάσια του ALIGN για "στρογγυλές" προτάσεις
+ALIGN = 1024
+FULL_GPU = 0.999
+
+AUTOTUNE_FIELDS = [
+    "kind", "ts", "model", "digest", "num_ctx", "num_gpu", "eval_tps", "size", "size_vram",
+    "gpu_fraction", "fits", "recommended_ctx", "recommended_num_gpu", "status", "error"
+]
+
+
+def gpu_residency(model, client=None):
+    """(size, size_vram) του φορτωμένου μοντέλου από το ollama.ps() (None αν δεν είναι φορτωμένο)."""
+    client = client or ollama
+    for m in client.ps().models:
+        if m.model == model or m.name == model:
+            return m.size, m.size_vram
+    return None
+
+
+def model_limits(model, client=None):
+    """(context_length εκπαίδευσης, πλήθος layers) από το ollama.show(), όπου υπάρχουν."""
+    client = client or ollama
+    try:
+        info = client.show(model).modelinfo or {}
+    except Exception:
+        return None, None
+    ctx = next((v for k, v in info.items() if k.endswith(".context_length")), None)
+    blocks = next((v for k, v in info.items() if k.endswith(".block_count")), None)
+    # Ένα επιπλέον "layer" για το output, όπως το μετρά ο Ollama στο num_gpu
+    return ctx, (blocks + 1 if blocks else None)
+
+
+def _align(value):
+    return max(ALIGN, int(value) // ALIGN * ALIGN)
+
+
+def _record(model, digest, **fields):
+    rec = dict.fromkeys(AUTOTUNE_FIELDS)
+    rec.update(kind="autotune_probe", ts=time.time(), model=model, digest=digest)
+    rec.update(fields)
+    return rec
+
+
+class AutotuneStore:
+    """Προτεινόμενες ρυθμίσεις ανά digest σε ένα JSON αρχείο."""
+
+    def __init__(self, path=None):
+        self.path = path or data_path("autotune.json")
+        self.lock = threading.Lock()
+
+    def _load(self):
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def save(self, digest, result):
+        with self.lock:
+            data = self._load()
+            data[digest or result["model"]] = result
+            with open(self.path, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False, indent=2)
+
+    def get(self, digest):
+        with self.lock:
+            return self._load().get(digest)
+
+    def for_model(self, model):
+        """Η πιο πρόσφατη πρόταση για ένα όνομα μοντέλου (ανεξαρτήτως digest)."""
+        with self.lock:
+            entries = [e for e in self._load().values() if e.get("model") == model]
+        return max(entries, key=lambda e: e.get("ts", 0)) if entries else None
+
+
+def run_autotune(model, min_ctx=2048, max_ctx=None, tps_drop=0.5, search_num_gpu=False,
+                 prompt=STRESS_PROMPT, keep_alive="5m", client=None, store=None, digest=None, log=None):
+    """Binary search του num_ctx· παράγει ένα record ανά probe και ένα τελικό record.
+
+    Ένα σημείο "χωράει" όταν το μοντέλο είναι 100% στη VRAM και το TPS δεν έχει
+    πέσει κάτω από tps_drop × TPS του min_ctx. Με search_num_gpu, αν ούτε το
+    min_ctx χωράει, γίνεται binary search στα layers (num_gpu) που φορτώνονται.
+    """
+    log = log or _noop_log
+    if digest is None:
+        try:
+            digest = model_digests(client).get(model)
+        except Exception:
+            digest = None
+    train_ctx, layers = model_limits(model, client)
+    max_ctx = _align(max_ctx or train_ctx or 32768)
+    if train_ctx:
+        max_ctx = min(max_ctx, _align(train_ctx))
+    min_ctx = min(_align(min_ctx), max_ctx)
+    baseline = {}
+
+    def probe(ctx, num_gpu=None):
+        options = {"num_ctx": ctx}
+        if num_gpu is not None:
+            options["num_gpu"] = num_gpu
+        log(f"🎯 Auto-Tune: {model} @ num_ctx={ctx}" + (f", num_gpu={num_gpu}" if num_gpu is not None else "") + "...")
+        try:
+            m = timed_generate(model, prompt, options=options, keep_alive=keep_alive, stream=False, client=client)
+            residency = gpu_residency(model, client)
+        except Exception as e:
+            return _record(model, digest, num_ctx=ctx, num_gpu=num_gpu, fits=False, status="error", error=str(e))
+        size, size_vram = residency or (None, None)
+        fraction = size_vram / size if size else None
+        tps = m["eval_tps"]
+        on_gpu = fraction is not None and fraction >= FULL_GPU
+        fast = not baseline or tps >= tps_drop * baseline["tps"]
+        return _record(
+            model, digest, num_ctx=ctx, num_gpu=num_gpu, eval_tps=tps, size=size, size_vram=size_vram,
+            gpu_fraction=fraction, fits=on_gpu and fast, status="ok"
+        )
+
+    first = probe(min_ctx)
+    yield first
+    best, best_gpu = None, None
+    if first["fits"]:
+        baseline["tps"] = first["eval_tps"]
+        best = first
+        top = probe(max_ctx)
+        yield top
+        if top["fits"]:
+            best = top
+        else:
+            lo, hi = min_ctx, max_ctx
+            while hi - lo > ALIGN:
+                mid = _align((lo + hi) // 2)
+                if mid <= lo:
+                    break
+                rec = probe(mid)
+                yield rec
+                if rec["fits"]:
+                    lo, best = mid, rec
+                else:
+                    hi = mid
+    elif search_num_gpu and layers:
+        # Ούτε το min_ctx χωράει: μέγιστος αριθμός layers στη GPU χωρίς σφάλμα φόρτωσης
+        log(f"⚠️ Το {model} δεν χωρά ολόκληρο στη GPU ούτε στα {min_ctx} tokens· αναζήτηση num_gpu...", "error")
+        lo, hi = 0, layers
+        while lo < hi:
+            mid = (lo + hi + 1) // 2
+            rec = probe(min_ctx, mid)
+            yield rec
+            if rec["status"] == "ok":
+                lo, best_gpu = mid, rec
+            else:
+                hi = mid - 1
+
+    chosen = best or best_gpu
+    result = _record(
+        model, digest, kind="autotune",
+        num_ctx=chosen["num_ctx"] if chosen else None,
+        num_gpu=chosen["num_gpu"] if chosen else None,
+        eval_tps=chosen["eval_tps"] if chosen else None,
+        size=chosen["size"] if chosen else None,
+        size_vram=chosen["size_vram"] if chosen else None,
+        gpu_fraction=chosen["gpu_fraction"] if chosen else None,
+        fits=best is not None,
+        recommended_ctx=best["num_ctx"] if best else (min_ctx if best_gpu else None),
+        recommended_num_gpu=best_gpu["num_gpu"] if best_gpu and not best else None,
+        status="ok" if chosen else "error",
+        error=None if chosen else "καμία ρύθμιση δεν φορτώθηκε επιτυχώς",
+    )
+    if store is not None and chosen:
+        store.save(digest, result)
+    if best:
+        log(f"✅ Προτεινόμενο num_ctx για {model}: {best['num_ctx']} (100% GPU, {best['eval_tps']:.2f} TPS)", "success")
+    elif best_gpu:
+        log(f"⚠️ {model}: μερικό offload, προτεινόμενο num_gpu={best_gpu['num_gpu']} @ {min_ctx} ctx", "error")
+    yield result
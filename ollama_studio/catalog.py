@@ -0,0 +1,119 @@
+# Ollama Diamond Studio v12.5
+# Copyright (c) 2026 Marinos
+# Licensed under the MIT License (see LICENSE file for details)
+
+"""Μόνιμη cache μεταδεδομένων μοντέλων, με κλειδί το digest.
+
+Στην εκκίνηση το GUI γεμίζει τις λίστες αμέσως από τη cache. Μετά, το
+reconcile() συγκρίνει με το ollama.list() και καλεί ollama.show() μόνο για
+digests που δεν έχουν ξαναδεί (νέο μοντέλο ή νέα έκδοση ενός tag).
+"""
+
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import ollama
+
+from .engine import _noop_log
+from .paths import data_path
+
+MODEL_FIELDS = [
+    "model", "digest", "size", "modified_at", "family", "parameter_size",
+    "quantization_level", "context_length", "block_count"
+]
+
+
+def model_details(show):
+    """Τα πεδία που μας ενδιαφέρουν από μια απάντηση του ollama.show()."""
+    details = show.details
+    info = show.modelinfo or {}
+    return {
+        "family": getattr(details, "family", None),
+        "parameter_size": getattr(details, "parameter_size", None),
+        "quantization_level": getattr(details, "quantization_level", None),
+        "context_length": next((v for k, v in info.items() if k.endswith(".context_length")), None),
+        "block_count": next((v for k, v in info.items() if k.endswith(".block_count")), None),
+    }
+
+
+def format_model_info(entry):
+    """Σύντομη περιγραφή για το UI, π.χ. "7.6B · Q4_K_M · ctx 32768 · 4.7 GB"."""
+    parts = [entry.get("parameter_size"), entry.get("quantization_level")]
+    if entry.get("context_length"):
+        parts.append(f"ctx {entry['context_length']}")
+    if entry.get("size"):
+        parts.append(f"{entry['size'] / 1024**3:.1f} GB")
+    return " · ".join(p for p in parts if p)
+
+
+class ModelCache:
+    """Λίστα μοντέλων και λεπτομέρειες ανά digest σε ένα JSON αρχείο."""
+
+    def __init__(self, path=None):
+        self.path = path or data_path("models.json")
+        self.lock = threading.Lock()
+
+    def _load(self):
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            data = {}
+        data.setdefault("models", [])
+        data.setdefault("details", {})
+        return data
+
+    def _save(self, data):
+        with open(self.path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+
+    def models(self):
+        """Τα μοντέλα του τελευταίου reconcile, με τις λεπτομέρειές τους (χωρίς κλήση στο API)."""
+        with self.lock:
+            data = self._load()
+        return [{**m, **data["details"].get(m["digest"], {})} for m in data["models"]]
+
+    def reconcile(self, client=None, log=None, workers=4):
+        """Συγχρονίζει τη cache με το ollama.list(); show() μόνο για νέα digests.
+
+        Επιστρέφει τα ενημερωμένα entries (όπως το models()).
+        """
+        client = client or ollama
+        log = log or _noop_log
+        listed = [
+            {"model": m.model, "digest": m.digest, "size": m.size, "modified_at": str(m.modified_at)}
+            for m in client.list().models
+        ]
+        with self.lock:
+            data = self._load()
+        known = data["details"]
+        missing = {m["digest"]: m["model"] for m in listed if m["digest"] not in known}
+
+        def fetch(item):
+            digest, name = item
+            try:
+                return digest, model_details(client.show(name))
+            except Exception as e:
+                log(f"⚠️ show({name}): {e}", "error")
+                return digest, None
+
+        t0 = time.perf_counter()
+        fetched = {}
+        if missing:
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                fetched = {d: info for d, info in pool.map(fetch, missing.items()) if info is not None}
+
+        with self.lock:
+            data = self._load()
+            data["details"].update(fetched)
+            # Μόνο τα digests που υπάρχουν ακόμα· τα διαγραμμένα ή αντικατεστημένα φεύγουν
+            current = {m["digest"] for m in listed}
+            data["details"] = {d: v for d, v in data["details"].items() if d in current}
+            data["models"] = listed
+            data["updated"] = time.time()
+            self._save(data)
+        if missing:
+            log(f"🗂️ Cache μοντέλων: {len(fetched)}/{len(missing)} νέα digests σε {time.perf_counter() - t0:.2f} s")
+        return [{**m, **data["details"].get(m["digest"], {})} for m in listed]
@@ -0,0 +1,179 @@
+# Ollama Diamond Studio v12.5
+# Copyright (c) 2026 Marinos
+# Licensed under the MIT License (see LICENSE file for details)
+
+"""Multi-turn chat benchmark με ollama.chat: επαναχρησιμοποίηση prefix και eviction.
+
+Κάθε session είναι μια συνομιλία με μεγάλο system prompt και ιστορικό που
+μεγαλώνει σε κάθε turn. Τρέχουν τρεις λειτουργίες (modes):
+
+- cold: κάθε turn έχει μοναδικό system prompt, οπότε ο Ollama επεξεργάζεται
+  όλο το ιστορικό (αναφορά για το πλήρες prompt_eval_count και latency)
+- sequential: τα sessions τρέχουν το ένα μετά το άλλο, άρα το prefix του
+  προηγούμενου turn είναι ακόμα στο KV cache
+- interleaved: ένα turn από κάθε session με τη σειρά. Με περισσότερα sessions
+  από τα slots του OLLAMA_NUM_PARALLEL, το cache εκτοπίζεται και η
+  επαναχρησιμοποίηση χάνεται
+
+Το αποτέλεσμα είναι μια καμπύλη latency ανά turn για κάθε mode.
+"""
+
+import random
+import time
+
+import ollama
+
+from .engine import _noop_log
+from .stats import eval_tps, mean, prefill_tps
+from .trials import unload_model
+from .workloads import get_corpus, corpus_text
+
+CHAT_MODES = ["cold", "sequential", "interleaved"]
+
+
+def stream_chat(model, messages, options=None, keep_alive=None, client=None):
+    """ollama.chat με stream=True: TTFT, συνολικός χρόνος, απάντηση και τελικό chunk."""
+    client = client or ollama
+    start_t = time.perf_counter()
+    first = None
+    parts = []
+    final = {}
+    for chunk in client.chat(model=model, messages=messages, options=options,
+                             keep_alive=keep_alive, stream=True):
+        content = (chunk.get("message") or {}).get("content")
+        if content:
+            if first is None:
+                first = time.perf_counter()
+            parts.append(content)
+        if chunk.get("done"):
+            final = chunk
+    return {
+        "ttft": (first - start_t) if first else None,
+        "wall_time": time.perf_counter() - start_t,
+        "reply": "".join(parts),
+        "final": final,
+    }
+
+
+def chat_schedule(sessions, turns, mode):
+    """Σειρά (session, turn): ανά session (sequential/cold) ή ανά turn (interleaved)."""
+    if mode == "interleaved":
+        return [(s, t) for t in range(turns) for s in range(sessions)]
+    return [(s, t) for s in range(sessions) for t in range(turns)]
+
+
+class ChatScript:
+    """Ντετερμινιστικά system prompts και μηνύματα χρήστη ανά session/turn."""
+
+    def __init__(self, corpus="chat", system_tokens=512, user_tokens=128, seed=0):
+        self.corpus = get_corpus(corpus)
+        self.system_tokens = system_tokens
+        self.user_tokens = user_tokens
+        self.seed = seed
+
+    def _text(self, key, tokens):
+        rng = random.Random(f"{self.corpus.name}:{self.seed}:{key}")
+        return corpus_text(self.corpus, rng, int(tokens * self.corpus.chars_per_token))
+
+    def system(self, session, nonce=None):
+        # Το nonce μπαίνει στην αρχή: αλλάζει το prefix από το πρώτο token
+        head = f"[{nonce}] " if nonce is not None else ""
+        return {"role": "system", "content": f"{head}You are support assistant #{session}. Reference notes:\n"
+                                             + self._text(f"system{session}", self.system_tokens)}
+
+    def user(self, session, turn):
+        return {"role": "user", "content": self._text(f"user{session}.{turn}", self.user_tokens)}
+
+
+def run_chat_bench(model, sessions=3, turns=8, modes=None, num_ctx=8192, num_predict=64,
+                   system_tokens=512, user_tokens=128, corpus="chat", seed=0, keep_alive="10m",
+                   client=None, log=None):
+    """Τρέχει τα modes (cold / sequential / interleaved) και παράγει ένα record ανά turn.
+
+    Το `reuse` ενός turn είναι 1 − prompt_eval_count / prompt_eval_count του
+    cold mode για το ίδιο session/turn (ποσοστό του prompt που ήρθε από το cache).
+    """
+    log = log or _noop_log
+    modes = list(modes or CHAT_MODES)
+    if sessions < 2 and "interleaved" in modes:
+        modes.remove("interleaved")  # με ένα session είναι ίδιο με το sequential
+    script = ChatScript(corpus, system_tokens, user_tokens, seed)
+    options = {"num_ctx": num_ctx, "num_predict": num_predict, "temperature": 0, "seed": seed}
+    cold = {}
+    log(f"💬 Chat benchmark: {model}, {sessions} sessions × {turns} turns, modes: {', '.join(modes)}")
+
+    for mode in modes:
+        # Κάθε mode ξεκινά με άδειο cache, ώστε να μην κληρονομεί prefix από το προηγούμενο
+        try:
+            unload_model(model, client)
+        except Exception as e:
+            log(f"⚠️ Unload {model}: {e}", "error")
+        histories = {s: [script.system(s)] for s in range(sessions)}
+        for session, turn in chat_schedule(sessions, turns, mode):
+            history = histories[session] + [script.user(session, turn)]
+            messages = history
+            if mode == "cold":
+                messages = [script.system(session, nonce=f"cold {session}.{turn}")] + history[1:]
+            rec = {"kind": "chat", "ts": time.time(), "model": model, "mode": mode, "session": session,
+                   "turn": turn, "num_ctx": num_ctx, "messages": len(messages)}
+            try:
+                m = stream_chat(model, messages, options=options, keep_alive=keep_alive, client=client)
+            except Exception as e:
+                log(f"❌ Chat {mode} s{session} t{turn}: {e}", "error")
+                rec.update(status="error", error=str(e))
+                yield rec
+                return
+            final = m["final"]
+            count = final.get("prompt_eval_count") or 0
+            if mode == "cold":
+                cold[(session, turn)] = count
+            full = cold.get((session, turn))
+            rec.update(
+                prompt_eval_count=count, eval_count=final.get("eval_count"),
+                prefill_ms=(final.get("prompt_eval_duration") or 0) / 1e6,
+                prefill_tps=prefill_tps(final), eval_tps=eval_tps(final),
+                ttft=m["ttft"], latency=m["wall_time"],
+                reuse=1 - count / full if full else None,
+                ctx_full=bool(full and full >= num_ctx - num_predict),
+                status="ok", error=None,
+            )
+            if rec["ctx_full"]:
+                log(f"⚠️ s{session} t{turn}: το ιστορικό γέμισε το num_ctx={num_ctx} (truncation)", "error")
+            # Η πραγματική απάντηση μπαίνει στο ιστορικό, όπως σε μια εφαρμογή chat
+            histories[session] = history + [{"role": "assistant", "content": m["reply"]}]
+            yield rec
+    log(f"🏁 Το chat benchmark για το {model} ολοκληρώθηκε.")
+
+
+def chat_curve(records):
+    """Καμπύλη ανά turn: μέσοι όροι των sessions για κάθε mode.
+
+    Επιστρέφει λίστα dicts {turn, <mode>_ttft, <mode>_latency, <mode>_prompt, <mode>_reuse}.
+    """
+    groups = {}
+    for rec in records:
+        if rec.get("status") == "ok":
+            groups.setdefault(rec["turn"], {}).setdefault(rec["mode"], []).append(rec)
+    curve = []
+    for turn in sorted(groups):
+        point = {"turn": turn}
+        for mode, recs in groups[turn].items():
+            ttfts = [r["ttft"] for r in recs if r["ttft"] is not None]
+            reuses = [r["reuse"] for r in recs if r["reuse"] is not None]
+            point[f"{mode}_ttft"] = mean(ttfts) if ttfts else None
+            point[f"{mode}_latency"] = mean([r["latency"] for r in recs])
+            point[f"{mode}_prompt"] = mean([r["prompt_eval_count"] for r in recs])
+            point[f"{mode}_reuse"] = mean(reuses) if reuses else None
+        curve.append(point)
+    return curve
+
+
+def eviction_hint(curve, gap=0.3):
+    """Μήνυμα όταν το interleaved χάνει το cache που κρατά το sequential (None αλλιώς)."""
+    seq = [p["sequential_reuse"] for p in curve[1:] if p.get("sequential_reuse") is not None]
+    inter = [p["interleaved_reuse"] for p in curve[1:] if p.get("interleaved_reuse") is not None]
+    if not seq or not inter or mean(seq) - mean(inter) < gap:
+        return None
+    return (f"Eviction: reuse {mean(seq) * 100:.0f}% στο sequential αλλά {mean(inter) * 100:.0f}% στο interleaved. "
+            f"Τα ταυτόχρονα sessions δεν χωρούν στα slots· αυξήστε το OLLAMA_NUM_PARALLEL "
+            f"(με αντίστοιχα μεγαλύτερο num_ctx/VRAM) ή μειώστε τα ταυτόχρονα sessions.")
@@ -0,0 +1,860 @@
+# Ollama Diamond Studio v12.5
+# Copyright (c) 2026 Marinos
+# Licensed under the MIT License (see LICENSE file for details)
+
+"""Γραμμή εντολών για headless benchmarks (χωρίς tkinter).
+
+Παράδειγμα:
+    python -m ollama_studio bench --model llama3.2:3b --ctx 4096,8192 --repeat 5 --out results.jsonl
+"""
+
+import argparse
+import contextlib
+import csv
+import json
+import os
+import shlex
+import sys
+import time
+
+from . import __version__
+
+
+def _stderr_log(message, type="info"):
+    """Τα logs πάνε στο stderr ώστε το stdout να μένει καθαρό JSONL/CSV."""
+    print(f"[{time.strftime('%H:%M:%S')}] {message}", file=sys.stderr, flush=True)
+
+
+def _int_list(text):
+    try:
+        return [int(x) for x in text.split(",") if x.strip()]
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"αναμενόταν λίστα ακεραίων, π.χ. 4096,8192 (δόθηκε: {text})")
+
+
+class RecordWriter:
+    """Γράφει records σε JSON lines ή CSV, με flush μετά από κάθε γραμμή."""
+
+    def __init__(self, path=None, fmt=None):
+        if fmt is None:
+            fmt = "csv" if path and path.lower().endswith(".csv") else "jsonl"
+        self.fmt = fmt
+        self.fh = open(path, "a" if fmt == "jsonl" else "w", encoding="utf-8", newline="") if path else sys.stdout
+        self.csv = None
+
+    def write(self, rec):
+        if self.fmt == "csv":
+            if self.csv is None:
+                # Οι στήλες ορίζονται από το πρώτο record (όλα τα records ενός run έχουν ίδιο σχήμα)
+                self.csv = csv.DictWriter(self.fh, fieldnames=list(rec), extrasaction="ignore")
+                self.csv.writeheader()
+            self.csv.writerow(rec)
+        else:
+            self.fh.write(json.dumps(rec, ensure_ascii=False, default=str) + "\n")
+        self.fh.flush()
+
+    def close(self):
+        if self.fh is not sys.stdout:
+            self.fh.close()
+
+
+def _start_sampler(args):
+    if args.no_gpu:
+        return None
+    if args.metrics and args.metrics.sampler:
+        # Με --metrics-port ο sampler του endpoint τρέχει ήδη: ένα nvidia-smi για όλα
+        return args.metrics.sampler
+    from .telemetry import GpuSampler
+    sampler = GpuSampler(tap=args.gpu_tap)
+    if not sampler.start():
+        _stderr_log(f"⚠️ GPU telemetry μη διαθέσιμη ({sampler.error})", "error")
+        return None
+    return sampler
+
+
+def _emit(records, args):
+    """Γράφει όλα τα records ενός run· επιστρέφει exit code (1 αν υπήρξε σφάλμα)."""
+    writer = RecordWriter(args.out, args.format)
+    failed = False
+    if args.metrics:
+        records = args.metrics.observed(records)
+    try:
+        for rec in records:
+            writer.write(rec)
+            failed = failed or rec.get("status") == "error"
+    finally:
+        writer.close()
+    return 1 if failed else 0
+
+
+def _emit_recorded(records, args, models):
+    """Όπως το _emit, αλλά γράφει και στο ιστορικό και ελέγχει για regressions (exit 2)."""
+    if args.no_history:
+        return _emit(records, args)
+    from .history import HistoryStore, recorded, check_regressions, format_finding
+    from .server import run_context
+    store = HistoryStore(args.history)
+    ids = []
+    context = run_context(models)
+    if args.trace_host:
+        # Μέσω proxy / replay server: στο ιστορικό ο πραγματικός host της καταγραφής
+        context["host"] = args.trace_host
+    try:
+        code = _emit(recorded(records, store, context, ids), args)
+        findings = check_regressions(store, ids)
+    finally:
+        store.close()
+    for f in findings:
+        _stderr_log(format_finding(f), "error")
+    if findings and args.fail_on_regression:
+        return 2
+    return code
+
+
+def _trial_policy(args):
+    from .trials import TrialPolicy
+    common = {"warmup": args.warmup, "cold": args.cold, "ci_target": args.ci_target}
+    if args.repeat is not None:
+        return TrialPolicy.fixed(args.repeat, **common)
+    # Με στόχο CI: τουλάχιστον 3 trials, αλλιώς ένα trial ανά σημείο
+    min_trials = args.min_trials or (3 if args.ci_target else 1)
+    max_trials = args.max_trials or (20 if args.ci_target else min_trials)
+    return TrialPolicy(min_trials=min_trials, max_trials=max_trials, **common)
+
+
+def _workload(args):
+    if not args.workload:
+        return None
+    from .workloads import Workload
+    return Workload(args.workload, fill=args.fill, num_predict=args.num_predict, seed=args.seed)
+
+
+def _flag_list(text):
+    """Λίστα on/off/default (π.χ. για flash attention) σε True/False/None."""
+    values = {"on": True, "off": False, "default": None}
+    try:
+        return [values[x.strip().lower()] for x in text.split(",") if x.strip()]
+    except KeyError:
+        raise argparse.ArgumentTypeError(f"αναμενόταν λίστα από on, off, default (δόθηκε: {text})")
+
+
+def _kv_list(text):
+    from .sweep import KV_CACHE_TYPES
+    kinds = [None if x.strip() == "default" else x.strip() for x in text.split(",") if x.strip()]
+    unknown = [k for k in kinds if k is not None and k not in KV_CACHE_TYPES]
+    if unknown:
+        raise argparse.ArgumentTypeError(f"άγνωστος τύπος KV cache: {', '.join(unknown)} ({', '.join(KV_CACHE_TYPES)})")
+    return kinds
+
+
+def _fleet(args):
+    """Fleet από το --hosts (None για τον τοπικό server, όπως πριν)."""
+    if not getattr(args, "hosts", None):
+        return None
+    from .fleet import Fleet, parse_hosts
+    return Fleet(parse_hosts(args.hosts))
+
+
+@contextlib.contextmanager
+def _trace_session(args):
+    """--record / --replay: το run μιλά με proxy ή fake server, που ορίζεται μέσω OLLAMA_HOST.
+
+    Το ollama διαβάζει το OLLAMA_HOST όταν εισάγεται, και το CLI το εισάγει
+    μόνο μέσα στις εντολές, άρα εδώ αρκεί η αλλαγή του περιβάλλοντος.
+    """
+    args.gpu_tap = args.trace_host = None
+    if not (args.record or args.replay):
+        yield
+        return
+    from .replay import RecordingProxy, Replayer, ReplayServer, Trace, TraceWriter
+    saved = {k: os.environ.get(k) for k in ("OLLAMA_HOST", "OLLAMA_STUDIO_GPU_CMD")}
+    writer = None
+    if args.record:
+        writer = TraceWriter(args.record)
+        server = RecordingProxy(writer).start()
+        args.gpu_tap = writer.gpu
+        args.trace_host = writer.host
+        _stderr_log(f"⏺️ Καταγραφή του {writer.host} στο {args.record}")
+    else:
+        trace = Trace.load(args.replay)
+        server = ReplayServer(Replayer(trace, args.replay_speed, args.replay_strict)).start()
+        args.trace_host = trace.header.get("host")
+        if trace.gpu:
+            os.environ["OLLAMA_STUDIO_GPU_CMD"] = shlex.join(
+                [sys.executable, "-m", "ollama_studio", "trace", "gpu", args.replay, "--speed", str(args.replay_speed)])
+        _stderr_log(f"▶️ Αναπαραγωγή του {args.replay}: {len(trace.exchanges)} κλήσεις, "
+                    f"{len(trace.gpu)} γραμμές GPU, ταχύτητα ×{args.replay_speed:g}")
+    os.environ["OLLAMA_HOST"] = server.host
+    try:
+        yield
+    finally:
+        server.stop()
+        if writer:
+            writer.close()
+        if args.replay and server.replayer.misses:
+            _stderr_log(f"⚠️ Replay: {server.replayer.misses} αιτήματα χωρίς καταγεγραμμένη απάντηση", "error")
+        for key, value in saved.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+
+
+@contextlib.contextmanager
+def _metrics_session(args):
+    """--metrics-port: endpoint Prometheus/OpenMetrics όσο τρέχει η εντολή.
+
+    Ένας GpuSampler και ένας LatencyWatchdog (probe στο /api/ps) γεμίζουν την
+    cache του exporter στο παρασκήνιο· τα scrapes διαβάζουν μόνο αυτή.
+    """
+    from .metrics import DEFAULT_PORT
+    args.metrics = None
+    port = args.metrics_port
+    if port is None and args.command == "metrics":
+        port = DEFAULT_PORT
+    if port is None:
+        yield
+        return
+    from .metrics import MetricsExporter, MetricsServer
+    from .telemetry import GpuSampler
+    from .watchdog import LatencyWatchdog
+    exporter = MetricsExporter()
+    if not getattr(args, "no_gpu", False):
+        exporter.sampler = GpuSampler(tap=args.gpu_tap)
+        if not exporter.sampler.start():
+            _stderr_log(f"⚠️ GPU telemetry μη διαθέσιμη ({exporter.sampler.error})", "error")
+            exporter.sampler = None
+    exporter.watchdog = LatencyWatchdog(interval=args.metrics_interval, tap=exporter.ps_tap)
+    exporter.watchdog.start()
+    server = MetricsServer(exporter, port, args.metrics_bind).start()
+    args.metrics = exporter
+    _stderr_log(f"📈 Metrics στο {server.url}")
+    try:
+        yield
+    finally:
+        server.stop()
+        exporter.watchdog.stop()
+        if exporter.sampler:
+            exporter.sampler.stop()
+
+
+def _thermal(args):
+    from .thermal import ThermalPolicy
+    return ThermalPolicy(cool_below=args.cool_below, max_wait=args.max_wait, throttle_temp=args.throttle_temp)
+
+
+def _preflight(args, models, contexts, sampler):
+    """Pre-flight εκτίμηση VRAM: (contexts που θα τρέξουν, wrapper που σημειώνει τα records)."""
+    if args.preflight == "off":
+        return contexts, lambda records: records
+    from .server import model_digests
+    from .vram import VramCalibration, annotate_vram, fitting_contexts, preflight, vram_budget
+    calibration = VramCalibration()
+    budget = args.vram_budget or vram_budget(sampler)
+    if budget is None:
+        _stderr_log("⚠️ Pre-flight: άγνωστη διαθέσιμη VRAM (χωρίς GPU telemetry ή --vram-budget)", "error")
+    estimates = preflight(models, contexts, budget, calibration, log=_stderr_log)
+    if args.preflight == "skip":
+        kept = fitting_contexts(estimates, models, contexts)
+        if kept != list(contexts):
+            _stderr_log(f"⏭️ Παράλειψη contexts που δεν χωρούν: {sorted(set(contexts) - set(kept))}")
+        contexts = kept
+    try:
+        digests = model_digests()
+    except Exception:
+        digests = {}
+    return contexts, lambda records: annotate_vram(records, estimates, calibration=calibration, digests=digests)
+
+
+def cmd_bench(args):
+    from .engine import DEFAULT_CONTEXTS, run_stress
+    fleet = _fleet(args)
+    if fleet:
+        # Απομακρυσμένοι hosts: χωρίς τοπική GPU telemetry και pre-flight (άλλη κάρτα, άλλο blob store)
+        from .fleet import fleet_run
+        try:
+            return _emit_recorded(fleet_run(
+                fleet, run_stress, args.model, contexts=args.ctx or DEFAULT_CONTEXTS, stream=not args.no_stream,
+                keep_alive=args.keep_alive, log=_stderr_log, policy=_trial_policy(args), workload=_workload(args)
+            ), args, [args.model])
+        finally:
+            fleet.close()
+    sampler = _start_sampler(args)
+    try:
+        contexts, annotate = _preflight(args, [args.model], args.ctx or DEFAULT_CONTEXTS, sampler)
+        if not contexts:
+            _stderr_log("❌ Καμία ρύθμιση δεν χωρά στη VRAM.", "error")
+            return 1
+        return _emit_recorded(annotate(run_stress(
+            args.model, contexts=contexts, stream=not args.no_stream, keep_alive=args.keep_alive,
+            sampler=sampler, log=_stderr_log, policy=_trial_policy(args), workload=_workload(args),
+            thermal=_thermal(args)
+        )), args, [args.model])
+    finally:
+        if sampler:
+            sampler.stop()
+
+
+def cmd_compare(args):
+    from .engine import run_compare
+    fleet = _fleet(args)
+    if fleet:
+        from .fleet import fleet_run
+        try:
+            return _emit_recorded(fleet_run(
+                fleet, run_compare, args.models[0], args.models[1], contexts=args.ctx, stream=args.stream,
+                keep_alive=args.keep_alive, log=_stderr_log
+            ), args, args.models)
+        finally:
+            fleet.close()
+    return _emit_recorded(run_compare(
+        args.models[0], args.models[1], contexts=args.ctx, stream=args.stream,
+        keep_alive=args.keep_alive, log=_stderr_log
+    ), args, args.models)
+
+
+def cmd_load(args):
+    from .loadtest import run_load_sweep
+    fleet = _fleet(args)
+    if fleet:
+        from .fleet import fleet_run
+        try:
+            return _emit(fleet_run(
+                fleet, run_load_sweep, args.model, levels=args.levels, keep_alive=args.keep_alive,
+                max_requests=args.requests, duration=args.duration, log=_stderr_log
+            ), args)
+        finally:
+            fleet.close()
+    return _emit(run_load_sweep(
+        args.model, levels=args.levels, keep_alive=args.keep_alive,
+        max_requests=args.requests, duration=args.duration, log=_stderr_log
+    ), args)
+
+
+def cmd_tournament(args):
+    from .engine import COMPARE_CONTEXTS
+    from .tournament import run_tournament, summarize_tournament
+    records = []
+    sampler = _start_sampler(args)
+
+    def collect():
+        for rec in annotate(run_tournament(
+            args.models, contexts=contexts, policy=_trial_policy(args), stream=args.stream,
+            keep_alive=args.keep_alive or "10m", sampler=sampler, log=_stderr_log, workload=_workload(args),
+            thermal=_thermal(args)
+        )):
+            records.append(rec)
+            yield rec
+    try:
+        # Σε λειτουργία skip μένουν μόνο contexts όπου χωρούν όλα τα μοντέλα (δίκαιη σύγκριση)
+        contexts, annotate = _preflight(args, args.models, args.ctx or COMPARE_CONTEXTS, sampler)
+        if not contexts:
+            _stderr_log("❌ Κανένα context δεν χωρά στη VRAM για όλα τα μοντέλα.", "error")
+            return 1
+        code = _emit_recorded(collect(), args, args.models)
+    finally:
+        if sampler:
+            sampler.stop()
+    standings, pairs = summarize_tournament(records)
+    for s in standings:
+        ci = f" ± {s['ci']:.2f}" if s["ci"] is not None else ""
+        _stderr_log(f"#{s['rank']} {s['model']} @ {s['num_ctx']}: {s['mean']:.2f}{ci} TPS (n={s['n']})")
+    for p in pairs:
+        verdict = f"νικητής {p['winner']}" if p["significant"] else "μη σημαντική διαφορά"
+        _stderr_log(f"⚖️ {p['num_ctx']}: {p['model_x']} vs {p['model_y']} {p['diff_pct']:+.1f}% "
+                    f"(p={p['p_adj']:.3f}) → {verdict}")
+    return code
+
+
+def cmd_soak(args):
+    from .engine import run_soak
+    from .thermal import sustained_vs_burst
+    records = []
+    sampler = _start_sampler(args)
+
+    def collect():
+        for rec in run_soak(
+            args.model, duration=args.duration, num_ctx=args.ctx, stream=not args.no_stream,
+            keep_alive=args.keep_alive or "10m", sampler=sampler, log=_stderr_log, workload=_workload(args),
+            thermal=_thermal(args)
+        ):
+            records.append(rec)
+            yield rec
+    try:
+        code = _emit_recorded(collect(), args, [args.model])
+    finally:
+        if sampler:
+            sampler.stop()
+    summary = sustained_vs_burst(records, burst=args.burst)
+    if summary:
+        reasons = f" ({', '.join(summary['reasons'])})" if summary["reasons"] else ""
+        _stderr_log(f"🔥 Burst {summary['burst']:.2f} → sustained {summary['sustained']:.2f} TPS "
+                    f"({-summary['drop_pct']:+.1f}%) | throttled {summary['throttled']}/{summary['samples']}{reasons}")
+    return code
+
+
+def cmd_embed(args):
+    from .embeddings import _require_numpy, best_batches, run_embed_sweep
+    try:
+        _require_numpy()
+    except RuntimeError as e:
+        _stderr_log(f"❌ {e}", "error")
+        return 1
+    records = []
+
+    def collect():
+        for rec in run_embed_sweep(
+            args.model, batches=args.batches, lengths=args.lengths, repeats=args.repeats, warmup=args.warmup,
+            num_ctx=args.ctx, corpus=args.corpus, seed=args.seed, keep_alive=args.keep_alive or "10m",
+            log=_stderr_log
+        ):
+            records.append(rec)
+            yield rec
+    code = _emit(collect(), args)
+    for tokens, (batch, value) in best_batches(records).items():
+        _stderr_log(f"🏆 ~{tokens} tokens/είσοδο: καλύτερο batch {batch} ({value:.0f} tokens/s)")
+    return code
+
+
+def cmd_hosts(args):
+    from .fleet import Fleet, HostRegistry, parse_hosts
+    registry = HostRegistry()
+    if args.action in ("add", "remove"):
+        if not args.name or (args.action == "add" and not args.url):
+            _stderr_log(f"❌ hosts {args.action}: λείπει το όνομα{' ή το URL' if args.action == 'add' else ''}", "error")
+            return 1
+        if args.action == "add":
+            _stderr_log(f"🌐 Host {args.name} → {registry.add(args.name, args.url)}")
+        elif registry.remove(args.name) is None:
+            _stderr_log(f"❌ Άγνωστος host: {args.name}", "error")
+            return 1
+        return 0
+    hosts = parse_hosts(args.hosts, registry) if args.hosts else registry.hosts()
+    if args.action == "list":
+        return _emit(({"kind": "host", "host": url, "host_name": name} for name, url in hosts.items()), args)
+    fleet = Fleet(hosts, timeout=args.timeout)
+    try:
+        if args.action == "status":
+            return _emit(fleet.status(), args)
+        return _emit(fleet.ps(log=_stderr_log) if args.action == "ps" else fleet.list(log=_stderr_log), args)
+    finally:
+        fleet.close()
+
+
+def cmd_chat(args):
+    from .chatbench import chat_curve, eviction_hint, run_chat_bench
+    records = []
+
+    def collect():
+        for rec in run_chat_bench(
+            args.model, sessions=args.sessions, turns=args.turns, modes=args.modes, num_ctx=args.ctx,
+            num_predict=args.num_predict, system_tokens=args.system_tokens, user_tokens=args.user_tokens,
+            corpus=args.corpus, seed=args.seed, keep_alive=args.keep_alive or "10m", log=_stderr_log
+        ):
+            records.append(rec)
+            yield rec
+    code = _emit(collect(), args)
+    curve = chat_curve(records)
+    for p in curve:
+        cells = []
+        for mode in args.modes:
+            if p.get(f"{mode}_latency") is None:
+                continue
+            ttft = f"{p[f'{mode}_ttft'] * 1000:.0f} ms" if p[f"{mode}_ttft"] is not None else "N/A"
+            reuse = f", reuse {p[f'{mode}_reuse'] * 100:.0f}%" if p[f"{mode}_reuse"] is not None else ""
+            cells.append(f"{mode}: TTFT {ttft}, prompt {p[f'{mode}_prompt']:.0f} tok{reuse}")
+        _stderr_log(f"💬 Turn {p['turn'] + 1}: " + " | ".join(cells))
+    hint = eviction_hint(curve)
+    if hint:
+        _stderr_log(f"⚠️ {hint}", "error")
+    return code
+
+
+def cmd_sweep(args):
+    from .sweep import SweepSpace, modelfile_block, run_sweep
+    space = SweepSpace(args.models, num_batch=args.num_batch, num_thread=args.num_thread, num_gpu=args.num_gpu,
+                       flash_attention=args.flash_attention, kv_cache_type=args.kv_cache)
+    points = space.sample(args.random, args.seed) if args.random else None
+    recommended = []
+    sampler = _start_sampler(args)
+
+    def collect():
+        for rec in run_sweep(
+            space, points=points, num_ctx=args.ctx, num_predict=args.num_predict, trials=args.trials,
+            warmup=args.warmup, keep_alive=args.keep_alive or "5m", budget_mb=args.vram_budget,
+            tolerance=args.tolerance, sampler=sampler, log=_stderr_log
+        ):
+            if rec.get("recommended"):
+                recommended.append(rec)
+            yield rec
+    try:
+        code = _emit(collect(), args)
+    finally:
+        if sampler:
+            sampler.stop()
+    if args.modelfile:
+        os.makedirs(args.modelfile, exist_ok=True)
+        for rec in recommended:
+            path = os.path.join(args.modelfile, rec["model"].replace(":", "-").replace("/", "_") + ".Modelfile")
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(modelfile_block(rec))
+            _stderr_log(f"📝 {path}")
+    return code
+
+
+def cmd_watch(args):
+    from .watchdog import LatencyWatchdog, WatchdogPolicy
+    policy = WatchdogPolicy(p99_ms=args.p99_ms, error_rate=args.error_rate, max_failures=args.max_failures,
+                            min_samples=args.min_samples, cooldown=args.cooldown, auto_restart=args.auto_restart)
+    watchdog = LatencyWatchdog(args.host, interval=args.interval, timeout=args.timeout, endpoint=args.endpoint,
+                               policy=policy, log=_stderr_log)
+    _stderr_log(f"📡 Watchdog: {watchdog.host}{args.endpoint} κάθε {args.interval:g} s"
+                f"{' (αυτόματη επανεκκίνηση)' if args.auto_restart else ''}")
+    try:
+        return _emit(watchdog.run(args.duration), args)
+    except KeyboardInterrupt:
+        return 0
+    finally:
+        st = watchdog.stats()
+        if st["samples"]:
+            p50 = f"{st['p50_ms']:.0f}" if st["p50_ms"] is not None else "N/A"
+            p99 = f"{st['p99_ms']:.0f}" if st["p99_ms"] is not None else "N/A"
+            _stderr_log(f"📊 {st['samples']} probes: p50 {p50} ms, p99 {p99} ms, σφάλματα {st['error_rate'] * 100:.0f}%")
+
+
+def cmd_metrics(args):
+    # Το endpoint το ξεκινά το _metrics_session· εδώ απλώς μένει ανοιχτό
+    _stderr_log("📈 Ctrl+C για τερματισμό" if args.duration is None else f"📈 Για {args.duration:g} s")
+    end = time.monotonic() + args.duration if args.duration else None
+    try:
+        while end is None or time.monotonic() < end:
+            time.sleep(0.5 if end is None else max(0.0, min(0.5, end - time.monotonic())))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+def cmd_restart(args):
+    from .watchdog import restart_server
+    return _emit([restart_server(args.host, ready_timeout=args.timeout, log=_stderr_log)], args)
+
+
+def cmd_trace(args):
+    from .replay import RecordingProxy, Replayer, ReplayServer, Trace, TraceWriter, replay_gpu
+    if args.action == "info":
+        return _emit(Trace.load(args.path).summary(), args)
+    if args.action == "gpu":
+        try:
+            replay_gpu(Trace.load(args.path), speed=args.speed)
+        except BrokenPipeError:
+            pass
+        return 0
+    writer = sampler = None
+    if args.action == "record":
+        writer = TraceWriter(args.path, args.upstream)
+        server = RecordingProxy(writer, args.upstream, args.port)
+        if not args.no_gpu:
+            from .telemetry import GpuSampler
+            sampler = GpuSampler(tap=writer.gpu)
+            if not sampler.start():
+                _stderr_log(f"⚠️ GPU telemetry μη διαθέσιμη ({sampler.error})", "error")
+        _stderr_log(f"⏺️ Proxy προς {writer.host}, καταγραφή στο {args.path}")
+    else:
+        trace = Trace.load(args.path)
+        server = ReplayServer(Replayer(trace, args.speed, args.strict), args.port)
+        _stderr_log(f"▶️ Fake server: {len(trace.exchanges)} κλήσεις από το {args.path}, ταχύτητα ×{args.speed:g}")
+    _stderr_log(f"🔌 OLLAMA_HOST={server.host} (Ctrl+C για τερματισμό)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        if sampler:
+            sampler.stop()
+        if writer:
+            writer.close()
+    return 0
+
+
+def cmd_autotune(args):
+    from .autotune import AutotuneStore, run_autotune
+    return _emit(run_autotune(
+        args.model, min_ctx=args.min_ctx, max_ctx=args.max_ctx, tps_drop=args.tps_drop,
+        search_num_gpu=args.num_gpu, keep_alive=args.keep_alive or "5m",
+        store=None if args.no_save else AutotuneStore(), log=_stderr_log
+    ), args)
+
+
+def cmd_pull(args):
+    from .pulls import run_pull_queue
+    return _emit(run_pull_queue(args.models, concurrency=args.concurrency, log=_stderr_log,
+                                interval=args.interval), args)
+
+
+def cmd_models(args):
+    from .catalog import MODEL_FIELDS, ModelCache
+    cache = ModelCache()
+    entries = cache.models() if args.cached else cache.reconcile(log=_stderr_log)
+    return _emit(({"kind": "model", **{f: e.get(f) for f in MODEL_FIELDS}} for e in entries), args)
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="ollama_studio", description="Ollama AI Studio - headless benchmarks")
+    parser.add_argument("--version", action="version", version=f"%(prog)s {__version__}")
+    trace = parser.add_mutually_exclusive_group()
+    trace.add_argument("--record", metavar="TRACE", default=None,
+                       help="καταγραφή όλων των κλήσεων Ollama και του nvidia-smi σε trace (.jsonl ή .jsonl.gz)")
+    trace.add_argument("--replay", metavar="TRACE", default=None,
+                       help="αναπαραγωγή ενός trace αντί για τον πραγματικό server (χωρίς GPU)")
+    parser.add_argument("--replay-speed", type=float, default=1.0,
+                        help="ταχύτητα αναπαραγωγής: 1 = όπως καταγράφηκε, 10 = ×10, 0 = χωρίς καθυστερήσεις")
+    parser.add_argument("--replay-strict", action="store_true",
+                        help="μόνο ακριβές ταίριασμα αιτήματος (αλλιώς οποιαδήποτε απάντηση του ίδιου endpoint)")
+    parser.add_argument("--metrics-port", type=int, default=None, metavar="PORT",
+                        help="endpoint Prometheus/OpenMetrics (/metrics) όσο τρέχει η εντολή")
+    parser.add_argument("--metrics-bind", default="127.0.0.1", help="διεύθυνση του endpoint μετρικών")
+    parser.add_argument("--metrics-interval", type=float, default=5.0,
+                        help="δευτερόλεπτα μεταξύ των ollama ps του endpoint (ανεξάρτητα από τα scrapes)")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    def add_output(p):
+        p.add_argument("--out", help="αρχείο εξόδου (.jsonl ή .csv)· προεπιλογή stdout")
+        p.add_argument("--format", choices=["jsonl", "csv"], help="μορφή εξόδου (προεπιλογή από την κατάληξη)")
+
+    def add_generate(p):
+        p.add_argument("--keep-alive", default=None, help="keep_alive για το generate (π.χ. 0, 5m, -1)")
+        add_output(p)
+
+    def add_history(p):
+        p.add_argument("--history", default=None, help="βάση SQLite ιστορικού (προεπιλογή ~/.ollama_studio/history.db)")
+        p.add_argument("--no-history", action="store_true", help="χωρίς καταγραφή στο ιστορικό")
+        p.add_argument("--fail-on-regression", action="store_true", help="exit code 2 αν εντοπιστεί regression")
+
+    def add_preflight(p):
+        p.add_argument("--preflight", choices=["warn", "skip", "off"], default="warn",
+                       help="εκτίμηση VRAM πριν το run: προειδοποίηση, παράλειψη ρυθμίσεων που δεν χωρούν ή off")
+        p.add_argument("--vram-budget", type=float, default=None,
+                       help="διαθέσιμη VRAM σε MB (προεπιλογή: από το nvidia-smi)")
+
+    def add_workload(p):
+        p.add_argument("--workload", default=None,
+                       help="corpus που γεμίζει το context: code, chat, summarization ή file:<path>")
+        p.add_argument("--fill", type=float, default=0.5, help="ποσοστό του num_ctx στο prompt (π.χ. 0.25, 0.5, 0.9)")
+        p.add_argument("--num-predict", type=int, default=128, help="σταθερό μήκος εξόδου σε tokens")
+        p.add_argument("--seed", type=int, default=0, help="seed του ντετερμινιστικού prompt")
+
+    def add_hosts(p):
+        p.add_argument("--hosts", nargs="+", default=None, metavar="HOST",
+                       help="παράλληλο run σε πολλούς hosts: όνομα του registry, όνομα=url ή host:port")
+
+    def add_thermal(p, cool_below=None):
+        p.add_argument("--cool-below", type=float, default=cool_below,
+                       help="πριν από κάθε trial αναμονή μέχρι η GPU να πέσει κάτω από αυτούς τους °C")
+        p.add_argument("--max-wait", type=float, default=300.0, help="μέγιστη αναμονή ψύξης ανά trial σε s")
+        p.add_argument("--throttle-temp", type=float, default=83.0,
+                       help="°C πάνω από τους οποίους μια μέτρηση σημειώνεται ως throttled")
+
+    def add_trials(p, warmup=0, ci_target=None):
+        p.add_argument("--repeat", type=int, default=None, help="σταθερός αριθμός trials ανά επίπεδο")
+        p.add_argument("--warmup", type=int, default=warmup, help="warm-up επαναλήψεις πριν τις μετρήσεις")
+        p.add_argument("--cold", action="store_true", help="cold start: unload και keep_alive=0 σε κάθε trial")
+        p.add_argument("--min-trials", type=int, default=None)
+        p.add_argument("--max-trials", type=int, default=None)
+        p.add_argument("--ci-target", type=float, default=ci_target,
+                       help="επανάληψη μέχρι το σχετικό CI του TPS να πέσει κάτω από αυτό (π.χ. 0.05)")
+
+    p = sub.add_parser("bench", help="stress test ενός μοντέλου σε επίπεδα context")
+    p.add_argument("--model", required=True)
+    p.add_argument("--ctx", type=_int_list, default=None, help="λίστα num_ctx, π.χ. 4096,8192")
+    add_trials(p)
+    p.add_argument("--no-stream", action="store_true", help="χωρίς streaming (μόνο eval TPS)")
+    p.add_argument("--no-gpu", action="store_true", help="χωρίς nvidia-smi telemetry")
+    add_workload(p)
+    add_preflight(p)
+    add_thermal(p)
+    add_hosts(p)
+    add_generate(p)
+    add_history(p)
+    p.set_defaults(func=cmd_bench)
+
+    p = sub.add_parser("compare", help="σύγκριση ταχύτητας δύο μοντέλων")
+    p.add_argument("--models", nargs=2, required=True, metavar=("A", "B"))
+    p.add_argument("--ctx", type=_int_list, default=None)
+    p.add_argument("--stream", action="store_true")
+    add_hosts(p)
+    add_generate(p)
+    add_history(p)
+    p.set_defaults(func=cmd_compare)
+
+    p = sub.add_parser("tournament", help="N-way σύγκριση μοντέλων με pairwise σημαντικότητα")
+    p.add_argument("--models", nargs="+", required=True)
+    p.add_argument("--ctx", type=_int_list, default=None)
+    p.add_argument("--stream", action="store_true")
+    add_trials(p, warmup=1, ci_target=0.05)
+    p.add_argument("--no-gpu", action="store_true", help="χωρίς nvidia-smi telemetry")
+    add_workload(p)
+    add_preflight(p)
+    add_thermal(p)
+    add_generate(p)
+    add_history(p)
+    p.set_defaults(func=cmd_tournament)
+
+    p = sub.add_parser("soak", help="συνεχές φορτίο: burst vs sustained throughput και throttling")
+    p.add_argument("--model", required=True)
+    p.add_argument("--ctx", type=int, default=4096, help="num_ctx")
+    p.add_argument("--duration", type=float, default=300.0, help="διάρκεια σε s")
+    p.add_argument("--burst", type=int, default=3, help="πρώτα αιτήματα που μετρούν ως burst")
+    p.add_argument("--no-stream", action="store_true", help="χωρίς streaming (μόνο eval TPS)")
+    p.add_argument("--no-gpu", action="store_true", help="χωρίς nvidia-smi telemetry")
+    add_workload(p)
+    add_thermal(p)
+    add_generate(p)
+    add_history(p)
+    p.set_defaults(func=cmd_soak)
+
+    p = sub.add_parser("chat", help="multi-turn chat: prefix cache reuse και eviction ανά turn")
+    p.add_argument("--model", required=True)
+    p.add_argument("--sessions", type=int, default=3, help="ταυτόχρονες συνομιλίες (για το interleaved mode)")
+    p.add_argument("--turns", type=int, default=8)
+    p.add_argument("--modes", nargs="+", choices=["cold", "sequential", "interleaved"],
+                   default=["cold", "sequential", "interleaved"])
+    p.add_argument("--ctx", type=int, default=8192, help="num_ctx")
+    p.add_argument("--num-predict", type=int, default=64)
+    p.add_argument("--system-tokens", type=int, default=512, help="μέγεθος system prompt σε tokens (περίπου)")
+    p.add_argument("--user-tokens", type=int, default=128, help="μέγεθος κάθε μηνύματος χρήστη (περίπου)")
+    p.add_argument("--corpus", default="chat", help="corpus μηνυμάτων: code, chat, summarization ή file:<path>")
+    p.add_argument("--seed", type=int, default=0)
+    add_generate(p)
+    p.set_defaults(func=cmd_chat)
+
+    p = sub.add_parser("embed", help="embeddings: sweep batch size × μήκος εισόδου (χρειάζεται NumPy)")
+    p.add_argument("--model", required=True)
+    p.add_argument("--batches", type=_int_list, default=None, help="batch sizes, π.χ. 1,4,16,64")
+    p.add_argument("--lengths", type=_int_list, default=None, help="tokens ανά είσοδο, π.χ. 64,256,1024")
+    p.add_argument("--repeats", type=int, default=5, help="μετρήσεις ανά σημείο")
+    p.add_argument("--warmup", type=int, default=1)
+    p.add_argument("--ctx", type=int, default=None, help="num_ctx (προεπιλογή του μοντέλου)")
+    p.add_argument("--corpus", default="summarization", help="code, chat, summarization ή file:<path>")
+    p.add_argument("--seed", type=int, default=0)
+    add_generate(p)
+    p.set_defaults(func=cmd_embed)
+
+    p = sub.add_parser("load", help="throughput vs concurrency")
+    p.add_argument("--model", required=True)
+    p.add_argument("--levels", type=_int_list, default=None, help="π.χ. 1,2,4,8,16")
+    budget = p.add_mutually_exclusive_group()
+    budget.add_argument("--requests", type=int, default=None, help="αιτήματα ανά επίπεδο")
+    budget.add_argument("--duration", type=float, default=None, help="δευτερόλεπτα ανά επίπεδο")
+    add_hosts(p)
+    add_generate(p)
+    p.set_defaults(func=cmd_load)
+
+    p = sub.add_parser("hosts", help="registry hosts και συγκεντρωτικά status/ps/models από όλους (fleet)")
+    p.add_argument("action", choices=["list", "add", "remove", "status", "ps", "models"])
+    p.add_argument("name", nargs="?", help="όνομα host (add/remove)")
+    p.add_argument("url", nargs="?", help="URL ή host:port (add)")
+    add_hosts(p)
+    p.add_argument("--timeout", type=float, default=5.0, help="timeout ανά host σε s")
+    add_output(p)
+    p.set_defaults(func=cmd_hosts)
+
+    p = sub.add_parser("sweep", help="sweep runtime options (num_batch, num_thread, num_gpu, FA, KV cache) με Pareto front")
+    p.add_argument("--models", nargs="+", required=True, help="παραλλαγές (quantization) του ίδιου μοντέλου")
+    p.add_argument("--num-batch", type=_int_list, default=None, help="π.χ. 128,512,1024")
+    p.add_argument("--num-thread", type=_int_list, default=None, help="π.χ. 4,8,16")
+    p.add_argument("--num-gpu", type=_int_list, default=None, help="layers στη GPU, π.χ. 20,28,99")
+    p.add_argument("--flash-attention", type=_flag_list, default=None,
+                   help="ρύθμιση server: λίστα από on, off, default (επανεκκίνηση του τοπικού server)")
+    p.add_argument("--kv-cache", type=_kv_list, default=None,
+                   help="ρύθμιση server: λίστα από f16, q8_0, q4_0, default (τα q8_0/q4_0 θέλουν flash attention)")
+    p.add_argument("--random", type=int, default=None, help="random search: N τυχαία σημεία αντί για όλο το grid")
+    p.add_argument("--seed", type=int, default=0)
+    p.add_argument("--ctx", type=int, default=4096, help="num_ctx")
+    p.add_argument("--num-predict", type=int, default=128, help="σταθερό μήκος εξόδου")
+    p.add_argument("--trials", type=int, default=2, help="μετρήσεις ανά σημείο")
+    p.add_argument("--warmup", type=int, default=1, help="warm-up ανά σημείο (περιλαμβάνει το load)")
+    p.add_argument("--vram-budget", type=float, default=None, help="μέγιστη μνήμη (MB) για την πρόταση")
+    p.add_argument("--tolerance", type=float, default=0.03,
+                   help="η πρόταση είναι η λιγότερη μνήμη μέσα σε αυτό το κλάσμα από το ταχύτερο σημείο")
+    p.add_argument("--modelfile", default=None, metavar="DIR", help="φάκελος για ένα Modelfile ανά μοντέλο")
+    p.add_argument("--no-gpu", action="store_true", help="χωρίς nvidia-smi telemetry (μνήμη από το ps)")
+    add_generate(p)
+    p.set_defaults(func=cmd_sweep)
+
+    p = sub.add_parser("watch", help="watchdog του API: latency p50/p99 και error rate ανά probe")
+    p.add_argument("--host", default=None, help="server (προεπιλογή OLLAMA_HOST)")
+    p.add_argument("--interval", type=float, default=5.0, help="δευτερόλεπτα μεταξύ probes")
+    p.add_argument("--timeout", type=float, default=2.0, help="timeout κάθε probe σε s")
+    p.add_argument("--endpoint", default="/api/ps", help="endpoint του probe")
+    p.add_argument("--duration", type=float, default=None, help="διάρκεια σε s (προεπιλογή: μέχρι Ctrl+C)")
+    p.add_argument("--p99-ms", type=float, default=None, help="όριο p99 latency σε ms")
+    p.add_argument("--error-rate", type=float, default=None, help="όριο ποσοστού αποτυχημένων probes (π.χ. 0.5)")
+    p.add_argument("--max-failures", type=int, default=3, help="συνεχόμενες αποτυχίες που θεωρούνται παραβίαση")
+    p.add_argument("--min-samples", type=int, default=10, help="δείγματα πριν ελεγχθούν p99 και error rate")
+    p.add_argument("--cooldown", type=float, default=120.0, help="ελάχιστα s μεταξύ αυτόματων επανεκκινήσεων")
+    p.add_argument("--auto-restart", action="store_true", help="επανεκκίνηση του τοπικού server όταν ξεπεραστούν τα όρια")
+    add_output(p)
+    p.set_defaults(func=cmd_watch)
+
+    p = sub.add_parser("metrics", help="μόνο το endpoint Prometheus/OpenMetrics (GPU, ollama ps, latency του API)")
+    # SUPPRESS: χωρίς τιμή εδώ ισχύουν τα global --metrics-port / --metrics-bind / --metrics-interval
+    p.add_argument("--port", dest="metrics_port", type=int, default=argparse.SUPPRESS,
+                   help="θύρα του /metrics (προεπιλογή --metrics-port ή 9464)")
+    p.add_argument("--bind", dest="metrics_bind", default=argparse.SUPPRESS,
+                   help="διεύθυνση (0.0.0.0 για scrape από άλλο μηχάνημα)")
+    p.add_argument("--interval", dest="metrics_interval", type=float, default=argparse.SUPPRESS,
+                   help="δευτερόλεπτα μεταξύ των ollama ps")
+    p.add_argument("--duration", type=float, default=None, help="διάρκεια σε s (προεπιλογή: μέχρι Ctrl+C)")
+    p.add_argument("--no-gpu", action="store_true", help="χωρίς nvidia-smi telemetry")
+    p.set_defaults(func=cmd_metrics)
+
+    p = sub.add_parser("restart", help="επανεκκίνηση του τοπικού ollama serve με αναμονή ετοιμότητας")
+    p.add_argument("--host", default=None, help="server (προεπιλογή OLLAMA_HOST)")
+    p.add_argument("--timeout", type=float, default=60.0, help="μέγιστη αναμονή ετοιμότητας σε s")
+    add_output(p)
+    p.set_defaults(func=cmd_restart)
+
+    p = sub.add_parser("trace", help="record/replay: proxy καταγραφής, fake server και σύνοψη ενός trace")
+    p.add_argument("action", choices=["record", "serve", "info", "gpu"])
+    p.add_argument("path", help="αρχείο trace (.jsonl ή .jsonl.gz)")
+    p.add_argument("--port", type=int, default=11435, help="θύρα του proxy / fake server")
+    p.add_argument("--upstream", default=None, help="πραγματικός server για το record (προεπιλογή OLLAMA_HOST)")
+    p.add_argument("--speed", type=float, default=1.0, help="ταχύτητα αναπαραγωγής (0 = χωρίς καθυστερήσεις)")
+    p.add_argument("--strict", action="store_true", help="μόνο ακριβές ταίριασμα αιτήματος")
+    p.add_argument("--no-gpu", action="store_true", help="record χωρίς nvidia-smi")
+    add_output(p)
+    p.set_defaults(func=cmd_trace)
+
+    p = sub.add_parser("autotune", help="μέγιστο num_ctx που μένει 100%% στη GPU")
+    p.add_argument("--model", required=True)
+    p.add_argument("--min-ctx", type=int, default=2048)
+    p.add_argument("--max-ctx", type=int, default=None, help="προεπιλογή: context_length του μοντέλου")
+    p.add_argument("--tps-drop", type=float, default=0.5,
+                   help="σημείο με TPS κάτω από αυτό το κλάσμα του min-ctx θεωρείται offload")
+    p.add_argument("--num-gpu", action="store_true", help="αναζήτηση num_gpu αν δεν χωρά ούτε το min-ctx")
+    p.add_argument("--no-save", action="store_true", help="χωρίς αποθήκευση της πρότασης")
+    add_generate(p)
+    p.set_defaults(func=cmd_autotune)
+
+    p = sub.add_parser("models", help="εγκατεστημένα μοντέλα με λεπτομέρειες (cache ανά digest)")
+    p.add_argument("--cached", action="store_true", help="μόνο από την cache, χωρίς κλήση στον server")
+    add_output(p)
+    p.set_defaults(func=cmd_models)
+
+    p = sub.add_parser("pull", help="λήψη ενός ή περισσότερων μοντέλων (ουρά με παράλληλα pulls)")
+    p.add_argument("models", nargs="+")
+    p.add_argument("--concurrency", type=int, default=2, help="παράλληλα pulls (προεπιλογή 2)")
+    p.add_argument("--interval", type=float, default=1.0, help="ελάχιστο διάστημα μεταξύ records προόδου σε s")
+    add_output(p)
+    p.set_defaults(func=cmd_pull)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    try:
+        with _trace_session(args), _metrics_session(args):
+            return args.func(args)
+    except KeyboardInterrupt:
+        return 130
@@ -0,0 +1,130 @@
+# Ollama Diamond Studio v12.5
+# Copyright (c) 2026 Marinos
+# Licensed under the MIT License (see LICENSE file for details)
+
+"""Κεντρικός executor για το GUI: bounded worker pool και batched UI updates.
+
+Τα worker threads δεν αγγίζουν ποτέ widgets. Βάζουν σε ουρές log γραμμές,
+callbacks και ενημερώσεις γραμμών/widgets. Ο main loop τις αδειάζει μία φορά
+ανά frame (pump). Οι log γραμμές ενός frame γράφονται με ένα insert, οι
+ενημερώσεις της ίδιας γραμμής πίνακα ή του ίδιου widget συγχωνεύονται (κρατιέται η
+τελευταία) και τα νέα rows ενός πίνακα μπαίνουν μαζί.
+
+Το module δεν εισάγει tkinter: χρειάζεται μόνο ένα αντικείμενο με `after()`.
+"""
+
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+
+class UiDispatcher:
+    """Bounded worker pool + ουρά UI ενημερώσεων που αδειάζει ανά frame."""
+
+    def __init__(self, root, workers=8, frame_ms=50, max_calls_per_frame=500):
+        self.root = root
+        self.frame_ms = frame_ms
+        self.max_calls_per_frame = max_calls_per_frame
+        self.pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="studio-worker")
+        self.calls = queue.SimpleQueue()
+        self.logs = queue.SimpleQueue()
+        self.lock = threading.Lock()
+        self.pending_rows = {}      # (tree, iid) -> values  (upsert, τελευταία τιμή κερδίζει)
+        self.pending_configs = {}   # widget -> kwargs       (π.χ. progress bars)
+        self.pending_appends = []   # (tree, values)         (νέες γραμμές, με τη σειρά τους)
+        self.log_sink = None
+        self.running = False
+
+    # --- API για worker threads (thread-safe) ---
+    def submit(self, fn, *args, on_done=None, on_error=None):
+        """Τρέχει το fn στο pool· τα on_done/on_error εκτελούνται στο main thread."""
+        def task():
+            try:
+                result = fn(*args)
+            except Exception as e:
+                if on_error:
+                    self.call(on_error, e)
+                else:
+                    self.log(f"❌ {getattr(fn, '__name__', 'task')}: {e}", "error")
+                return
+            if on_done:
+                self.call(on_done, result)
+        return self.pool.submit(task)
+
+    def call(self, fn, *args):
+        """Προγραμματίζει ένα callback στο main thread (αντί για root.after(0, ...))."""
+        self.calls.put((fn, args))
+
+    def log(self, line, type="info"):
+        self.logs.put((line, type))
+
+    def upsert(self, tree, iid, values):
+        """Εισαγωγή ή ενημέρωση γραμμής Treeview· συγχωνεύεται ανά frame."""
+        with self.lock:
+            self.pending_rows[(tree, iid)] = values
+
+    def append(self, tree, values):
+        """Νέα γραμμή στο τέλος ενός Treeview· οι γραμμές ενός frame μπαίνουν μαζί."""
+        with self.lock:
+            self.pending_appends.append((tree, values))
+
+    def configure(self, widget, **kwargs):
+        """Ενημέρωση widget (π.χ. progress value)· μόνο η τελευταία ανά frame εφαρμόζεται."""
+        with self.lock:
+            self.pending_configs.setdefault(widget, {}).update(kwargs)
+
+    # --- Main thread ---
+    def start(self):
+        if not self.running:
+            self.running = True
+            self.root.after(self.frame_ms, self.pump)
+
+    def pump(self):
+        """Αδειάζει τις ουρές μία φορά ανά frame και ξαναπρογραμματίζεται."""
+        try:
+            self._drain_logs()
+            self._drain_rows()
+            self._drain_calls()
+        finally:
+            if self.running:
+                self.root.after(self.frame_ms, self.pump)
+
+    def _drain_logs(self):
+        lines = []
+        while True:
+            try:
+                lines.append(self.logs.get_nowait())
+            except queue.Empty:
+                break
+        if lines and self.log_sink:
+            self.log_sink(lines)
+
+    def _drain_rows(self):
+        with self.lock:
+            rows, self.pending_rows = self.pending_rows, {}
+            configs, self.pending_configs = self.pending_configs, {}
+            appends, self.pending_appends = self.pending_appends, []
+        for (tree, iid), values in rows.items():
+            if tree.exists(iid):
+                tree.item(iid, values=values)
+            else:
+                tree.insert("", "end", iid=iid, values=values)
+        for tree, values in appends:
+            tree.insert("", "end", values=values)
+        for widget, kwargs in configs.items():
+            widget.configure(**kwargs)
+
+    def _drain_calls(self):
+        for _ in range(self.max_calls_per_frame):
+            try:
+                fn, args = self.calls.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                fn(*args)
+            except Exception as e:
+                self.log(f"❌ UI update: {e}", "error")
+
+    def shutdown(self):
+        self.running = False
+        self.pool.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,155 @@
+# Ollama Diamond Studio v12.5
+# Copyright (c) 2026 Marinos
+# Licensed under the MIT License (see LICENSE file for details)
+
+"""Benchmark embeddings με ollama.embed: sweep σε batch size και μήκος εισόδου.
+
+Για κάθε σημείο (batch, tokens ανά είσοδο) γίνονται `repeats` κλήσεις με τις
+ίδιες εισόδους. Αναφέρονται vectors/s, tokens/s και latency p50/p95, ελέγχεται
+ότι η διάσταση των vectors είναι σταθερή και ότι οι επαναλήψεις δίνουν τα
+ίδια vectors (cosine similarity). Οι μετρήσεις μαζεύονται σε NumPy arrays.
+Το NumPy είναι προαιρετική εξάρτηση· χρειάζεται μόνο για αυτό το mode.
+"""
+
+import random
+import time
+
+import ollama
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from .engine import _noop_log
+from .workloads import corpus_text, get_corpus
+
+EMBED_BATCHES = [1, 4, 16, 64]
+EMBED_LENGTHS = [64, 256, 1024]
+
+# Κάτω από αυτή την cosine similarity οι επαναλήψεις θεωρούνται ασυνεπείς
+CONSISTENCY_MIN = 0.999
+
+
+def _require_numpy():
+    if np is None:
+        raise RuntimeError("Το benchmark embeddings χρειάζεται NumPy (pip install numpy)")
+
+
+def embed_inputs(corpus, batch, tokens, seed=0):
+    """Ντετερμινιστικές εισόδους ~`tokens` tokens η καθεμία (ίδιες σε κάθε run)."""
+    corpus = get_corpus(corpus) if isinstance(corpus, str) else corpus
+    chars = int(tokens * corpus.chars_per_token)
+    return [corpus_text(corpus, random.Random(f"{corpus.name}:{seed}:{tokens}:{i}"), chars) for i in range(batch)]
+
+
+def timed_embed(model, inputs, options=None, keep_alive=None, client=None):
+    """Μία κλήση ollama.embed: (latency σε s, vectors ως float32 array, απάντηση)."""
+    client = client or ollama
+    start_t = time.perf_counter()
+    res = client.embed(model=model, input=inputs, options=options, keep_alive=keep_alive)
+    latency = time.perf_counter() - start_t
+    rows = res.get("embeddings") or []
+    if len({len(r) for r in rows}) > 1:
+        raise ValueError(f"Vectors διαφορετικής διάστασης: {sorted({len(r) for r in rows})}")
+    return latency, np.asarray(rows, dtype=np.float32), res
+
+
+def cosine_rows(a, b):
+    """Cosine similarity ανά γραμμή δύο πινάκων ίδιου σχήματος."""
+    norms = np.linalg.norm(a, axis=1) * np.linalg.norm(b, axis=1)
+    return np.sum(a * b, axis=1) / np.where(norms > 0, norms, 1)
+
+
+def run_embed_sweep(model, batches=None, lengths=None, repeats=5, warmup=1, num_ctx=None, corpus="summarization",
+                    seed=0, keep_alive="10m", client=None, log=None):
+    """Sweep batch size × μήκος εισόδου· ένα record (kind="embed") ανά σημείο."""
+    _require_numpy()
+    log = log or _noop_log
+    batches = batches or EMBED_BATCHES
+    lengths = lengths or EMBED_LENGTHS
+    options = {"num_ctx": num_ctx} if num_ctx else None
+    dim = None
+    log(f"🧬 Embeddings: {model}, batch {batches} × tokens {lengths}, {repeats} επαναλήψεις")
+
+    for tokens in lengths:
+        for batch in batches:
+            rec = {"kind": "embed", "ts": time.time(), "model": model, "batch": batch, "input_tokens": tokens,
+                   "num_ctx": num_ctx, "repeats": repeats, "dim": None, "prompt_tokens": None,
+                   "vectors_per_s": None, "tokens_per_s": None, "lat_mean": None, "lat_p50": None,
+                   "lat_p95": None, "load_ms": None, "consistency": None, "status": None, "error": None}
+            inputs = embed_inputs(corpus, batch, tokens, seed)
+            latencies = np.empty(repeats)
+            counts = np.empty(repeats)
+            try:
+                for _ in range(warmup):
+                    timed_embed(model, inputs, options, keep_alive, client)
+                log(f"🧬 Embed: {model} batch={batch} × ~{tokens} tokens...")
+                first = None
+                similarity = np.ones(batch)
+                load_ns = 0
+                for i in range(repeats):
+                    latencies[i], vectors, res = timed_embed(model, inputs, options, keep_alive, client)
+                    counts[i] = res.get("prompt_eval_count") or 0
+                    load_ns += res.get("load_duration") or 0
+                    if vectors.shape[0] != batch:
+                        raise ValueError(f"{vectors.shape[0]} vectors για {batch} εισόδους")
+                    if dim is None:
+                        dim = vectors.shape[1]
+                    elif vectors.shape[1] != dim:
+                        raise ValueError(f"Η διάσταση άλλαξε από {dim} σε {vectors.shape[1]}")
+                    if first is None:
+                        first = vectors
+                    else:
+                        similarity = np.minimum(similarity, cosine_rows(first, vectors))
+            except Exception as e:
+                log(f"❌ Embed batch={batch} tokens={tokens}: {e}", "error")
+                rec.update(status="error", error=str(e))
+                yield rec
+                return
+            total_time = latencies.sum()
+            rec.update(
+                dim=dim,
+                prompt_tokens=float(counts.mean() / batch),
+                vectors_per_s=float(batch * repeats / total_time) if total_time > 0 else None,
+                tokens_per_s=float(counts.sum() / total_time) if total_time > 0 else None,
+                lat_mean=float(latencies.mean()),
+                lat_p50=float(np.percentile(latencies, 50)),
+                lat_p95=float(np.percentile(latencies, 95)),
+                load_ms=load_ns / repeats / 1e6,
+                consistency=float(similarity.min()),
+                status="ok",
+            )
+            if rec["consistency"] < CONSISTENCY_MIN:
+                log(f"⚠️ Embed batch={batch} tokens={tokens}: ασυνεπή vectors μεταξύ επαναλήψεων "
+                    f"(cosine {rec['consistency']:.4f})", "error")
+            if rec["prompt_tokens"] < tokens * 0.5:
+                # Το μοντέλο (ή το num_ctx) έκοψε τις εισόδους
+                log(f"⚠️ Embed tokens={tokens}: μόνο ~{rec['prompt_tokens']:.0f} tokens ανά είσοδο (truncation;)",
+                    "error")
+            yield rec
+    log(f"🏁 Το benchmark embeddings για το {model} ολοκληρώθηκε (διάσταση {dim}).")
+
+
+def embed_grid(records, metric="vectors_per_s"):
+    """Πίνακας metric[μήκος, batch] από τα records: (lengths, batches, grid με NaN όπου λείπει)."""
+    _require_numpy()
+    ok = [r for r in records if r.get("status") == "ok" and r.get(metric) is not None]
+    lengths = np.array(sorted({r["input_tokens"] for r in ok}))
+    batches = np.array(sorted({r["batch"] for r in ok}))
+    grid = np.full((len(lengths), len(batches)), np.nan)
+    for r in ok:
+        grid[np.searchsorted(lengths, r["input_tokens"]), np.searchsorted(batches, r["batch"])] = r[metric]
+    return lengths, batches, grid
+
+
+def best_batches(records, metric="tokens_per_s"):
+    """Το batch size με το μεγαλύτερο throughput για κάθε μήκος εισόδου: {tokens: (batch, τιμή)}."""
+    lengths, batches, grid = embed_grid(records, metric)
+    best = {}
+    for i, tokens in enumerate(lengths):
+        if np.all(np.isnan(grid[i])):
+            continue
+        j = int(np.nanargmax(grid[i]))
+        best[int(tokens)] = (int(batches[j]), float(grid[i, j]))
+    return best
@@ -0,0 +1,279 @@
+# Ollama Diamond Studio v12.5
+# Copyright (c) 2026 Marinos
+# Licensed under the MIT License (see LICENSE file for details)
+
+"""Headless benchmark engine: stress, compare και pull χωρίς Tkinter.
+
+Κάθε run είναι generator που παράγει "επίπεδα" records (dict), ώστε το GUI
+να τα γράφει σε Treeviews και το CLI σε JSON lines / CSV με τον ίδιο κώδικα.
+"""
+
+import time
+
+import ollama
+
+from .stats import percentile, eval_tps, prefill_tps
+from .telemetry import flatten_gpu_summary
+from .thermal import ThermalGuard, thermal_fields, throttle_summary
+from .trials import TrialPolicy, trial_fields, unload_model
+
+DEFAULT_CONTEXTS = [4096, 8192, 16384, 32768]
+COMPARE_CONTEXTS = [8192, 16384]
+STRESS_PROMPT = "Explain the theory of relativity in 100 words."
+COMPARE_PROMPT = "Say Hello"
+
+# Πεδία χρονισμού όπως τα επιστρέφει το τελευταίο chunk / η απάντηση του generate
+TIMING_FIELDS = [
+    "load_duration", "prompt_eval_count", "prompt_eval_duration",
+    "eval_count", "eval_duration", "total_duration"
+]
+MEASUREMENT_FIELDS = [
+    "eval_tps", "prefill_tps", "wall_tps", "ttft", "gap_p50", "gap_p95", "gap_p99", "wall_time"
+] + TIMING_FIELDS
+
+
+def _noop_log(message, type="info"):
+    pass
+
+
+def stream_generate(model, prompt, options=None, keep_alive=None, client=None):
+    """Εκτελεί generate με stream=True και χρονοσφραγίζει κάθε chunk."""
+    client = client or ollama
+    start_t = time.perf_counter()
+    stamps = []
+    final = {}
+    for chunk in client.generate(model=model, prompt=prompt, options=options,
+                                 keep_alive=keep_alive, stream=True):
+        now = time.perf_counter()
+        if chunk.get('response'):
+            stamps.append(now)
+        if chunk.get('done'):
+            final = chunk
+
+    # Κενά μεταξύ διαδοχικών tokens (ms) και wall-clock ταχύτητα αποκωδικοποίησης
+    gaps_ms = [(b - a) * 1000 for a, b in zip(stamps, stamps[1:])]
+    decode_wall = stamps[-1] - stamps[0] if len(stamps) > 1 else 0
+    return {
+        "ttft": (stamps[0] - start_t) if stamps else 0,
+        "p50": percentile(gaps_ms, 50),
+        "p95": percentile(gaps_ms, 95),
+        "p99": percentile(gaps_ms, 99),
+        "wall_tps": (len(stamps) - 1) / decode_wall if decode_wall > 0 else 0,
+        "eval_tps": eval_tps(final),
+        "chunks": len(stamps),
+        "wall_time": time.perf_counter() - start_t,
+        "final": final,
+    }
+
+
+def timed_generate(model, prompt, options=None, keep_alive=None, stream=True, client=None):
+    """Generate με την ίδια δομή μετρήσεων είτε με streaming είτε χωρίς."""
+    if stream:
+        return stream_generate(model, prompt, options=options, keep_alive=keep_alive, client=client)
+    client = client or ollama
+    start_t = time.perf_counter()
+    res = client.generate(model=model, prompt=prompt, options=options, keep_alive=keep_alive)
+    return {
+        "ttft": None, "p50": None, "p95": None, "p99": None, "wall_tps": None,
+        "eval_tps": eval_tps(res),
+        "chunks": None,
+        "wall_time": time.perf_counter() - start_t,
+        "final": res,
+    }
+
+
+def measurement_fields(m):
+    """Επίπεδα πεδία μέτρησης για ένα record (None όπου δεν υπάρχουν)."""
+    fields = dict.fromkeys(MEASUREMENT_FIELDS)
+    if m is None:
+        return fields
+    fields.update({
+        "eval_tps": m["eval_tps"], "prefill_tps": prefill_tps(m["final"]),
+        "wall_tps": m["wall_tps"], "ttft": m["ttft"],
+        "gap_p50": m["p50"], "gap_p95": m["p95"], "gap_p99": m["p99"],
+        "wall_time": m["wall_time"],
+    })
+    final = m["final"]
+    for key in TIMING_FIELDS:
+        fields[key] = final.get(key)
+    return fields
+
+
+def _prefixed(prefix, fields):
+    return {prefix + k: v for k, v in fields.items()}
+
+
+def run_stress(model, contexts=None, repeat=1, stream=True, prompt=STRESS_PROMPT,
+               keep_alive=None, sampler=None, client=None, log=None, policy=None, workload=None,
+               thermal=None):
+    """Stress test ενός μοντέλου σε επίπεδα num_ctx· παράγει ένα record ανά trial.
+
+    Το `policy` (TrialPolicy) ορίζει warm-up, cold/warm runs και adaptive
+    επανάληψη· χωρίς αυτό γίνονται `repeat` σταθερά trials ανά επίπεδο.
+    Με `workload` (Workload) το prompt γεμίζει ένα ποσοστό του num_ctx αντί
+    για το σταθερό `prompt`, και το num_predict είναι σταθερό.
+    Με `thermal` (ThermalPolicy) κάθε trial περιμένει πρώτα να κρυώσει η GPU.
+    Με sampler κάθε record σημειώνεται με τη θερμική κατάσταση (THERMAL_FIELDS).
+    """
+    log = log or _noop_log
+    policy = policy or TrialPolicy.fixed(repeat)
+    trial_keep_alive = 0 if policy.cold else keep_alive
+    guard = ThermalGuard(sampler, thermal, log) if sampler else None
+    for ctx in contexts or DEFAULT_CONTEXTS:
+        ctx_records = []
+        options = workload.options(ctx) if workload else {"num_ctx": ctx}
+        values = []
+        trial = 0
+        try:
+            for w in range(0 if policy.cold else policy.warmup):
+                log(f"🔥 Warm-up {w + 1}/{policy.warmup}: {model} @ {ctx} context...")
+                text = workload.prompt(ctx, f"w{w}") if workload else prompt
+                m = timed_generate(model, text, options=options, keep_alive=keep_alive, stream=stream, client=client)
+                if workload:
+                    workload.observe(text, m["final"].get("prompt_eval_count"), ctx)
+        except Exception as e:
+            log(f"❌ Error @ {ctx} ctx (warm-up): {e}", "error")
+        while not policy.done(values):
+            rec = {"kind": "stress", "ts": time.time(), "model": model, "num_ctx": ctx,
+                   "trial": trial, "phase": policy.phase, "stream": stream}
+            if workload:
+                rec.update(workload=workload.key, num_predict=workload.num_predict, fill=None)
+            try:
+                temp_start, waited = guard.cool_down() if guard else (None, 0.0)
+                if policy.cold:
+                    # Cold start: το μοντέλο φεύγει από τη VRAM πριν από κάθε trial
+                    unload_model(model, client)
+                log(f"🧪 Τεστ: {model} @ {ctx} context (trial {trial + 1}, {policy.phase})...")
+                # Μοναδικό prompt ανά trial: χωρίς επαναχρησιμοποίηση του KV cache από το προηγούμενο
+                text = workload.prompt(ctx, trial) if workload else prompt
+                t0 = time.monotonic()
+                m = timed_generate(model, text, options=options,
+                                   keep_alive=trial_keep_alive, stream=stream, client=client)
+                t1 = time.monotonic()
+            except Exception as e:
+                log(f"❌ Error @ {ctx} ctx: {e}", "error")
+                rec.update(measurement_fields(None))
+                rec.update(flatten_gpu_summary(None))
+                rec.update(thermal_fields(None))
+                rec.update(trial_fields(policy, values))
+                rec.update(status="error", error=str(e))
+                yield rec
+                return
+            rec.update(measurement_fields(m))
+            if workload:
+                rec["fill"] = (rec["prompt_eval_count"] or 0) / ctx
+            # VRAM/Temp στο ακριβές παράθυρο του generate (peak, όχι snapshot μετά)
+            rec.update(flatten_gpu_summary(sampler.summarize(t0, t1) if sampler else None))
+            rec.update(guard.tag(t0, t1, temp_start, waited) if guard else thermal_fields(None))
+            values.append(rec[policy.metric] or 0)
+            rec.update(trial_fields(policy, values))
+            rec.update(status="ok", error=None)
+            trial += 1
+            ctx_records.append(rec)
+            yield rec
+        stats = trial_fields(policy, values)
+        ci = f" ± {stats['metric_ci']:.2f}" if stats["metric_ci"] is not None else ""
+        log(f"📊 {model} @ {ctx}: {policy.metric} {stats['metric_mean']:.2f}{ci} (n={len(values)})")
+        hot, total, reasons = throttle_summary(ctx_records)
+        if hot:
+            log(f"🔥 {model} @ {ctx}: {hot}/{total} trials με throttling ({', '.join(reasons) or 'θερμοκρασία/clock'})",
+                "error")
+    log(f"🏁 Το Stress Test για το {model} ολοκληρώθηκε.")
+
+
+def run_soak(model, duration=300.0, num_ctx=4096, stream=True, prompt=STRESS_PROMPT, keep_alive="10m",
+             sampler=None, client=None, log=None, workload=None, thermal=None):
+    """Συνεχές φορτίο χωρίς παύσεις για `duration` δευτερόλεπτα· ένα record ανά generate.
+
+    Δείχνει πώς πέφτει το throughput όσο ζεσταίνεται η κάρτα (burst έναντι
+    sustained, βλ. thermal.sustained_vs_burst). Το `thermal` εδώ ορίζει μόνο
+    τα όρια ανίχνευσης throttling· δεν γίνεται αναμονή ψύξης μεταξύ των αιτημάτων.
+    """
+    log = log or _noop_log
+    options = workload.options(num_ctx) if workload else {"num_ctx": num_ctx}
+    guard = ThermalGuard(sampler, thermal, log) if sampler else None
+    log(f"🔥 Soak: {model} @ {num_ctx} context για {duration:.0f} s...")
+    try:
+        # Φόρτωση εκτός μέτρησης, ώστε το πρώτο record να είναι ήδη "burst"
+        timed_generate(model, workload.prompt(num_ctx, "w0") if workload else prompt, options=options,
+                       keep_alive=keep_alive, stream=stream, client=client)
+    except Exception as e:
+        log(f"❌ Error @ {num_ctx} ctx (warm-up): {e}", "error")
+    start = time.monotonic()
+    trial = 0
+    while time.monotonic() - start < duration:
+        rec = {"kind": "soak", "ts": time.time(), "model": model, "num_ctx": num_ctx, "trial": trial,
+               "elapsed": time.monotonic() - start, "stream": stream}
+        if workload:
+            rec.update(workload=workload.key, num_predict=workload.num_predict)
+        temp_start = guard.temperature() if guard else None
+        try:
+            t0 = time.monotonic()
+            m = timed_generate(model, workload.prompt(num_ctx, trial) if workload else prompt, options=options,
+                               keep_alive=keep_alive, stream=stream, client=client)
+            t1 = time.monotonic()
+        except Exception as e:
+            log(f"❌ Error @ {num_ctx} ctx: {e}", "error")
+            rec.update(measurement_fields(None))
+            rec.update(flatten_gpu_summary(None))
+            rec.update(thermal_fields(None))
+            rec.update(status="error", error=str(e))
+            yield rec
+            return
+        rec.update(measurement_fields(m))
+        rec.update(flatten_gpu_summary(sampler.summarize(t0, t1) if sampler else None))
+        rec.update(guard.tag(t0, t1, temp_start) if guard else thermal_fields(None))
+        rec.update(status="ok", error=None)
+        trial += 1
+        yield rec
+    log(f"🏁 Το soak για το {model} ολοκληρώθηκε ({trial} αιτήματα).")
+
+
+def run_compare(model_a, model_b, contexts=None, stream=False, prompt=COMPARE_PROMPT,
+                keep_alive=None, client=None, log=None):
+    """Σύγκριση ταχύτητας δύο μοντέλων· παράγει ένα record ανά επίπεδο context."""
+    log = log or _noop_log
+    log(f"⚖️ Σύγκριση: {model_a} vs {model_b}")
+    for ctx in contexts or COMPARE_CONTEXTS:
+        rec = {"kind": "compare", "ts": time.time(), "num_ctx": ctx, "stream": stream,
+               "model_a": model_a, "model_b": model_b,
+               "tps_a": None, "tps_b": None, "diff_pct": None, "winner": None}
+        rec.update(_prefixed("a_", measurement_fields(None)))
+        rec.update(_prefixed("b_", measurement_fields(None)))
+        try:
+            m_a = timed_generate(model_a, prompt, options={"num_ctx": ctx},
+                                 keep_alive=keep_alive, stream=stream, client=client)
+            m_b = timed_generate(model_b, prompt, options={"num_ctx": ctx},
+                                 keep_alive=keep_alive, stream=stream, client=client)
+        except Exception as e:
+            log(f"❌ Error comparing {model_a} and {model_b}: {e}", "error")
+            rec.update(status="error", error=str(e))
+            yield rec
+            continue
+        tps_a, tps_b = m_a["eval_tps"], m_b["eval_tps"]
+        rec.update(_prefixed("a_", measurement_fields(m_a)))
+        rec.update(_prefixed("b_", measurement_fields(m_b)))
+        rec.update(
+            tps_a=tps_a, tps_b=tps_b,
+            diff_pct=((tps_a - tps_b) / tps_b) * 100 if tps_b > 0 else 0,
+            winner=model_a if tps_a > tps_b else model_b,
+            status="ok", error=None
+        )
+        yield rec
+
+
+def run_pull(name, client=None, log=None):
+    """Λήψη μοντέλου με stream=True· παράγει ένα record ανά progress event."""
+    client = client or ollama
+    log = log or _noop_log
+    log(f"📥 Έναρξη λήψης: {name}...")
+    for progress in client.pull(name, stream=True):
+        total = progress.get('total')
+        completed = progress.get('completed')
+        yield {
+            "kind": "pull", "ts": time.time(), "model": name,
+            "status": progress.get('status'), "digest": progress.get('digest'),
+            "total": total, "completed": completed,
+            "pct": (completed / total) * 100 if total and completed is not None else None,
+        }
+    log(f"✅ Το μοντέλο {name} εγκαταστάθηκε!", "success")
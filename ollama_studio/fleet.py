@@ -0,0 +1,229 @@
+# Ollama Diamond Studio v12.5
+# Copyright (c) 2026 Marinos
+# Licensed under the MIT License (see LICENSE file for details)
+
+"""Fleet mode: πολλοί Ollama hosts με ένα pooled, keep-alive ollama.Client ανά host.
+
+Το registry (hosts.json) κρατά όνομα -> URL. Τα ps/list ρωτούνται σε όλους
+τους hosts ταυτόχρονα και συγκεντρώνονται σε records με πεδίο `host`. Το
+fleet_run() τρέχει τον ίδιο generator του engine (stress, compare, load) σε
+κάθε host παράλληλα και παράγει τα records καθώς έρχονται, σημειωμένα με host,
+έκδοση Ollama και digest, ώστε το ιστορικό να κρατά baseline ανά host.
+"""
+
+import json
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import httpx
+import ollama
+
+from .engine import _noop_log
+from .paths import data_path
+from .server import model_digests, resolve_host, server_version
+
+# Ανοιχτές συνδέσεις ανά host: αρκετές για το Load Test, με keep-alive μεταξύ των αιτημάτων
+POOL_LIMITS = httpx.Limits(max_connections=64, max_keepalive_connections=32, keepalive_expiry=120)
+
+
+class HostRegistry:
+    """Ονόματα hosts -> URL σε ένα JSON αρχείο."""
+
+    def __init__(self, path=None):
+        self.path = path or data_path("hosts.json")
+        self.lock = threading.Lock()
+
+    def _load(self):
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save(self, data):
+        with open(self.path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+
+    def hosts(self):
+        """Οι καταχωρημένοι hosts· χωρίς καταχώρηση μόνο ο τοπικός (OLLAMA_HOST)."""
+        with self.lock:
+            data = self._load()
+        return data or {"local": resolve_host()}
+
+    def add(self, name, url):
+        with self.lock:
+            data = self._load()
+            data[name] = resolve_host(url)
+            self._save(data)
+        return data[name]
+
+    def remove(self, name):
+        with self.lock:
+            data = self._load()
+            removed = data.pop(name, None)
+            self._save(data)
+        return removed
+
+
+def parse_hosts(specs, registry=None):
+    """Hosts από το CLI: "όνομα" του registry, "όνομα=url" ή σκέτο "host:port"."""
+    known = (registry or HostRegistry()).hosts()
+    hosts = {}
+    for spec in specs:
+        if "=" in spec:
+            name, url = spec.split("=", 1)
+        elif spec in known:
+            name, url = spec, known[spec]
+        else:
+            name, url = spec, spec
+        hosts[name] = resolve_host(url)
+    return hosts
+
+
+class Fleet:
+    """Ένα pooled ollama.Client ανά host, δημιουργείται μία φορά και ξαναχρησιμοποιείται."""
+
+    def __init__(self, hosts, timeout=None):
+        self.hosts = {name: resolve_host(url) for name, url in hosts.items()}
+        self.timeout = timeout
+        self.lock = threading.Lock()
+        self.clients = {}
+
+    def client(self, name):
+        with self.lock:
+            if name not in self.clients:
+                self.clients[name] = ollama.Client(host=self.hosts[name], timeout=self.timeout, limits=POOL_LIMITS)
+            return self.clients[name]
+
+    def close(self):
+        with self.lock:
+            clients, self.clients = list(self.clients.values()), {}
+        for c in clients:
+            c.close()
+
+    def map(self, fn, names=None):
+        """fn(όνομα, client) σε κάθε host ταυτόχρονα: {όνομα: αποτέλεσμα ή Exception}."""
+        names = list(names or self.hosts)
+        if not names:
+            return {}
+
+        def call(name):
+            try:
+                return name, fn(name, self.client(name))
+            except Exception as e:
+                return name, e
+        with ThreadPoolExecutor(max_workers=len(names)) as pool:
+            return dict(pool.map(call, names))
+
+    def status(self, names=None):
+        """Ένα record ανά host: έκδοση, πλήθος μοντέλων, φορτωμένα μοντέλα και VRAM (ή σφάλμα)."""
+        def probe(name, client):
+            t0 = time.perf_counter()
+            loaded = client.ps().models
+            latency = time.perf_counter() - t0
+            return {
+                "version": server_version(self.hosts[name]),
+                "models": len(client.list().models),
+                "loaded": len(loaded),
+                "size_vram": sum(m.size_vram or 0 for m in loaded),
+                "latency_ms": latency * 1000,
+            }
+        records = []
+        for name, result in self.map(probe, names).items():
+            rec = {"kind": "fleet_status", "ts": time.time(), "host": self.hosts[name], "host_name": name,
+                   "version": None, "models": None, "loaded": None, "size_vram": None, "latency_ms": None}
+            if isinstance(result, Exception):
+                rec.update(status="error", error=str(result))
+            else:
+                rec.update(result, status="ok", error=None)
+            records.append(rec)
+        return records
+
+    def ps(self, names=None, log=None):
+        """Συγκεντρωτικό ps: ένα record ανά (host, φορτωμένο μοντέλο)."""
+        log = log or _noop_log
+        records = []
+        for name, result in self.map(lambda n, c: c.ps().models, names).items():
+            if isinstance(result, Exception):
+                log(f"❌ [{name}] ps: {result}", "error")
+                continue
+            for m in result:
+                records.append({
+                    "kind": "fleet_ps", "host": self.hosts[name], "host_name": name, "model": m.model,
+                    "size": m.size, "size_vram": m.size_vram, "gpu_pct": (m.size_vram or 0) / m.size * 100 if m.size else None,
+                    "expires_at": str(m.expires_at) if m.expires_at else None,
+                })
+        return records
+
+    def list(self, names=None, log=None):
+        """Συγκεντρωτικό list: ένα record ανά (host, μοντέλο)."""
+        log = log or _noop_log
+        records = []
+        for name, result in self.map(lambda n, c: c.list().models, names).items():
+            if isinstance(result, Exception):
+                log(f"❌ [{name}] list: {result}", "error")
+                continue
+            for m in result:
+                records.append({
+                    "kind": "fleet_model", "host": self.hosts[name], "host_name": name, "model": m.model,
+                    "digest": m.digest, "size": m.size, "modified_at": str(m.modified_at),
+                })
+        return records
+
+
+def _host_log(log, name):
+    return lambda message, type="info": log(f"[{name}] {message}", type)
+
+
+def fleet_run(fleet, run, *args, names=None, log=None, **kwargs):
+    """Τρέχει `run(*args, client=..., log=..., **kwargs)` σε κάθε host παράλληλα.
+
+    Παράγει τα records με τη σειρά που ολοκληρώνονται, με πεδία host (URL,
+    όπως στο ιστορικό των απλών runs), host_name, ollama_version και το digest
+    του μοντέλου στον συγκεκριμένο host (digest, ή a_digest / b_digest στο compare).
+    """
+    log = log or _noop_log
+    names = list(names or fleet.hosts)
+    out = queue.SimpleQueue()
+    done = object()
+
+    def worker(name):
+        client = fleet.client(name)
+        host_log = _host_log(log, name)
+        try:
+            try:
+                digests = model_digests(client)
+            except Exception:
+                digests = {}
+            version = server_version(fleet.hosts[name])
+            for rec in run(*args, client=client, log=host_log, **kwargs):
+                rec["host"] = fleet.hosts[name]
+                rec["host_name"] = name
+                rec["ollama_version"] = version
+                if "model" in rec:
+                    rec["digest"] = digests.get(rec["model"])
+                for side in ("a", "b"):
+                    if f"model_{side}" in rec:
+                        rec[f"{side}_digest"] = digests.get(rec[f"model_{side}"])
+                out.put(rec)
+        except Exception as e:
+            host_log(f"❌ {e}", "error")
+            # Το πρώτο όρισμα είναι το μοντέλο σε όλα τα runs του engine (το ιστορικό απαιτεί model)
+            out.put({"kind": "fleet_error", "ts": time.time(), "model": str(args[0]) if args else "",
+                     "host": fleet.hosts[name], "host_name": name, "status": "error", "error": str(e)})
+        finally:
+            out.put(done)
+
+    log(f"🌐 Fleet: {len(names)} hosts ({', '.join(names)})")
+    with ThreadPoolExecutor(max_workers=len(names)) as pool:
+        for name in names:
+            pool.submit(worker, name)
+        remaining = len(names)
+        while remaining:
+            rec = out.get()
+            if rec is done:
+                remaining -= 1
+            else:
+                yield rec
@@ -0,0 +1,206 @@
+# Ollama Diamond Studio v12.5
+# Copyright (c) 2026 Marinos
+# Licensed under the MIT License (see LICENSE file for details)
+
+"""Μόνιμο ιστορικό benchmarks (SQLite) και ανίχνευση regressions.
+
+Κάθε record του engine γράφεται ως μία γραμμή ανά μοντέλο (το compare γίνεται
+δύο γραμμές) μαζί με host, έκδοση Ollama και digest, ώστε μια αναβάθμιση του
+Ollama, ενός driver ή ένα νέο quantization να συγκρίνεται με το ίδιο baseline.
+"""
+
+import json
+import sqlite3
+import threading
+import time
+
+from .engine import MEASUREMENT_FIELDS
+from .paths import data_path
+from .stats import mean, shift_p_value
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    ts REAL NOT NULL,
+    kind TEXT NOT NULL,
+    model TEXT NOT NULL,
+    digest TEXT,
+    num_ctx INTEGER,
+    ollama_version TEXT,
+    host TEXT,
+    config_key TEXT NOT NULL,
+    status TEXT,
+    {metrics},
+    record TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_runs_model ON runs(model);
+CREATE INDEX IF NOT EXISTS idx_runs_digest ON runs(digest);
+CREATE INDEX IF NOT EXISTS idx_runs_num_ctx ON runs(num_ctx);
+CREATE INDEX IF NOT EXISTS idx_runs_version ON runs(ollama_version);
+CREATE INDEX IF NOT EXISTS idx_runs_host ON runs(host);
+CREATE INDEX IF NOT EXISTS idx_runs_baseline ON runs(digest, config_key, host, id);
+""".format(metrics=",\n    ".join(f"{f} REAL" for f in MEASUREMENT_FIELDS))
+
+# Πεδία του record που ορίζουν "ίδια ρύθμιση" για σύγκριση με το baseline
+CONFIG_FIELDS = ["kind", "num_ctx", "stream", "phase", "options", "workload"]
+
+# Μετρικές που ελέγχονται για regression: True = μεγαλύτερο είναι καλύτερο
+REGRESSION_METRICS = {"eval_tps": True, "wall_tps": True, "ttft": False, "gap_p95": False}
+
+
+def config_key(rec):
+    """Κανονική (sorted) JSON αναπαράσταση των πεδίων ρύθμισης ενός record."""
+    return json.dumps({k: rec.get(k) for k in CONFIG_FIELDS if k in rec}, sort_keys=True, default=str)
+
+
+def rows_from_record(rec):
+    """Ένα record του engine -> γραμμές ανά μοντέλο (το compare δίνει δύο)."""
+    if rec.get("kind") == "compare":
+        rows = []
+        for side in ("a", "b"):
+            row = {k: v for k, v in rec.items() if not k.startswith(("a_", "b_"))}
+            row.update({f: rec.get(f"{side}_{f}") for f in MEASUREMENT_FIELDS})
+            row["model"] = rec[f"model_{side}"]
+            row["digest"] = rec.get(f"{side}_digest")
+            rows.append(row)
+        return rows
+    return [rec]
+
+
+class HistoryStore:
+    """SQLite βάση αποτελεσμάτων· ασφαλής για χρήση από worker threads."""
+
+    def __init__(self, path=None):
+        self.path = path or data_path("history.db")
+        self.conn = sqlite3.connect(self.path, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.lock = threading.Lock()
+        with self.lock, self.conn:
+            self.conn.executescript(SCHEMA)
+            # Βάσεις από παλαιότερες εκδόσεις: νέες μετρικές προστίθενται ως στήλες
+            columns = {r["name"] for r in self.conn.execute("PRAGMA table_info(runs)")}
+            for f in MEASUREMENT_FIELDS:
+                if f not in columns:
+                    self.conn.execute(f"ALTER TABLE runs ADD COLUMN {f} REAL")
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
+
+    def record(self, rec, context=None):
+        """Αποθηκεύει ένα record· επιστρέφει τα ids των γραμμών που γράφτηκαν."""
+        context = context or {}
+        digests = context.get("digests", {})
+        ids = []
+        with self.lock, self.conn:
+            for row in rows_from_record(rec):
+                columns = {
+                    "ts": row.get("ts") or time.time(),
+                    "kind": row["kind"],
+                    "model": row["model"],
+                    "digest": row.get("digest") or digests.get(row["model"]),
+                    "num_ctx": row.get("num_ctx"),
+                    "ollama_version": row.get("ollama_version") or context.get("ollama_version"),
+                    "host": row.get("host") or context.get("host"),
+                    "config_key": config_key(row),
+                    "status": row.get("status"),
+                    "record": json.dumps(row, ensure_ascii=False, default=str),
+                }
+                for f in MEASUREMENT_FIELDS:
+                    columns[f] = row.get(f)
+                cur = self.conn.execute(
+                    f"INSERT INTO runs ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})",
+                    list(columns.values())
+                )
+                ids.append(cur.lastrowid)
+        return ids
+
+    def baseline(self, metric, digest, config, host, before_id, limit=20):
+        """Οι τελευταίες `limit` επιτυχημένες τιμές μιας μετρικής πριν από το before_id.
+
+        Μετρήσεις σημειωμένες ως throttled δεν μπαίνουν στο baseline.
+        """
+        if metric not in MEASUREMENT_FIELDS:
+            raise ValueError(f"Άγνωστη μετρική: {metric}")
+        with self.lock:
+            rows = self.conn.execute(
+                f"SELECT {metric} FROM runs WHERE digest IS ? AND config_key = ? AND host IS ? "
+                f"AND id < ? AND status = 'ok' AND {metric} IS NOT NULL "
+                f"AND COALESCE(json_extract(record, '$.throttled'), 0) = 0 ORDER BY id DESC LIMIT ?",
+                (digest, config, host, before_id, limit)
+            ).fetchall()
+        return [r[0] for r in rows]
+
+    def rows(self, ids):
+        with self.lock:
+            return self.conn.execute(
+                f"SELECT * FROM runs WHERE id IN ({', '.join('?' * len(ids))}) ORDER BY id", list(ids)
+            ).fetchall()
+
+    def recent(self, model=None, limit=50):
+        with self.lock:
+            if model:
+                return self.conn.execute(
+                    "SELECT * FROM runs WHERE model = ? ORDER BY id DESC LIMIT ?", (model, limit)
+                ).fetchall()
+            return self.conn.execute("SELECT * FROM runs ORDER BY id DESC LIMIT ?", (limit,)).fetchall()
+
+
+def recorded(records, store, context=None, ids=None):
+    """Περνά τα records όπως είναι, γράφοντας το καθένα στο ιστορικό.
+
+    Αν δοθεί λίστα `ids`, συμπληρώνεται με τα ids των γραμμών (για check_regressions).
+    """
+    for rec in records:
+        if store is not None:
+            new_ids = store.record(rec, context)
+            if ids is not None:
+                ids.extend(new_ids)
+        yield rec
+
+
+def check_regressions(store, ids, alpha=0.05, min_effect=0.05, window=20, min_baseline=3):
+    """Συγκρίνει τις γραμμές ενός run με το κυλιόμενο baseline ίδιου digest/ρύθμισης.
+
+    Επιστρέφει λίστα ευρημάτων για μετρικές με στατιστικά σημαντική (p < alpha)
+    χειροτέρευση μεγαλύτερη από min_effect (σχετική μεταβολή). Οι throttled
+    μετρήσεις αγνοούνται: μια ζεστή κάρτα δεν είναι regression του μοντέλου.
+    """
+    if store is None or not ids:
+        return []
+    groups = {}
+    for row in store.rows(ids):
+        if row["status"] != "ok" or json.loads(row["record"]).get("throttled"):
+            continue
+        key = (row["model"], row["digest"], row["config_key"], row["host"])
+        group = groups.setdefault(key, {"first_id": row["id"], "num_ctx": row["num_ctx"], "rows": []})
+        group["rows"].append(row)
+
+    findings = []
+    for (model, digest, config, host), group in groups.items():
+        for metric, higher_is_better in REGRESSION_METRICS.items():
+            new = [r[metric] for r in group["rows"] if r[metric] is not None]
+            base = store.baseline(metric, digest, config, host, group["first_id"], window)
+            if not new or len(base) < min_baseline:
+                continue
+            base_mean, new_mean = mean(base), mean(new)
+            if base_mean == 0:
+                continue
+            # Για μετρικές "μικρότερο = καλύτερο" αλλάζουμε πρόσημο ώστε η χειροτέρευση να είναι πάντα πτώση
+            sign = 1 if higher_is_better else -1
+            p = shift_p_value([sign * v for v in new], [sign * v for v in base])
+            change = (new_mean - base_mean) / base_mean
+            if p < alpha and sign * change < -min_effect:
+                findings.append({
+                    "model": model, "digest": digest, "num_ctx": group["num_ctx"], "host": host,
+                    "metric": metric, "baseline": base_mean, "value": new_mean,
+                    "change_pct": change * 100, "p_value": p, "baseline_n": len(base),
+                })
+    return findings
+
+
+def format_finding(f):
+    """Μήνυμα log για ένα εύρημα regression."""
+    return (f"⚠️ Regression: {f['model']} @ {f['num_ctx']} ctx | {f['metric']} "
+            f"{f['baseline']:.2f} → {f['value']:.2f} ({f['change_pct']:+.1f}%, p={f['p_value']:.3f}, "
+            f"n={f['baseline_n']})")
@@ -0,0 +1,110 @@
+# Ollama Diamond Studio v12.5
+# Copyright (c) 2026 Marinos
+# Licensed under the MIT License (see LICENSE file for details)
+
+"""Load test: throughput vs concurrency με bounded thread pool."""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from .engine import STRESS_PROMPT, stream_generate, _noop_log
+from .stats import percentile
+
+DEFAULT_LEVELS = [1, 2, 4, 8, 16]
+
+
+def run_load_level(model, concurrency, prompt=STRESS_PROMPT, options=None, keep_alive=None,
+                   max_requests=None, duration=None, client=None):
+    """Τρέχει closed-loop φορτίο με `concurrency` workers για πλήθος αιτημάτων ή χρόνο."""
+    if max_requests is None and duration is None:
+        max_requests = concurrency * 4
+    lock = threading.Lock()
+    samples, errors = [], []
+    issued = [0]
+    start_t = time.perf_counter()
+    deadline = start_t + duration if duration else None
+
+    def claim():
+        # Κάθε worker "δεσμεύει" το επόμενο αίτημα μέχρι να εξαντληθεί το budget
+        with lock:
+            if max_requests is not None and issued[0] >= max_requests:
+                return False
+            if deadline is not None and time.perf_counter() >= deadline:
+                return False
+            issued[0] += 1
+            return True
+
+    def worker():
+        while claim():
+            try:
+                m = stream_generate(model, prompt, options=options, keep_alive=keep_alive, client=client)
+                final = m["final"]
+                # Ό,τι δεν εξηγείται από load + prompt eval πριν το 1ο token είναι αναμονή στην ουρά
+                server_pre = ((final.get('load_duration') or 0) + (final.get('prompt_eval_duration') or 0)) / 1e9
+                m["queue"] = max(0.0, m["ttft"] - server_pre)
+                m["tokens"] = final.get('eval_count') or m["chunks"]
+                with lock:
+                    samples.append(m)
+            except Exception as e:
+                with lock:
+                    errors.append(str(e))
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for _ in range(concurrency):
+            pool.submit(worker)
+    wall = time.perf_counter() - start_t
+
+    latencies = [m["wall_time"] for m in samples]
+    ttfts = [m["ttft"] for m in samples]
+    queues = [m["queue"] for m in samples]
+    return {
+        "kind": "load",
+        "ts": time.time(),
+        "model": model,
+        "concurrency": concurrency,
+        "requests": len(samples),
+        "errors": len(errors),
+        "wall": wall,
+        "agg_tps": sum(m["tokens"] for m in samples) / wall if wall > 0 else 0,
+        "rps": len(samples) / wall if wall > 0 else 0,
+        "lat_p50": percentile(latencies, 50),
+        "lat_p95": percentile(latencies, 95),
+        "lat_p99": percentile(latencies, 99),
+        "ttft_p50": percentile(ttfts, 50),
+        "ttft_p95": percentile(ttfts, 95),
+        "queue_p50": percentile(queues, 50),
+        "queue_p95": percentile(queues, 95),
+        "last_error": errors[-1] if errors else None,
+    }
+
+
+def run_load_sweep(model, levels=None, prompt=STRESS_PROMPT, options=None, keep_alive=None,
+                   max_requests=None, duration=None, client=None, log=None):
+    """Σάρωση επιπέδων concurrency· παράγει ένα record ανά επίπεδο (με scaling)."""
+    log = log or _noop_log
+    results = []
+    for conc in levels or DEFAULT_LEVELS:
+        log(f"⚡ Load Test: {model} @ {conc} ταυτόχρονα αιτήματα...")
+        r = run_load_level(model, conc, prompt, options=options, keep_alive=keep_alive,
+                           max_requests=max_requests, duration=duration, client=client)
+        if r["requests"] == 0:
+            log(f"❌ Load Test @ {conc}: καμία επιτυχής απάντηση ({r['last_error']})", "error")
+            break
+        results.append(r)
+        base = results[0]["agg_tps"]
+        r["scaling"] = r["agg_tps"] / base if base > 0 else 0
+        yield r
+
+    knee = find_saturation_knee(results)
+    if knee:
+        log(f"📈 Σημείο κορεσμού (knee): ~{knee} ταυτόχρονα αιτήματα → δοκιμάστε OLLAMA_NUM_PARALLEL={knee}", "success")
+    log(f"🏁 Το Load Test για το {model} ολοκληρώθηκε.")
+
+
+def find_saturation_knee(levels, min_gain=0.10):
+    """Πρώτο επίπεδο concurrency όπου το aggregate TPS κερδίζει λιγότερο από min_gain."""
+    for prev, cur in zip(levels, levels[1:]):
+        if prev["agg_tps"] > 0 and (cur["agg_tps"] - prev["agg_tps"]) / prev["agg_tps"] < min_gain:
+            return prev["concurrency"]
+    return None
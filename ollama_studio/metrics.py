@@ -0,0 +1,283 @@
+# Ollama Diamond Studio v12.5
+# Copyright (c) 2026 Marinos
+# Licensed under the MIT License (see LICENSE file for details)
+
+"""Ενσωματωμένο endpoint μετρικών σε μορφή Prometheus / OpenMetrics.
+
+Ο MetricsExporter δεν κάνει κανένα αίτημα όταν γίνεται scrape: διαβάζει το
+τελευταίο δείγμα κάθε GPU από τον ring buffer του GpuSampler, το τελευταίο
+/api/ps που έφερε το probe του LatencyWatchdog (μέσω tap) και τα histograms
+TPS / TTFT ανά μοντέλο που γεμίζουν τα records των benchmarks (observe()).
+Ο MetricsServer σερβίρει το /metrics από δικό του daemon thread.
+"""
+
+import json
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from .thermal import THROTTLE_MASK
+
+MIB = 1024 ** 2
+PREFIX = "ollama_studio"
+DEFAULT_PORT = 9464
+
+# Όρια των histograms (tokens/s και δευτερόλεπτα μέχρι το πρώτο token)
+TPS_BUCKETS = [1, 2, 5, 10, 15, 20, 30, 40, 50, 75, 100, 150, 200, 300]
+TTFT_BUCKETS = [0.05, 0.1, 0.25, 0.5, 1, 2, 5, 10, 30]
+# Records που είναι μετρήσεις ενός generate (όχι συγκεντρωτικά, π.χ. sweep_pareto ή load)
+BENCHMARK_KINDS = {"stress", "tournament", "soak", "compare", "sweep"}
+
+PROMETHEUS_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+OPENMETRICS_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+
+
+def configured_port():
+    """Θύρα από το OLLAMA_STUDIO_METRICS_PORT (το GUI ανοίγει τότε το endpoint στην εκκίνηση) ή None."""
+    value = os.environ.get("OLLAMA_STUDIO_METRICS_PORT")
+    try:
+        return int(value) if value else None
+    except ValueError:
+        return None
+
+
+def _value(v):
+    if v == float("inf"):
+        return "+Inf"
+    if isinstance(v, bool):
+        return "1" if v else "0"
+    if isinstance(v, int) or float(v).is_integer():
+        return str(int(v))
+    return repr(float(v))
+
+
+def _labels(labels):
+    if not labels:
+        return ""
+    escaped = (str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for v in labels.values())
+    return "{" + ",".join(f'{k}="{v}"' for k, v in zip(labels, escaped)) + "}"
+
+
+class Histogram:
+    """Αθροιστικό histogram με σταθερά όρια (ένα ανά σύνολο labels)."""
+
+    def __init__(self, buckets):
+        self.buckets = list(buckets)
+        self.counts = [0] * len(self.buckets)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        for i, le in enumerate(self.buckets):
+            if value <= le:
+                self.counts[i] += 1
+        self.sum += value
+        self.count += 1
+
+
+class _Family:
+    """Μία οικογένεια μετρικών (HELP/TYPE και δείγματα) για το κείμενο του scrape."""
+
+    def __init__(self, name, kind, help):
+        self.name = f"{PREFIX}_{name}"
+        self.kind = kind
+        self.help = help
+        self.lines = []
+
+    def add(self, value, **labels):
+        if value is not None:
+            self.lines.append(f"{self.name}{_labels(labels)} {_value(value)}")
+        return self
+
+    def histogram(self, hist, **labels):
+        for le, count in zip(hist.buckets + [float("inf")], hist.counts + [hist.count]):
+            self.lines.append(f"{self.name}_bucket{_labels(dict(labels, le=_value(le)))} {count}")
+        self.lines.append(f"{self.name}_sum{_labels(labels)} {_value(hist.sum)}")
+        self.lines.append(f"{self.name}_count{_labels(labels)} {hist.count}")
+        return self
+
+    def text(self):
+        if not self.lines:
+            return ""
+        return f"# HELP {self.name} {self.help}\n# TYPE {self.name} {self.kind}\n" + "\n".join(self.lines) + "\n"
+
+
+class MetricsExporter:
+    """Cache των τελευταίων τιμών (GPU, ps, watchdog, benchmarks) και το κείμενο του scrape.
+
+    - sampler: GpuSampler (διαβάζεται μόνο ο ring buffer του).
+    - watchdog: LatencyWatchdog με tap=exporter.ps_tap (latency / up του API και το /api/ps).
+    """
+
+    def __init__(self, sampler=None, watchdog=None):
+        self.sampler = sampler
+        self.watchdog = watchdog
+        self.lock = threading.Lock()
+        self.ps = None
+        self.ps_ts = None
+        self.tps = {}
+        self.ttft = {}
+        self.last = {}
+
+    def ps_tap(self, body):
+        """Tap για το probe του watchdog: κρατά τα φορτωμένα μοντέλα από ένα σώμα του /api/ps."""
+        try:
+            models = json.loads(body).get("models")
+        except (ValueError, AttributeError):
+            return
+        if models is None:
+            return
+        with self.lock:
+            self.ps = [{"model": m.get("model") or m.get("name"), "size": m.get("size"),
+                        "size_vram": m.get("size_vram")} for m in models]
+            self.ps_ts = time.monotonic()
+
+    def observe(self, rec):
+        """Ενημερώνει τα histograms ανά μοντέλο από ένα επιτυχημένο benchmark record."""
+        if rec.get("kind") not in BENCHMARK_KINDS or rec.get("status") != "ok":
+            return
+        host = rec.get("host_name") or "local"
+        if rec["kind"] == "compare":
+            sides = [(rec["model_a"], rec.get("a_eval_tps"), rec.get("a_ttft")),
+                     (rec["model_b"], rec.get("b_eval_tps"), rec.get("b_ttft"))]
+        else:
+            sides = [(rec.get("model"), rec.get("eval_tps"), rec.get("ttft"))]
+        with self.lock:
+            for model, tps, ttft in sides:
+                if not model or tps is None:
+                    continue
+                key = (model, host)
+                self.tps.setdefault(key, Histogram(TPS_BUCKETS)).observe(tps)
+                if ttft is not None:
+                    self.ttft.setdefault(key, Histogram(TTFT_BUCKETS)).observe(ttft)
+                self.last[key] = {"eval_tps": tps, "ttft": ttft, "num_ctx": rec.get("num_ctx"), "ts": time.time()}
+
+    def observed(self, records):
+        """Περνά τα records όπως είναι, ενημερώνοντας τα histograms (όπως το history.recorded)."""
+        for rec in records:
+            self.observe(rec)
+            yield rec
+
+    def _gpu_families(self):
+        used = _Family("gpu_memory_used_bytes", "gauge", "VRAM σε χρήση (nvidia-smi)")
+        total = _Family("gpu_memory_total_bytes", "gauge", "Συνολική VRAM")
+        temp = _Family("gpu_temperature_celsius", "gauge", "Θερμοκρασία GPU")
+        util = _Family("gpu_utilization_ratio", "gauge", "Χρήση GPU (0-1)")
+        clock = _Family("gpu_sm_clock_hertz", "gauge", "SM clock")
+        power = _Family("gpu_power_watts", "gauge", "Κατανάλωση ισχύος")
+        throttled = _Family("gpu_throttled", "gauge", "1 όταν η GPU ρίχνει clocks για θερμικούς λόγους ή λόγους ρεύματος")
+        age = _Family("gpu_sample_age_seconds", "gauge", "Ηλικία του τελευταίου δείγματος GPU")
+        now = time.monotonic()
+        snapshot = self.sampler.snapshot() if self.sampler else {}
+        for index, s in snapshot.items():
+            labels = {"gpu": str(index), "name": s["name"]}
+            used.add(s["used"] * MIB if s["used"] is not None else None, **labels)
+            total.add(s["total"] * MIB if s["total"] is not None else None, **labels)
+            temp.add(s["temp"], **labels)
+            util.add(s["util"] / 100 if s["util"] is not None else None, **labels)
+            clock.add(s["sm_clock"] * 1e6 if s["sm_clock"] is not None else None, **labels)
+            power.add(s["power"], **labels)
+            throttled.add(bool(s["throttle"] & THROTTLE_MASK) if s["throttle"] is not None else None, **labels)
+            age.add(round(now - s["ts"], 3), **labels)
+        return [used, total, temp, util, clock, power, throttled, age]
+
+    def _api_families(self):
+        up = _Family("api_up", "gauge", "1 όταν το τελευταίο probe του watchdog πέτυχε")
+        p50 = _Family("api_latency_p50_seconds", "gauge", "p50 latency των probes του watchdog")
+        p99 = _Family("api_latency_p99_seconds", "gauge", "p99 latency των probes του watchdog")
+        errors = _Family("api_error_ratio", "gauge", "Κλάσμα αποτυχημένων probes στο παράθυρο του watchdog")
+        if self.watchdog:
+            st = self.watchdog.stats()
+            if st["samples"]:
+                up.add(st["failures"] == 0)
+                p50.add(st["p50_ms"] / 1000 if st["p50_ms"] is not None else None)
+                p99.add(st["p99_ms"] / 1000 if st["p99_ms"] is not None else None)
+                errors.add(st["error_rate"])
+        return [up, p50, p99, errors]
+
+    def _ps_families(self):
+        loaded = _Family("models_loaded", "gauge", "Πλήθος φορτωμένων μοντέλων (ollama ps)")
+        size = _Family("model_size_bytes", "gauge", "Μέγεθος φορτωμένου μοντέλου (ollama ps)")
+        size_vram = _Family("model_size_vram_bytes", "gauge", "Μέρος του μοντέλου στη VRAM (ollama ps)")
+        age = _Family("ps_age_seconds", "gauge", "Ηλικία του τελευταίου ollama ps")
+        with self.lock:
+            ps, ps_ts = self.ps, self.ps_ts
+        if ps is not None:
+            loaded.add(len(ps))
+            for m in ps:
+                size.add(m["size"], model=m["model"])
+                size_vram.add(m["size_vram"], model=m["model"])
+            age.add(round(time.monotonic() - ps_ts, 3))
+        return [loaded, size, size_vram, age]
+
+    def _benchmark_families(self):
+        tps = _Family("benchmark_eval_tokens_per_second", "histogram", "Eval TPS ανά generate των benchmarks")
+        ttft = _Family("benchmark_ttft_seconds", "histogram", "TTFT ανά generate των benchmarks (streaming)")
+        last_tps = _Family("benchmark_last_eval_tokens_per_second", "gauge", "Eval TPS της τελευταίας μέτρησης")
+        last_ttft = _Family("benchmark_last_ttft_seconds", "gauge", "TTFT της τελευταίας μέτρησης")
+        last_ctx = _Family("benchmark_last_num_ctx", "gauge", "num_ctx της τελευταίας μέτρησης")
+        last_ts = _Family("benchmark_last_timestamp_seconds", "gauge", "Χρόνος (Unix) της τελευταίας μέτρησης")
+        with self.lock:
+            for (model, host), hist in sorted(self.tps.items()):
+                tps.histogram(hist, model=model, host=host)
+            for (model, host), hist in sorted(self.ttft.items()):
+                ttft.histogram(hist, model=model, host=host)
+            for (model, host), last in sorted(self.last.items()):
+                last_tps.add(last["eval_tps"], model=model, host=host)
+                last_ttft.add(last["ttft"], model=model, host=host)
+                last_ctx.add(last["num_ctx"], model=model, host=host)
+                last_ts.add(round(last["ts"], 3), model=model, host=host)
+        return [tps, ttft, last_tps, last_ttft, last_ctx, last_ts]
+
+    def render(self, openmetrics=False):
+        """Το κείμενο ενός scrape (Prometheus text 0.0.4 ή OpenMetrics 1.0)."""
+        families = self._gpu_families() + self._api_families() + self._ps_families() + self._benchmark_families()
+        text = "".join(f.text() for f in families)
+        return text + "# EOF\n" if openmetrics else text
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?")[0] not in ("/", "/metrics"):
+            self.send_error(404)
+            return
+        openmetrics = "application/openmetrics-text" in self.headers.get("Accept", "")
+        try:
+            body = self.server.exporter.render(openmetrics).encode("utf-8")
+        except Exception as e:
+            self.send_error(500, str(e))
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", OPENMETRICS_TYPE if openmetrics else PROMETHEUS_TYPE)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class MetricsServer(ThreadingHTTPServer):
+    """HTTP server του /metrics σε daemon thread (port 0 = ελεύθερη θύρα)."""
+
+    daemon_threads = True
+
+    def __init__(self, exporter, port=DEFAULT_PORT, bind="127.0.0.1"):
+        super().__init__((bind, port), _Handler)
+        self.exporter = exporter
+        self.thread = None
+
+    @property
+    def url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/metrics"
+
+    def start(self):
+        self.thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
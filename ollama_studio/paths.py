@@ -0,0 +1,28 @@
+# Ollama Diamond Studio v12.5
+# Copyright (c) 2026 Marinos
+# Licensed under the MIT License (see LICENSE file for details)
+
+"""Τοποθεσία των τοπικών δεδομένων της εφαρμογής (ιστορικό, caches) και του blob store του Ollama."""
+
+import os
+
+
+def data_dir():
+    """Φάκελος δεδομένων: OLLAMA_STUDIO_HOME ή ~/.ollama_studio (δημιουργείται αν λείπει)."""
+    path = os.environ.get("OLLAMA_STUDIO_HOME") or os.path.join(os.path.expanduser("~"), ".ollama_studio")
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def data_path(name):
+    return os.path.join(data_dir(), name)
+
+
+def ollama_models_dir():
+    """Φάκελος μοντέλων του τοπικού Ollama: OLLAMA_MODELS ή ~/.ollama/models."""
+    return os.environ.get("OLLAMA_MODELS") or os.path.join(os.path.expanduser("~"), ".ollama", "models")
+
+
+def blob_path(digest):
+    """Διαδρομή ενός blob ("sha256:..." ή "sha256-...") στο τοπικό blob store."""
+    return os.path.join(ollama_models_dir(), "blobs", digest.replace(":", "-"))
@@ -0,0 +1,155 @@
+# Ollama Diamond Studio v12.5
+# Copyright (c) 2026 Marinos
+# Licensed under the MIT License (see LICENSE file for details)
+
+"""Ουρά λήψεων με παράλληλα pulls και πρόοδο ανά layer.
+
+Κάθε pull στέλνει events για ένα layer (digest) τη φορά, οπότε ένα ποσοστό
+"ανά event" πηγαίνει μπρος-πίσω. Εδώ η πρόοδος κρατιέται ανά digest και
+αθροίζεται σε συνολικά bytes για όλη την ουρά. Ένα layer κοινό σε δύο
+μοντέλα μετράει μία φορά. Layers που υπάρχουν ήδη τοπικά δεν μετρούν στα MB/s
+και στο ETA. Τα records βγαίνουν με όριο συχνότητας (interval).
+"""
+
+import os
+import queue
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+import ollama
+
+from .engine import _noop_log
+from .paths import blob_path
+
+# Παράθυρο (δευτερόλεπτα) για τον υπολογισμό του ρυθμού λήψης
+RATE_WINDOW = 5.0
+
+
+def _local_blob_size(digest):
+    try:
+        return os.path.getsize(blob_path(digest))
+    except OSError:
+        return None
+
+
+class PullProgress:
+    """Πρόοδος ανά digest και συνολικά bytes / ρυθμός / ETA για όλη την ουρά."""
+
+    def __init__(self, window=RATE_WINDOW):
+        self.layers = {}        # digest -> {"total", "completed", "skipped", "models"}
+        self.window = window
+        self.samples = deque()  # (t, bytes_done) για τον ρυθμό
+
+    def update(self, model, digest, total, completed):
+        layer = self.layers.get(digest)
+        if layer is None:
+            # Ήδη τοπικά (ή ήδη πλήρες στο πρώτο event): δεν κατεβαίνει, δεν μετρά στον ρυθμό
+            skipped = bool(total) and ((completed or 0) >= total or _local_blob_size(digest) == total)
+            layer = self.layers[digest] = {"total": total, "completed": 0, "skipped": skipped, "models": set()}
+        layer["models"].add(model)
+        if total:
+            layer["total"] = total
+        if completed is not None:
+            layer["completed"] = max(layer["completed"], completed)
+
+    def _downloading(self, model=None):
+        return [l for l in self.layers.values()
+                if not l["skipped"] and l["total"] and (model is None or model in l["models"])]
+
+    def bytes(self, model=None):
+        """(bytes που κατέβηκαν, συνολικά bytes) για ένα μοντέλο ή για όλη την ουρά."""
+        layers = self._downloading(model)
+        return sum(l["completed"] for l in layers), sum(l["total"] for l in layers)
+
+    def skipped(self):
+        return sum(1 for l in self.layers.values() if l["skipped"])
+
+    def rate(self, now=None):
+        """Ρυθμός λήψης (bytes/s) στο τελευταίο παράθυρο."""
+        now = now or time.monotonic()
+        done, _ = self.bytes()
+        self.samples.append((now, done))
+        while len(self.samples) > 2 and now - self.samples[0][0] > self.window:
+            self.samples.popleft()
+        t0, b0 = self.samples[0]
+        return (done - b0) / (now - t0) if now > t0 else 0.0
+
+
+def _pull_worker(name, client, events):
+    try:
+        for progress in client.pull(name, stream=True):
+            events.put((name, progress, None))
+    except Exception as e:
+        events.put((name, None, e))
+        return
+    events.put((name, None, None))
+
+
+def run_pull_queue(names, concurrency=2, client=None, log=None, interval=0.5):
+    """Κατεβάζει τα μοντέλα με έως `concurrency` παράλληλα pulls.
+
+    Παράγει records kind="pull" το πολύ ένα ανά `interval` δευτερόλεπτα, και
+    πάντα όταν αλλάζει το status ή τελειώνει ένα μοντέλο. Το status "success"
+    σημαίνει ότι το μοντέλο εγκαταστάθηκε· "error" ότι απέτυχε (με error).
+    """
+    client = client or ollama
+    log = log or _noop_log
+    names = list(dict.fromkeys(names))
+    progress = PullProgress()
+    events = queue.SimpleQueue()
+    status, finished = {}, {}
+    last_emit = 0.0
+    log(f"📥 Ουρά λήψεων: {len(names)} μοντέλα, έως {concurrency} παράλληλα...")
+
+    def record(model, error=None):
+        done, total = progress.bytes(model)
+        all_done, all_total = progress.bytes()
+        rate = progress.rate()
+        remaining = all_total - all_done
+        return {
+            "kind": "pull", "ts": time.time(), "model": model, "status": status.get(model),
+            "completed": done, "total": total, "pct": done / total * 100 if total else None,
+            "queue_completed": all_done, "queue_total": all_total,
+            "queue_pct": all_done / all_total * 100 if all_total else None,
+            "mbps": rate / 1e6, "eta": remaining / rate if rate > 0 else None,
+            "skipped_layers": progress.skipped(), "models_done": len(finished), "models_total": len(names),
+            "error": error,
+        }
+
+    with ThreadPoolExecutor(max_workers=max(1, concurrency), thread_name_prefix="pull") as pool:
+        for name in names:
+            pool.submit(_pull_worker, name, client, events)
+        while len(finished) < len(names):
+            name, event, error = events.get()
+            if event is None:
+                # Τέλος ενός pull (επιτυχία ή σφάλμα): πάντα ένα record
+                finished[name] = error is None
+                if error is None:
+                    status[name] = "success"
+                    log(f"✅ Το μοντέλο {name} εγκαταστάθηκε!", "success")
+                else:
+                    status[name] = "error"
+                    log(f"❌ Σφάλμα λήψης {name}: {error}", "error")
+                last_emit = time.monotonic()
+                yield record(name, None if error is None else str(error))
+                continue
+            digest = event.get("digest")
+            if digest:
+                progress.update(name, digest, event.get("total"), event.get("completed"))
+            new_status = event.get("status")
+            if new_status == "success":
+                continue  # το τελικό record βγαίνει όταν κλείσει το stream
+            # Τα "pulling <digest>" αλλάζουν ανά layer· τα υπόλοιπα (manifest, verifying...) καταγράφονται
+            changed = new_status != status.get(name)
+            status[name] = new_status
+            if changed and not digest and new_status:
+                log(f"   ↳ {name}: {new_status}")
+            now = time.monotonic()
+            if changed or now - last_emit >= interval:
+                last_emit = now
+                yield record(name)
+
+    ok = sum(finished.values())
+    log(f"🏁 Λήψεις: {ok}/{len(names)} επιτυχείς, {progress.skipped()} layers υπήρχαν ήδη τοπικά.",
+        "success" if ok == len(names) else "error")
@@ -0,0 +1,415 @@
+# Ollama Diamond Studio v12.5
+# Copyright (c) 2026 Marinos
+# Licensed under the MIT License (see LICENSE file for details)
+
+"""Record/replay των κλήσεων προς τον Ollama server και του nvidia-smi.
+
+Η καταγραφή γίνεται στο επίπεδο HTTP, άρα καλύπτει κάθε κλήση της εφαρμογής
+(generate, chat, embed, ps, list, pull, version) χωρίς αλλαγές στον engine:
+είτε με ένα httpx transport μέσα στη διεργασία (RecordingTransport), είτε με
+έναν τοπικό proxy (RecordingProxy) στον οποίο δείχνει το OLLAMA_HOST. Κάθε
+απάντηση αποθηκεύεται με τα streamed chunks της και τον χρόνο άφιξης του
+καθενός, μαζί με τις γραμμές του nvidia-smi, σε ένα JSONL trace (συμπιεσμένο
+με gzip όταν το αρχείο τελειώνει σε .gz).
+
+Η αναπαραγωγή γίνεται είτε μέσα στη διεργασία (replay_client: ένα κανονικό
+ollama.Client με ReplayTransport) είτε με έναν τοπικό fake server
+(ReplayServer), με τον καταγεγραμμένο ρυθμό ή επιταχυμένα (speed). Έτσι όλη η
+αλυσίδα benchmark -> στατιστικά -> ιστορικό τρέχει σε μηχάνημα χωρίς GPU.
+"""
+
+import gzip
+import json
+import sys
+import threading
+import time
+from collections import defaultdict, deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import httpx
+
+from . import __version__
+from .server import resolve_host
+
+TRACE_VERSION = 1
+
+
+def _open(path, mode):
+    if path.endswith(".gz"):
+        return gzip.open(path, mode + "t", encoding="utf-8")
+    return open(path, mode, encoding="utf-8")
+
+
+def _body(content):
+    """Σώμα αιτήματος ως JSON (ή κείμενο/None), για αποθήκευση και αντιστοίχιση."""
+    if not content:
+        return None
+    text = content.decode("utf-8", errors="replace")
+    try:
+        return json.loads(text)
+    except ValueError:
+        return text
+
+
+def _key(method, path, body):
+    return method, path, json.dumps(body, sort_keys=True, ensure_ascii=False)
+
+
+def _loose_key(method, path, body):
+    """Κλειδί χωρίς το prompt/options: ίδιο endpoint, μοντέλο και μορφή απάντησης (stream ή όχι)."""
+    body = body if isinstance(body, dict) else {}
+    return method, path, body.get("model"), body.get("stream", True)
+
+
+class TraceWriter:
+    """Γράφει ένα trace: μία επικεφαλίδα και ένα record ανά HTTP exchange ή γραμμή GPU."""
+
+    def __init__(self, path, host=None):
+        self.path = path
+        self.host = resolve_host(host)
+        self.lock = threading.Lock()
+        self.t0 = time.monotonic()
+        self.fh = _open(path, "w")
+        self._write({"kind": "trace", "version": TRACE_VERSION, "created": time.time(),
+                     "host": self.host, "ollama_studio": __version__})
+
+    def _write(self, rec):
+        with self.lock:
+            if self.fh:
+                self.fh.write(json.dumps(rec, ensure_ascii=False, separators=(",", ":")) + "\n")
+
+    def offset(self):
+        return round(time.monotonic() - self.t0, 4)
+
+    def exchange(self, t, method, path, body, status, content_type, chunks):
+        self._write({"kind": "http", "t": t, "method": method, "path": path, "body": body,
+                     "status": status, "type": content_type, "chunks": chunks})
+
+    def gpu(self, line):
+        """Μία γραμμή του nvidia-smi (ως tap του GpuSampler)."""
+        self._write({"kind": "gpu", "t": self.offset(), "line": line.rstrip("\n")})
+
+    def close(self):
+        with self.lock:
+            fh, self.fh = self.fh, None
+        if fh:
+            fh.close()
+
+
+class _RecordingStream(httpx.SyncByteStream):
+    """Περνά τα bytes της απάντησης αυτούσια και κρατά ανά γραμμή (NDJSON chunk) τον χρόνο άφιξης."""
+
+    def __init__(self, stream, on_close, started):
+        self.stream = stream
+        self.on_close = on_close
+        self.last = started
+        self.buffer = b""
+        self.chunks = []
+
+    def _mark(self, data):
+        now = time.monotonic()
+        self.chunks.append([round(now - self.last, 4), data.decode("utf-8", errors="replace")])
+        self.last = now
+
+    def __iter__(self):
+        for data in self.stream:
+            self.buffer += data
+            while b"\n" in self.buffer:
+                line, self.buffer = self.buffer.split(b"\n", 1)
+                self._mark(line + b"\n")
+            yield data
+
+    def close(self):
+        if self.buffer:
+            self._mark(self.buffer)
+            self.buffer = b""
+        self.stream.close()
+        self.on_close(self.chunks)
+
+
+class RecordingTransport(httpx.BaseTransport):
+    """httpx transport που προωθεί στον πραγματικό server και γράφει κάθε exchange στο trace."""
+
+    def __init__(self, writer, inner=None):
+        self.writer = writer
+        self.inner = inner or httpx.HTTPTransport()
+
+    def handle_request(self, request):
+        t = self.writer.offset()
+        started = time.monotonic()
+        body = _body(request.read())
+        # Χωρίς συμπίεση, ώστε τα chunks να αποθηκεύονται ως κείμενο
+        request.headers["Accept-Encoding"] = "identity"
+        response = self.inner.handle_request(request)
+        content_type = response.headers.get("content-type")
+
+        def done(chunks):
+            self.writer.exchange(t, request.method, request.url.raw_path.decode("ascii"), body,
+                                 response.status_code, content_type, chunks)
+        return httpx.Response(response.status_code, headers=response.headers,
+                              stream=_RecordingStream(response.stream, done, started),
+                              extensions=response.extensions)
+
+    def close(self):
+        self.inner.close()
+
+
+def recording_client(writer, **kwargs):
+    """ollama.Client προς τον server του trace που καταγράφει κάθε κλήση."""
+    # Import εδώ: το CLI ορίζει το OLLAMA_HOST μετά την εισαγωγή αυτού του module
+    import ollama
+    return ollama.Client(host=writer.host, transport=RecordingTransport(writer), **kwargs)
+
+
+class Trace:
+    """Ένα φορτωμένο trace: επικεφαλίδα, HTTP exchanges και γραμμές GPU."""
+
+    def __init__(self, header, exchanges, gpu):
+        self.header = header
+        self.exchanges = exchanges
+        self.gpu = gpu
+
+    @classmethod
+    def load(cls, path):
+        header, exchanges, gpu = {}, [], []
+        with _open(path, "r") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                rec = json.loads(line)
+                if rec.get("kind") == "trace":
+                    header = rec
+                elif rec.get("kind") == "http":
+                    exchanges.append(rec)
+                elif rec.get("kind") == "gpu":
+                    gpu.append(rec)
+        if header.get("version", TRACE_VERSION) > TRACE_VERSION:
+            raise ValueError(f"Trace έκδοσης {header['version']}: υποστηρίζεται έως {TRACE_VERSION}")
+        # Τα exchanges γράφονται όταν ολοκληρωθούν· για την αναπαραγωγή μετρά η σειρά έναρξης
+        exchanges.sort(key=lambda e: e["t"])
+        return cls(header, exchanges, gpu)
+
+    def summary(self):
+        """Ένα record ανά (method, path): πλήθος, chunks και συνολικός χρόνος απάντησης."""
+        groups = defaultdict(list)
+        for e in self.exchanges:
+            groups[(e["method"], e["path"])].append(e)
+        return [{
+            "kind": "trace_summary", "method": method, "path": path, "count": len(items),
+            "chunks": sum(len(e["chunks"]) for e in items),
+            "seconds": round(sum(dt for e in items for dt, _ in e["chunks"]), 3),
+            "errors": sum(1 for e in items if e["status"] >= 400),
+        } for (method, path), items in sorted(groups.items())] + [{
+            "kind": "trace_summary", "method": None, "path": "nvidia-smi", "count": len(self.gpu), "chunks": None,
+            "seconds": round(self.gpu[-1]["t"] - self.gpu[0]["t"], 3) if self.gpu else None, "errors": None,
+        }]
+
+
+class Replayer:
+    """Αντιστοιχίζει αιτήματα σε καταγεγραμμένες απαντήσεις.
+
+    Πρώτα ακριβές ταίριασμα (method, path, σώμα) με τη σειρά καταγραφής· η
+    τελευταία απάντηση ενός κλειδιού επαναλαμβάνεται (π.χ. για πολλά ps). Αν
+    δεν υπάρχει ακριβές ταίριασμα και strict=False, χρησιμοποιείται κυκλικά
+    μια απάντηση στο ίδιο endpoint για το ίδιο μοντέλο και με την ίδια μορφή
+    (stream ή όχι). speed: 1 = καταγεγραμμένος ρυθμός,
+    10 = δεκαπλάσια ταχύτητα, 0 = χωρίς καθυστερήσεις.
+    """
+
+    def __init__(self, trace, speed=1.0, strict=False, sleep=time.sleep):
+        self.trace = trace
+        self.speed = speed
+        self.strict = strict
+        self.sleep = sleep
+        self.lock = threading.Lock()
+        self.by_key = defaultdict(deque)
+        self.by_loose = defaultdict(list)
+        self.cursor = defaultdict(int)
+        self.misses = 0
+        for e in trace.exchanges:
+            self.by_key[_key(e["method"], e["path"], e["body"])].append(e)
+            self.by_loose[_loose_key(e["method"], e["path"], e["body"])].append(e)
+
+    def match(self, method, path, body):
+        with self.lock:
+            queue_ = self.by_key.get(_key(method, path, body))
+            if queue_:
+                return queue_.popleft() if len(queue_) > 1 else queue_[0]
+            loose = _loose_key(method, path, body)
+            candidates = self.by_loose.get(loose)
+            if self.strict or not candidates:
+                self.misses += 1
+                return None
+            i = self.cursor[loose]
+            self.cursor[loose] = i + 1
+            return candidates[i % len(candidates)]
+
+    def chunks(self, exchange):
+        """Τα bytes της απάντησης με τις καταγεγραμμένες καθυστερήσεις (κλιμακωμένες με το speed)."""
+        for dt, text in exchange["chunks"]:
+            if self.speed and dt > 0:
+                self.sleep(dt / self.speed)
+            yield text.encode("utf-8")
+
+    def respond(self, method, path, body):
+        """(status, content type, iterator από bytes) για ένα αίτημα."""
+        exchange = self.match(method, path, body)
+        if exchange is None:
+            error = json.dumps({"error": f"replay: καμία καταγεγραμμένη απάντηση για {method} {path}"})
+            return 404, "application/json; charset=utf-8", iter([error.encode("utf-8")])
+        return exchange["status"], exchange["type"] or "application/json", self.chunks(exchange)
+
+
+class _ReplayStream(httpx.SyncByteStream):
+    def __init__(self, chunks):
+        self.chunks = chunks
+
+    def __iter__(self):
+        yield from self.chunks
+
+
+class ReplayTransport(httpx.BaseTransport):
+    """httpx transport που απαντά από ένα trace, χωρίς δίκτυο."""
+
+    def __init__(self, replayer):
+        self.replayer = replayer
+
+    def handle_request(self, request):
+        status, content_type, chunks = self.replayer.respond(
+            request.method, request.url.raw_path.decode("ascii"), _body(request.read()))
+        return httpx.Response(status, headers={"content-type": content_type}, stream=_ReplayStream(chunks))
+
+
+def replay_client(trace, speed=1.0, strict=False, **kwargs):
+    """ollama.Client μέσα στη διεργασία που αναπαράγει ένα trace (path ή Trace)."""
+    import ollama
+    trace = Trace.load(trace) if isinstance(trace, str) else trace
+    host = trace.header.get("host") or resolve_host()
+    return ollama.Client(host=host, transport=ReplayTransport(Replayer(trace, speed, strict)), **kwargs)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """Κοινός handler του proxy και του replay server: η απάντηση έρχεται από το server.respond()."""
+
+    protocol_version = "HTTP/1.1"
+    # Μικρά chunks: χωρίς Nagle, αλλιώς το delayed ACK προσθέτει ~40 ms στο TTFT
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        pass
+
+    def _handle(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length) if length else b""
+        status, content_type, chunks = self.server.respond(self.command, self.path, body, self.headers)
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        try:
+            for data in chunks:
+                if data:
+                    self.wfile.write(f"{len(data):x}\r\n".encode("ascii") + data + b"\r\n")
+                    self.wfile.flush()
+            self.wfile.write(b"0\r\n\r\n")
+            self.wfile.flush()
+        finally:
+            close = getattr(chunks, "close", None)
+            if close:
+                close()
+
+    do_GET = do_POST = do_DELETE = do_PUT = _handle
+
+    def do_HEAD(self):
+        self.send_response(200)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+
+class _TraceServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, port):
+        super().__init__(("127.0.0.1", port), _Handler)
+        self.thread = None
+
+    @property
+    def host(self):
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+    def start(self):
+        self.thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+
+class ReplayServer(_TraceServer):
+    """Τοπικός fake Ollama server που αναπαράγει ένα trace (port 0 = ελεύθερη θύρα)."""
+
+    def __init__(self, replayer, port=0):
+        super().__init__(port)
+        self.replayer = replayer
+
+    def respond(self, method, path, body, headers):
+        return self.replayer.respond(method, path, _body(body))
+
+
+class RecordingProxy(_TraceServer):
+    """Τοπικός proxy προς τον πραγματικό server που γράφει κάθε exchange στο trace."""
+
+    def __init__(self, writer, upstream=None, port=0):
+        super().__init__(port)
+        self.client = httpx.Client(base_url=resolve_host(upstream or writer.host), timeout=None,
+                                   transport=RecordingTransport(writer))
+
+    def respond(self, method, path, body, headers):
+        request = self.client.build_request(
+            method, path, content=body or None,
+            headers={"Content-Type": headers.get("Content-Type") or "application/json"})
+        try:
+            response = self.client.send(request, stream=True)
+        except httpx.HTTPError as e:
+            error = json.dumps({"error": f"proxy: {e}"}).encode("utf-8")
+            return 502, "application/json; charset=utf-8", iter([error])
+
+        def chunks():
+            try:
+                yield from response.iter_raw()
+            finally:
+                response.close()
+        return response.status_code, response.headers.get("content-type") or "application/json", chunks()
+
+    def stop(self):
+        super().stop()
+        self.client.close()
+
+
+def replay_gpu(trace, speed=1.0, out=None, sleep=time.sleep):
+    """Τυπώνει τις γραμμές nvidia-smi ενός trace με τον καταγεγραμμένο ρυθμό.
+
+    Χρησιμοποιείται ως εντολή του GpuSampler (OLLAMA_STUDIO_GPU_CMD). Μετά το
+    τέλος του trace επαναλαμβάνει το τελευταίο δείγμα κάθε GPU, ώστε ένα run
+    λίγο μεγαλύτερο από την καταγραφή να έχει ακόμα telemetry.
+    """
+    out = out or sys.stdout
+    lines = trace.gpu
+    if not lines:
+        return
+    last_t, last = lines[0]["t"], {}
+    for rec in lines:
+        if speed and rec["t"] > last_t:
+            sleep((rec["t"] - last_t) / speed)
+        last_t = rec["t"]
+        last[rec["line"].split(",", 1)[0].strip()] = rec["line"]
+        out.write(rec["line"] + "\n")
+        out.flush()
+    interval = (lines[-1]["t"] - lines[0]["t"]) / max(1, len(lines) - 1) or 0.25
+    while True:
+        sleep(interval / speed if speed else interval)
+        for line in last.values():
+            out.write(line + "\n")
+        out.flush()
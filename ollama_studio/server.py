@@ -0,0 +1,55 @@
+# Ollama Diamond Studio v12.5
+# Copyright (c) 2026 Marinos
+# Licensed under the MIT License (see LICENSE file for details)
+
+"""Πληροφορίες για τον Ollama server: host, έκδοση και digests μοντέλων."""
+
+import json
+import os
+import urllib.request
+from urllib.parse import urlparse
+
+DEFAULT_PORT = 11434
+
+
+def resolve_host(host=None):
+    """Κανονικοποιεί ένα host (ή το OLLAMA_HOST) σε URL της μορφής http://host:port."""
+    host = host or os.environ.get("OLLAMA_HOST") or f"127.0.0.1:{DEFAULT_PORT}"
+    if "://" not in host:
+        host = "http://" + host
+    parsed = urlparse(host)
+    hostname = parsed.hostname or "127.0.0.1"
+    if hostname == "0.0.0.0":
+        hostname = "127.0.0.1"
+    return f"{parsed.scheme}://{hostname}:{parsed.port or DEFAULT_PORT}"
+
+
+def server_version(host=None, timeout=2):
+    """Έκδοση του Ollama server από το /api/version (None αν δεν αποκρίνεται)."""
+    try:
+        with urllib.request.urlopen(f"{resolve_host(host)}/api/version", timeout=timeout) as resp:
+            return json.loads(resp.read().decode("utf-8")).get("version")
+    except Exception:
+        return None
+
+
+def model_digests(client=None):
+    """Αντιστοίχιση όνομα μοντέλου -> digest από το ollama.list()."""
+    if client is None:
+        # Import εδώ: το module-level client του ollama διαβάζει το OLLAMA_HOST όταν εισάγεται,
+        # και το CLI (--record / --replay) το ορίζει αφού φορτώσει αυτό το module
+        import ollama as client
+    return {m.model: m.digest for m in client.list().models}
+
+
+def run_context(models, client=None, host=None):
+    """Μεταδεδομένα ενός run (host, έκδοση Ollama, digests) για το ιστορικό."""
+    try:
+        digests = model_digests(client)
+    except Exception:
+        digests = {}
+    return {
+        "host": resolve_host(host),
+        "ollama_version": server_version(host),
+        "digests": {m: digests.get(m) for m in models},
+    }
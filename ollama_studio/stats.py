@@ -0,0 +1,159 @@
+# Ollama Diamond Studio v12.5
+# Copyright (c) 2026 Marinos
+# Licensed under the MIT License (see LICENSE file for details)
+
+"""Στατιστικά βοηθήματα για τις μετρήσεις των benchmarks."""
+
+import math
+
+
+def percentile(values, pct):
+    """Εκατοστημόριο pct (0-100) με γραμμική παρεμβολή."""
+    if not values:
+        return 0.0
+    data = sorted(values)
+    k = (len(data) - 1) * (pct / 100.0)
+    lo = int(k)
+    hi = min(lo + 1, len(data) - 1)
+    return data[lo] + (data[hi] - data[lo]) * (k - lo)
+
+
+def eval_tps(res):
+    """Ταχύτητα όπως την αναφέρει ο server (eval_count / eval_duration)."""
+    eval_duration = res.get('eval_duration') or 0
+    eval_count = res.get('eval_count') or 0
+    return eval_count / (eval_duration / 1e9) if eval_duration > 0 else 0
+
+
+def prefill_tps(res):
+    """Ταχύτητα επεξεργασίας του prompt (prompt_eval_count / prompt_eval_duration)."""
+    duration = res.get('prompt_eval_duration') or 0
+    count = res.get('prompt_eval_count') or 0
+    return count / (duration / 1e9) if duration > 0 else 0
+
+
+def mean(values):
+    return sum(values) / len(values) if values else 0.0
+
+
+def stdev(values):
+    """Δειγματική τυπική απόκλιση (n - 1)."""
+    n = len(values)
+    if n < 2:
+        return 0.0
+    m = mean(values)
+    return math.sqrt(sum((v - m) ** 2 for v in values) / (n - 1))
+
+
+def _betacf(a, b, x):
+    # Continued fraction για την regularized incomplete beta (Lentz)
+    tiny = 1e-30
+    qab, qap, qam = a + b, a + 1.0, a - 1.0
+    c, d = 1.0, 1.0 - qab * x / qap
+    d = 1.0 / (d if abs(d) > tiny else tiny)
+    h = d
+    for m in range(1, 201):
+        m2 = 2 * m
+        aa = m * (b - m) * x / ((qam + m2) * (a + m2))
+        d = 1.0 + aa * d
+        d = 1.0 / (d if abs(d) > tiny else tiny)
+        c = 1.0 + aa / c
+        c = c if abs(c) > tiny else tiny
+        h *= d * c
+        aa = -(a + m) * (qab + m) * x / ((a + m2) * (qap + m2))
+        d = 1.0 + aa * d
+        d = 1.0 / (d if abs(d) > tiny else tiny)
+        c = 1.0 + aa / c
+        c = c if abs(c) > tiny else tiny
+        delta = d * c
+        h *= delta
+        if abs(delta - 1.0) < 3e-12:
+            break
+    return h
+
+
+def _betai(a, b, x):
+    if x <= 0.0:
+        return 0.0
+    if x >= 1.0:
+        return 1.0
+    lbeta = math.lgamma(a + b) - math.lgamma(a) - math.lgamma(b)
+    front = math.exp(lbeta + a * math.log(x) + b * math.log(1.0 - x))
+    if x < (a + 1.0) / (a + b + 2.0):
+        return front * _betacf(a, b, x) / a
+    return 1.0 - front * _betacf(b, a, 1.0 - x) / b
+
+
+def student_t_cdf(t, df):
+    """Αθροιστική κατανομή Student t (χωρίς scipy)."""
+    if df <= 0:
+        return 0.5
+    tail = 0.5 * _betai(df / 2.0, 0.5, df / (df + t * t))
+    return 1.0 - tail if t > 0 else tail
+
+
+def t_critical(df, confidence=0.95):
+    """Κρίσιμη τιμή t για αμφίπλευρο διάστημα εμπιστοσύνης."""
+    target = 1.0 - (1.0 - confidence) / 2.0
+    lo, hi = 0.0, 1000.0
+    for _ in range(100):
+        mid = (lo + hi) / 2.0
+        if student_t_cdf(mid, df) < target:
+            lo = mid
+        else:
+            hi = mid
+    return (lo + hi) / 2.0
+
+
+def mean_ci(values, confidence=0.95):
+    """(μέσος όρος, μισό πλάτος διαστήματος εμπιστοσύνης)· άπειρο πλάτος για n < 2."""
+    n = len(values)
+    if n < 2:
+        return mean(values), math.inf
+    return mean(values), t_critical(n - 1, confidence) * stdev(values) / math.sqrt(n)
+
+
+def welch_t_test(a, b):
+    """Welch t-test για δύο δείγματα· επιστρέφει (t, df, αμφίπλευρο p)."""
+    na, nb = len(a), len(b)
+    if na < 2 or nb < 2:
+        return 0.0, 0.0, 1.0
+    va, vb = stdev(a) ** 2 / na, stdev(b) ** 2 / nb
+    if va + vb == 0:
+        diff = mean(a) - mean(b)
+        return (math.copysign(math.inf, diff), na + nb - 2, 0.0) if diff else (0.0, na + nb - 2, 1.0)
+    t = (mean(a) - mean(b)) / math.sqrt(va + vb)
+    df = (va + vb) ** 2 / (va ** 2 / (na - 1) + vb ** 2 / (nb - 1))
+    return t, df, 2.0 * (1.0 - student_t_cdf(abs(t), df))
+
+
+def shift_p_value(new, baseline):
+    """Μονόπλευρο p ότι οι νέες τιμές είναι χαμηλότερες από το baseline.
+
+    Με μία μόνο νέα τιμή χρησιμοποιείται prediction interval του baseline,
+    αλλιώς Welch t-test.
+    """
+    if len(baseline) < 2 or not new:
+        return 1.0
+    if len(new) == 1:
+        sd = stdev(baseline)
+        if sd == 0:
+            return 0.0 if new[0] < mean(baseline) else 1.0
+        t = (new[0] - mean(baseline)) / (sd * math.sqrt(1 + 1 / len(baseline)))
+        return student_t_cdf(t, len(baseline) - 1)
+    t, df, _ = welch_t_test(new, baseline)
+    if math.isinf(t):
+        return 0.0 if t < 0 else 1.0
+    return student_t_cdf(t, df) if df > 0 else 1.0
+
+
+def holm_adjust(p_values):
+    """Holm-Bonferroni διόρθωση για πολλαπλές συγκρίσεις (ίδια σειρά με την είσοδο)."""
+    m = len(p_values)
+    order = sorted(range(m), key=lambda i: p_values[i])
+    adjusted = [1.0] * m
+    running = 0.0
+    for rank, i in enumerate(order):
+        running = max(running, min(1.0, (m - rank) * p_values[i]))
+        adjusted[i] = running
+    return adjusted
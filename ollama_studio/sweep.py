@@ -0,0 +1,266 @@
+# Ollama Diamond Studio v12.5
+# Copyright (c) 2026 Marinos
+# Licensed under the MIT License (see LICENSE file for details)
+
+"""Sweep των runtime options και πρόταση ρύθμισης από το Pareto front ταχύτητας / μνήμης.
+
+Οι διαστάσεις είναι οι παραλλαγές quantization ενός μοντέλου (ένα tag ανά
+παραλλαγή), τα options ανά αίτημα (num_batch, num_thread, num_gpu) και οι
+ρυθμίσεις του server (flash attention, τύπος KV cache). Οι τελευταίες δεν
+στέλνονται με το αίτημα: για κάθε συνδυασμό τους ο τοπικός server
+επανεκκινείται με OLLAMA_FLASH_ATTENTION / OLLAMA_KV_CACHE_TYPE.
+
+Για κάθε σημείο μετρώνται eval TPS, TTFT και VRAM. Η μνήμη του Pareto
+front είναι το size_vram του μοντέλου από το ollama ps (ή, χωρίς αυτό, η
+αύξηση του nvidia-smi πάνω από τη μέτρηση πριν το load), ώστε άλλα φορτωμένα
+μοντέλα να μη χρεώνονται στο σημείο· η προηγούμενη παραλλαγή αφαιρείται από
+τη VRAM πριν από την επόμενη. Από όλα τα σημεία κρατιέται το Pareto front
+(κανένα άλλο σημείο δεν είναι ταχύτερο και με λιγότερη μνήμη), και για κάθε μοντέλο προτείνεται μια ρύθμιση που εξάγεται
+ως μπλοκ PARAMETER ενός Modelfile.
+"""
+
+import itertools
+import random
+import time
+
+import ollama
+
+from .autotune import gpu_residency
+from .engine import STRESS_PROMPT, _noop_log, timed_generate
+from .stats import mean, prefill_tps
+from .telemetry import flatten_gpu_summary
+from .trials import unload_model
+from .watchdog import restart_server
+
+MB = 1024 ** 2
+
+# Options ανά αίτημα και ρυθμίσεις server (μεταβλητή περιβάλλοντος του ollama serve)
+REQUEST_OPTIONS = ["num_batch", "num_thread", "num_gpu"]
+SERVER_ENV = {"flash_attention": "OLLAMA_FLASH_ATTENTION", "kv_cache_type": "OLLAMA_KV_CACHE_TYPE"}
+KV_CACHE_TYPES = ["f16", "q8_0", "q4_0"]
+
+SWEEP_FIELDS = [
+    "kind", "ts", "model", "quantization", "num_ctx", "num_batch", "num_thread", "num_gpu",
+    "flash_attention", "kv_cache_type", "trials", "eval_tps", "prefill_tps", "ttft", "vram_peak",
+    "vram_delta", "size_vram", "memory_mb", "gpu_fraction", "pareto", "recommended", "status", "error"
+]
+
+
+class SweepSpace:
+    """Οι τιμές κάθε διάστασης (None σε μια λίστα = η προεπιλογή του Ollama / του server)."""
+
+    def __init__(self, models, num_batch=None, num_thread=None, num_gpu=None, flash_attention=None,
+                 kv_cache_type=None):
+        self.models = list(models)
+        self.values = {
+            "num_batch": num_batch or [None],
+            "num_thread": num_thread or [None],
+            "num_gpu": num_gpu or [None],
+            "flash_attention": flash_attention or [None],
+            "kv_cache_type": kv_cache_type or [None],
+        }
+
+    def grid(self):
+        """Όλοι οι έγκυροι συνδυασμοί ως dicts (model + διαστάσεις)."""
+        keys = list(self.values)
+        points = []
+        for model, combo in itertools.product(self.models, itertools.product(*self.values.values())):
+            point = dict(zip(keys, combo), model=model)
+            # Ο κβαντισμένος KV cache του Ollama απαιτεί flash attention
+            if point["kv_cache_type"] not in (None, "f16") and point["flash_attention"] is False:
+                continue
+            points.append(point)
+        return points
+
+    def sample(self, n, seed=0):
+        """Τυχαίο δείγμα n σημείων από το grid (random search)."""
+        grid = self.grid()
+        return random.Random(seed).sample(grid, min(n, len(grid)))
+
+
+def server_env(point):
+    """Μεταβλητές περιβάλλοντος του server για ένα σημείο ({} = ο server όπως είναι)."""
+    env = {}
+    if point["flash_attention"] is not None:
+        env[SERVER_ENV["flash_attention"]] = "1" if point["flash_attention"] else "0"
+    if point["kv_cache_type"] is not None:
+        env[SERVER_ENV["kv_cache_type"]] = point["kv_cache_type"]
+    return env
+
+
+def request_options(point, num_ctx, num_predict):
+    options = {"num_ctx": num_ctx, "num_predict": num_predict}
+    options.update({k: point[k] for k in REQUEST_OPTIONS if point[k] is not None})
+    return options
+
+
+def _order(points):
+    """Ομαδοποίηση ανά ρύθμιση server (λιγότερες επανεκκινήσεις) και μοντέλο (λιγότερα loads)."""
+    def key(p):
+        env = server_env(p)
+        return (bool(env), sorted(env.items()), p["model"])
+    return sorted(points, key=key)
+
+
+def pareto_front(records, speed="eval_tps", memory="memory_mb"):
+    """Τα records που δεν κυριαρχούνται: κανένα άλλο δεν έχει ≥ ταχύτητα και ≤ μνήμη (με ένα αυστηρά)."""
+    ok = [r for r in records if r.get("status") == "ok" and r.get(speed) is not None and r.get(memory) is not None]
+    front = []
+    for r in ok:
+        dominated = any(
+            o[speed] >= r[speed] and o[memory] <= r[memory] and (o[speed] > r[speed] or o[memory] < r[memory])
+            for o in ok
+        )
+        if not dominated:
+            front.append(r)
+    return sorted(front, key=lambda r: r[memory])
+
+
+def recommend(records, budget_mb=None, tolerance=0.03, speed="eval_tps", memory="memory_mb"):
+    """Πρόταση για ένα μοντέλο: το σημείο του Pareto front με τη λιγότερη μνήμη μέσα στο
+    `tolerance` (π.χ. 3%) από το ταχύτερο σημείο που χωρά στο `budget_mb`. None αν δεν υπάρχει."""
+    front = [r for r in pareto_front(records, speed, memory) if budget_mb is None or r[memory] <= budget_mb]
+    if not front:
+        return None
+    fastest = max(r[speed] for r in front)
+    return min((r for r in front if r[speed] >= fastest * (1 - tolerance)), key=lambda r: r[memory])
+
+
+def modelfile_block(rec):
+    """Modelfile για μια ρύθμιση: FROM + PARAMETER (και σχόλιο για τις ρυθμίσεις server)."""
+    lines = [f"FROM {rec['model']}"]
+    for key in ["num_ctx"] + REQUEST_OPTIONS:
+        if rec.get(key) is not None:
+            lines.append(f"PARAMETER {key} {rec[key]}")
+    env = server_env(rec)
+    if env:
+        # Δεν είναι παράμετροι του Modelfile: ρυθμίζονται στο περιβάλλον του ollama serve
+        lines.append("# Server: " + " ".join(f"{k}={v}" for k, v in env.items()))
+    speed = f"{rec['eval_tps']:.1f} TPS" if rec.get("eval_tps") is not None else "N/A"
+    memory = f"{rec['memory_mb']:.0f} MB" if rec.get("memory_mb") is not None else "N/A"
+    lines.append(f"# Sweep: {speed}, {memory}")
+    return "\n".join(lines) + "\n"
+
+
+def _record(point, **fields):
+    rec = dict.fromkeys(SWEEP_FIELDS)
+    rec.update({k: v for k, v in point.items() if k in SWEEP_FIELDS}, kind="sweep", ts=time.time())
+    rec.update(fields)
+    return rec
+
+
+def run_sweep(space, points=None, num_ctx=4096, num_predict=128, trials=2, warmup=1, prompt=STRESS_PROMPT,
+              keep_alive="5m", budget_mb=None, tolerance=0.03, sampler=None, client=None, restart=None, log=None):
+    """Μετρά κάθε σημείο (grid ή `points` από random search)· ένα record (kind="sweep") ανά σημείο.
+
+    Στο τέλος παράγει ξανά τα σημεία του Pareto front (kind="sweep_pareto"),
+    με recommended=True στην πρόταση κάθε μοντέλου. Το `restart(env)`
+    επανεκκινεί τον server με τις ρυθμίσεις ενός σημείου και επιστρέφει ένα
+    restart record (προεπιλογή: watchdog.restart_server)· καλείται ξανά με {}
+    στο τέλος. Το περιβάλλον του αρχικού server δεν μπορεί να διαβαστεί, οπότε
+    αν τον είχε ξεκινήσει ο χρήστης (όχι supervisor), στη θέση του μένει ένας
+    `ollama serve` με το περιβάλλον του studio και όχι τα δικά του OLLAMA_*.
+    """
+    log = log or _noop_log
+    client = client or ollama
+    if restart is None:
+        def restart(env):
+            return restart_server(env=env, log=log)
+    points = _order(points if points is not None else space.grid())
+    log(f"⚙️ Options sweep: {len(points)} σημεία, {trials} trials/σημείο, num_ctx={num_ctx}")
+    quantization = {}
+    for model in space.models:
+        try:
+            quantization[model] = getattr(client.show(model).details, "quantization_level", None)
+        except Exception:
+            quantization[model] = None
+
+    records = []
+    current_env, env_error = {}, None
+    loaded = None
+    for i, point in enumerate(points):
+        point = dict(point, num_ctx=num_ctx)
+        env = server_env(point)
+        if env != current_env:
+            log(f"🔄 Server με {' '.join(f'{k}={v}' for k, v in env.items()) or 'τις ρυθμίσεις του studio'}...")
+            res = restart(env)
+            current_env = env
+            loaded = None
+            env_error = None if res and res.get("status") == "ok" and (res.get("spawned") or not env) else (
+                (res or {}).get("error") or "οι ρυθμίσεις server δεν εφαρμόστηκαν (ο server ξεκίνησε από supervisor)")
+        rec = _record(point, quantization=quantization.get(point["model"]), trials=0)
+        if env_error:
+            rec.update(status="error", error=env_error)
+            records.append(rec)
+            yield rec
+            continue
+        options = request_options(point, num_ctx, num_predict)
+        label = ", ".join(f"{k}={v}" for k, v in point.items() if v is not None and k not in ("model", "num_ctx"))
+        log(f"⚙️ [{i + 1}/{len(points)}] {point['model']}" + (f" ({label})" if label else "") + "...")
+        if loaded and loaded != point["model"]:
+            # Η προηγούμενη παραλλαγή θα έμενε στη VRAM (keep_alive) και θα χρεωνόταν στην επόμενη
+            try:
+                unload_model(loaded, client)
+            except Exception as e:
+                log(f"⚠️ Unload {loaded}: {e}", "error")
+        loaded = point["model"]
+        baseline = sampler.latest() if sampler else None
+        measured = []
+        try:
+            t0 = time.monotonic()
+            for w in range(warmup):
+                # Το πρώτο generate με νέα options ξαναφορτώνει το μοντέλο
+                timed_generate(point["model"], prompt, options=options, keep_alive=keep_alive, client=client)
+            for t in range(trials):
+                measured.append(timed_generate(point["model"], f"{prompt} ({t})", options=options,
+                                               keep_alive=keep_alive, client=client))
+            t1 = time.monotonic()
+            residency = gpu_residency(point["model"], client)
+        except Exception as e:
+            log(f"❌ {point['model']}: {e}", "error")
+            rec.update(trials=len(measured), status="error", error=str(e))
+            records.append(rec)
+            yield rec
+            continue
+        size, size_vram = residency or (None, None)
+        gpu = flatten_gpu_summary(sampler.summarize(t0, t1) if sampler else None)
+        before = baseline["used"] if baseline else None
+        rec.update(
+            trials=len(measured),
+            eval_tps=mean([m["eval_tps"] for m in measured]),
+            prefill_tps=mean([prefill_tps(m["final"]) for m in measured]),
+            ttft=mean([m["ttft"] for m in measured]),
+            vram_peak=gpu["vram_peak"],
+            vram_delta=gpu["vram_peak"] - before if gpu["vram_peak"] is not None and before is not None else None,
+            size_vram=size_vram / MB if size_vram is not None else None,
+            gpu_fraction=size_vram / size if size else None,
+            status="ok",
+        )
+        # Μνήμη του Pareto: το size_vram του μοντέλου από το ollama.ps(), αλλιώς η αύξηση στο nvidia-smi
+        rec["memory_mb"] = rec["size_vram"] if rec["size_vram"] is not None else rec["vram_delta"]
+        records.append(rec)
+        yield rec
+
+    if current_env:
+        log("🔄 Επανεκκίνηση του server χωρίς τις ρυθμίσεις του sweep...")
+        res = restart({}) or {}
+        if res.get("spawned"):
+            log("⚠️ Ο server τρέχει πλέον από το studio, με το περιβάλλον του studio: όσες OLLAMA_* "
+                "είχε ο αρχικός server (αν τον ξεκινήσατε με δικές σας) πρέπει να οριστούν ξανά.", "error")
+        elif res.get("status") != "ok":
+            log(f"❌ Ο server δεν επανήλθε: {res.get('error')}", "error")
+
+    front = pareto_front(records)
+    picks = {}
+    for model in space.models:
+        pick = recommend([r for r in records if r["model"] == model], budget_mb, tolerance)
+        if pick:
+            picks[id(pick)] = pick
+            log(f"✅ Πρόταση για {model}: {pick['eval_tps']:.1f} TPS, {pick['memory_mb']:.0f} MB\n"
+                + modelfile_block(pick).rstrip(), "success")
+        else:
+            log(f"⚠️ Καμία επιτυχής ρύθμιση για το {model}" + (f" μέσα σε {budget_mb:.0f} MB" if budget_mb else ""),
+                "error")
+    for rec in front + [p for p in picks.values() if p not in front]:
+        yield dict(rec, kind="sweep_pareto", pareto=rec in front, recommended=id(rec) in picks)
+    log(f"🏁 Options sweep: {len(front)} σημεία στο Pareto front από {len(records)}.")
@@ -0,0 +1,173 @@
+# Ollama Diamond Studio v12.5
+# Copyright (c) 2026 Marinos
+# Licensed under the MIT License (see LICENSE file for details)
+
+"""Συνεχής δειγματοληψία GPU μέσω ενός μακρόβιου nvidia-smi."""
+
+import os
+import shlex
+import subprocess
+import threading
+import time
+from collections import deque
+
+# Σημαία για να μην ανοίγουν παράθυρα κονσόλας στα Windows (0 σε άλλα OS)
+NO_WINDOW = getattr(subprocess, "CREATE_NO_WINDOW", 0)
+
+GPU_QUERY_FIELDS = [
+    "index", "gpu_name", "memory.used", "memory.total",
+    "temperature.gpu", "utilization.gpu", "clocks.sm", "power.draw",
+    "clocks_throttle_reasons.active"
+]
+GPU_SAMPLE_KEYS = ["index", "name", "used", "total", "temp", "util", "sm_clock", "power", "throttle"]
+# Οι πρώτες στήλες είναι υποχρεωτικές· πηγές με λιγότερες (π.χ. παλιά fake scripts) δίνουν None στο throttle
+GPU_REQUIRED_KEYS = 8
+GPU_METRICS = ["used", "temp", "util", "sm_clock", "power"]
+
+
+def nvidia_smi_command(loop_ms=250):
+    """Γραμμή εντολής για ένα μακρόβιο nvidia-smi σε λειτουργία --loop-ms."""
+    return [
+        "nvidia-smi", "--query-gpu=" + ",".join(GPU_QUERY_FIELDS),
+        "--format=csv,noheader,nounits", f"--loop-ms={loop_ms}"
+    ]
+
+
+def parse_gpu_line(line):
+    """Μετατρέπει μία CSV γραμμή του nvidia-smi σε δείγμα (None για [N/A])."""
+    parts = [p.strip() for p in line.strip().split(",")]
+    if not GPU_REQUIRED_KEYS <= len(parts) <= len(GPU_SAMPLE_KEYS):
+        return None
+    sample = dict.fromkeys(GPU_SAMPLE_KEYS)
+    for key, raw in zip(GPU_SAMPLE_KEYS, parts):
+        if key == "name":
+            sample[key] = raw
+            continue
+        try:
+            # Οι λόγοι throttling έρχονται ως hex bitmask (π.χ. 0x0000000000000040)
+            sample[key] = int(raw, 16) if key == "throttle" else float(raw)
+        except ValueError:
+            sample[key] = None
+    sample["index"] = int(sample["index"] or 0)
+    return sample
+
+
+class GpuSampler:
+    """Μακρόβια διεργασία δειγματοληψίας GPU που γεμίζει έναν ring buffer δειγμάτων.
+
+    Η πηγή είναι pluggable: οποιαδήποτε εντολή τυπώνει CSV γραμμές στη μορφή
+    του nvidia-smi (π.χ. ένα fake script σε μηχάνημα χωρίς GPU). Η μεταβλητή
+    περιβάλλοντος OLLAMA_STUDIO_GPU_CMD αντικαθιστά την προεπιλεγμένη εντολή.
+    Το tap (αν δοθεί) λαμβάνει κάθε έγκυρη γραμμή, π.χ. για καταγραφή σε trace.
+    """
+
+    def __init__(self, command=None, capacity=7200, loop_ms=250, tap=None):
+        env_cmd = os.environ.get("OLLAMA_STUDIO_GPU_CMD")
+        self.command = command or (shlex.split(env_cmd) if env_cmd else nvidia_smi_command(loop_ms))
+        self.tap = tap
+        self.samples = deque(maxlen=capacity)
+        self.lock = threading.Lock()
+        self.proc = None
+        self.error = None
+
+    def start(self):
+        """Ξεκινά τη διεργασία και το νήμα ανάγνωσης (αν δεν τρέχουν ήδη)."""
+        if self.running:
+            return True
+        try:
+            self.proc = subprocess.Popen(
+                self.command, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+                encoding="utf-8", bufsize=1, creationflags=NO_WINDOW
+            )
+        except (OSError, ValueError) as e:
+            self.error = e
+            self.proc = None
+            return False
+        threading.Thread(target=self._reader, args=(self.proc,), daemon=True).start()
+        return True
+
+    def stop(self):
+        if self.proc and self.proc.poll() is None:
+            self.proc.terminate()
+            try:
+                self.proc.wait(timeout=2)
+            except subprocess.TimeoutExpired:
+                self.proc.kill()
+        self.proc = None
+
+    @property
+    def running(self):
+        return self.proc is not None and self.proc.poll() is None
+
+    def _reader(self, proc):
+        for line in proc.stdout:
+            sample = parse_gpu_line(line)
+            if sample is None:
+                continue
+            if self.tap:
+                self.tap(line)
+            sample["ts"] = time.monotonic()
+            with self.lock:
+                self.samples.append(sample)
+
+    def latest(self, gpu=0):
+        """Το πιο πρόσφατο δείγμα για τη δοσμένη GPU (ή None)."""
+        with self.lock:
+            for s in reversed(self.samples):
+                if s["index"] == gpu:
+                    return s
+        return None
+
+    def snapshot(self):
+        """Το πιο πρόσφατο δείγμα κάθε GPU: {index: δείγμα} (χωρίς νέα κλήση στο nvidia-smi)."""
+        latest = {}
+        with self.lock:
+            for s in reversed(self.samples):
+                latest.setdefault(s["index"], s)
+        return dict(sorted(latest.items()))
+
+    def window(self, t0, t1, gpu=0):
+        """Δείγματα μέσα στο χρονικό παράθυρο [t0, t1] (time.monotonic)."""
+        with self.lock:
+            inside = [s for s in self.samples if s["index"] == gpu and t0 <= s["ts"] <= t1]
+            if not inside:
+                # Πολύ σύντομο παράθυρο: κρατάμε το τελευταίο δείγμα πριν το t1
+                before = [s for s in self.samples if s["index"] == gpu and s["ts"] <= t1]
+                inside = before[-1:]
+        return inside
+
+    def summarize(self, t0, t1, gpu=0):
+        """Peak / mean / min για κάθε μετρική στο παράθυρο [t0, t1]."""
+        samples = self.window(t0, t1, gpu)
+        if not samples:
+            return None
+        summary = {"samples": len(samples)}
+        for key in GPU_METRICS:
+            values = [s[key] for s in samples if s[key] is not None]
+            if values:
+                summary[key] = {"peak": max(values), "mean": sum(values) / len(values), "min": min(values)}
+            else:
+                summary[key] = None
+        summary["total"] = samples[-1]["total"]
+        return summary
+
+
+# Ονόματα στηλών για τα "επίπεδα" records (JSONL/CSV)
+GPU_FIELD_PREFIX = {"used": "vram", "temp": "temp", "util": "util", "sm_clock": "sm_clock", "power": "power"}
+GPU_STATS = ["peak", "mean", "min"]
+GPU_FIELDS = [f"{GPU_FIELD_PREFIX[k]}_{st}" for k in GPU_METRICS for st in GPU_STATS] + ["vram_total", "gpu_samples"]
+
+
+def flatten_gpu_summary(summary):
+    """Μετατρέπει το summarize() σε επίπεδο dict (None όπου λείπουν δεδομένα)."""
+    flat = dict.fromkeys(GPU_FIELDS)
+    if not summary:
+        return flat
+    for key in GPU_METRICS:
+        stats = summary.get(key)
+        for st in GPU_STATS:
+            flat[f"{GPU_FIELD_PREFIX[key]}_{st}"] = round(stats[st], 1) if stats else None
+    flat["vram_total"] = summary.get("total")
+    flat["gpu_samples"] = summary.get("samples")
+    return flat
+
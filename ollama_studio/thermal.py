@@ -0,0 +1,152 @@
+# Ollama Diamond Studio v12.5
+# Copyright (c) 2026 Marinos
+# Licensed under the MIT License (see LICENSE file for details)
+
+"""Thermal-aware scheduling: αναμονή ψύξης μεταξύ trials και ανίχνευση throttling.
+
+Μια ζεστή κάρτα ρίχνει τα clocks (GPU Boost ή hardware slowdown) και τα TPS
+της δεν συγκρίνονται με αυτά μιας κρύας. Το ThermalGuard περιμένει, πριν από
+κάθε trial, μέχρι η θερμοκρασία να πέσει κάτω από ένα όριο, και σημειώνει σε
+κάθε μέτρηση τη θερμική κατάσταση και την κατάσταση των clocks.
+"""
+
+import time
+
+from .stats import mean
+
+# Bits του clocks_throttle_reasons.active (nvidia-smi / NVML)
+THROTTLE_REASONS = {
+    0x1: "gpu_idle", 0x2: "app_clocks", 0x4: "sw_power_cap", 0x8: "hw_slowdown",
+    0x10: "sync_boost", 0x20: "sw_thermal", 0x40: "hw_thermal", 0x80: "hw_power_brake",
+}
+# Λόγοι που σημαίνουν ότι η μέτρηση δεν είναι συγκρίσιμη (το power cap είναι φυσιολογικό υπό φορτίο)
+THROTTLE_MASK = 0x8 | 0x20 | 0x40 | 0x80
+
+THERMAL_FIELDS = ["temp_start", "cooldown_s", "sm_clock_ratio", "throttle_reasons", "throttled"]
+
+
+def throttle_names(mask):
+    """Ονόματα των ενεργών λόγων throttling ενός bitmask (κενή λίστα για 0/None)."""
+    return [name for bit, name in THROTTLE_REASONS.items() if mask and mask & bit]
+
+
+class ThermalPolicy:
+    """Κανόνες θερμικής διαχείρισης ενός run.
+
+    - cool_below: πριν από κάθε trial αναμονή μέχρι temp < cool_below (None = χωρίς αναμονή).
+    - max_wait: μέγιστη αναμονή ανά trial σε δευτερόλεπτα (μετά συνεχίζει με log).
+    - throttle_temp: θερμοκρασία πάνω από την οποία ένα δείγμα θεωρείται throttled.
+    - clock_drop: throttled αν το μέσο SM clock πέσει κάτω από αυτό το κλάσμα του reference.
+    """
+
+    def __init__(self, cool_below=None, max_wait=300.0, throttle_temp=83.0, clock_drop=0.9, poll=1.0, gpu=0):
+        self.cool_below = cool_below
+        self.max_wait = max_wait
+        self.throttle_temp = throttle_temp
+        self.clock_drop = clock_drop
+        self.poll = poll
+        self.gpu = gpu
+
+
+def thermal_fields(state=None):
+    """Επίπεδα θερμικά πεδία ενός record (None όπου λείπουν δεδομένα)."""
+    fields = dict.fromkeys(THERMAL_FIELDS)
+    if state:
+        fields.update(state)
+    return fields
+
+
+class ThermalGuard:
+    """Θερμική κατάσταση ενός run πάνω σε έναν GpuSampler.
+
+    Το reference clock είναι το υψηλότερο μέσο SM clock που παρατηρήθηκε σε
+    μέτρηση χωρίς throttling (όχι το clocks.max.sm, που το GPU Boost σπάνια
+    πιάνει υπό συνεχές φορτίο).
+    """
+
+    def __init__(self, sampler, policy=None, log=None, sleep=time.sleep):
+        self.sampler = sampler
+        self.policy = policy or ThermalPolicy()
+        # Χωρίς import του engine (που εισάγει αυτό το module): no-op log τοπικά
+        self.log = log or (lambda message, type="info": None)
+        self.sleep = sleep
+        self.reference_clock = None
+
+    def temperature(self):
+        sample = self.sampler.latest(self.policy.gpu)
+        return sample["temp"] if sample else None
+
+    def cool_down(self):
+        """Περιμένει μέχρι temp < cool_below· επιστρέφει (θερμοκρασία έναρξης, δευτερόλεπτα αναμονής)."""
+        temp = self.temperature()
+        limit = self.policy.cool_below
+        deadline = time.monotonic() + 5
+        while limit is not None and temp is None and self.sampler.running and time.monotonic() < deadline:
+            # Ο sampler μόλις ξεκίνησε: αναμονή για το πρώτο δείγμα
+            self.sleep(0.1)
+            temp = self.temperature()
+        if limit is None or temp is None or temp < limit:
+            return temp, 0.0
+        self.log(f"❄️ GPU στους {temp:.0f}°C: αναμονή ψύξης κάτω από {limit:.0f}°C...")
+        t0 = time.monotonic()
+        while temp is not None and temp >= limit:
+            if time.monotonic() - t0 >= self.policy.max_wait:
+                self.log(f"⚠️ Η GPU έμεινε στους {temp:.0f}°C μετά από {self.policy.max_wait:.0f} s· συνέχεια χωρίς ψύξη.",
+                         "error")
+                break
+            self.sleep(self.policy.poll)
+            temp = self.temperature()
+        waited = time.monotonic() - t0
+        if temp is not None and temp < limit:
+            self.log(f"❄️ Ψύξη στους {temp:.0f}°C σε {waited:.0f} s.")
+        return temp, waited
+
+    def tag(self, t0, t1, temp_start=None, waited=0.0):
+        """Θερμικά πεδία για το παράθυρο [t0, t1] μιας μέτρησης."""
+        samples = self.sampler.window(t0, t1, self.policy.gpu)
+        if not samples:
+            return thermal_fields({"temp_start": temp_start, "cooldown_s": waited})
+        mask = 0
+        for s in samples:
+            mask |= s.get("throttle") or 0
+        clocks = [s["sm_clock"] for s in samples if s.get("sm_clock")]
+        temps = [s["temp"] for s in samples if s.get("temp") is not None]
+        clock = mean(clocks) if clocks else None
+        hot = bool(temps) and max(temps) >= self.policy.throttle_temp
+        ratio = clock / self.reference_clock if clock and self.reference_clock else None
+        throttled = bool(mask & THROTTLE_MASK) or hot or (ratio is not None and ratio < self.policy.clock_drop)
+        if clock and not throttled:
+            self.reference_clock = max(self.reference_clock or 0, clock)
+        return thermal_fields({
+            "temp_start": temp_start,
+            "cooldown_s": waited,
+            "sm_clock_ratio": ratio,
+            "throttle_reasons": ",".join(throttle_names(mask)) or None,
+            "throttled": throttled,
+        })
+
+
+def throttle_summary(records):
+    """Πλήθος throttled μετρήσεων και οι λόγοι τους: (throttled, σύνολο, λόγοι)."""
+    tagged = [r for r in records if r.get("status") == "ok" and r.get("throttled") is not None]
+    hot = [r for r in tagged if r["throttled"]]
+    reasons = sorted({n for r in hot for n in (r.get("throttle_reasons") or "").split(",") if n})
+    return len(hot), len(tagged), reasons
+
+
+def sustained_vs_burst(records, metric="eval_tps", burst=3):
+    """Burst (πρώτα `burst` trials) έναντι sustained (τελευταίο μισό) throughput ενός soak run."""
+    values = [r[metric] for r in records if r.get("status") == "ok" and r.get(metric) is not None]
+    if len(values) < burst + 2:
+        return None
+    first, last = mean(values[:burst]), mean(values[len(values) // 2:])
+    hot, total, reasons = throttle_summary(records)
+    return {
+        "metric": metric,
+        "burst": first,
+        "sustained": last,
+        "drop_pct": (first - last) / first * 100 if first else None,
+        "throttled": hot,
+        "samples": total,
+        "reasons": reasons,
+    }
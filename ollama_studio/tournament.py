@@ -0,0 +1,107 @@
+# Ollama Diamond Studio v12.5
+# Copyright (c) 2026 Marinos
+# Licensed under the MIT License (see LICENSE file for details)
+
+"""N-way τουρνουά μοντέλων με scheduler που ελαχιστοποιεί τα model swaps.
+
+Ο Ollama ξαναφορτώνει το μοντέλο όταν αλλάζει το μοντέλο ή το num_ctx, οπότε
+η παλιά σειρά "A, B σε κάθε context" προκαλούσε reload σε κάθε βήμα. Εδώ όλα
+τα επίπεδα context και τα trials ενός μοντέλου τρέχουν μαζί, με ρητό keep_alive,
+και το μοντέλο γίνεται unload πριν φορτωθεί το επόμενο.
+"""
+
+import math
+from itertools import combinations
+
+from .engine import STRESS_PROMPT, run_stress, _noop_log
+from .stats import holm_adjust, mean_ci, welch_t_test
+from .trials import TrialPolicy, unload_model
+
+
+def schedule_runs(models, contexts):
+    """Σειρά (μοντέλο, num_ctx) ομαδοποιημένη ανά μοντέλο, με αύξουσα σειρά context."""
+    return [(m, ctx) for m in models for ctx in sorted(contexts)]
+
+
+def count_reloads(steps):
+    """Πόσες φορτώσεις μοντέλου προκαλεί μια σειρά βημάτων (μοντέλο, num_ctx)."""
+    reloads, prev = 0, None
+    for step in steps:
+        if step != prev:
+            reloads += 1
+            prev = step
+    return reloads
+
+
+def run_tournament(models, contexts=None, policy=None, stream=False, prompt=STRESS_PROMPT,
+                   keep_alive="10m", sampler=None, client=None, log=None, workload=None, thermal=None):
+    """Τρέχει όλα τα μοντέλα με swap-minimizing σειρά· ένα record ανά trial (kind="tournament")."""
+    log = log or _noop_log
+    contexts = sorted(contexts or [8192, 16384])
+    policy = policy or TrialPolicy(warmup=1, min_trials=3, max_trials=10, ci_target=0.05)
+    schedule = schedule_runs(models, contexts)
+    # Σύγκριση με την "interleaved" σειρά (όλα τα μοντέλα ανά trial και context)
+    interleaved = [(m, ctx) for ctx in contexts for _ in range(policy.min_trials) for m in models]
+    log(f"🏆 Τουρνουά {len(models)} μοντέλων × {len(contexts)} contexts: "
+        f"{count_reloads(schedule)} φορτώσεις (αντί για {count_reloads(interleaved)} interleaved)")
+
+    for model in models:
+        for rec in run_stress(model, contexts, stream=stream, prompt=prompt, keep_alive=keep_alive,
+                              sampler=sampler, client=client, log=log, policy=policy, workload=workload,
+                              thermal=thermal):
+            rec["kind"] = "tournament"
+            yield rec
+        if not policy.cold:
+            # Ρητό unload ώστε το επόμενο μοντέλο να βρει ελεύθερη VRAM
+            try:
+                unload_model(model, client)
+            except Exception as e:
+                log(f"⚠️ Unload {model}: {e}", "error")
+    log("🏁 Το τουρνουά ολοκληρώθηκε.")
+
+
+def summarize_tournament(records, metric="eval_tps", confidence=0.95, alpha=0.05):
+    """Αποτελέσματα ανά μοντέλο/context και pairwise σημαντικότητα (Welch + Holm).
+
+    Επιστρέφει (standings, pairs): standings ταξινομημένα ανά context και
+    κατάταξη, pairs με διορθωμένο p-value και νικητή μόνο όταν p < alpha.
+    """
+    groups = {}
+    for rec in records:
+        if rec.get("status") == "ok" and rec.get(metric) is not None:
+            groups.setdefault((rec["model"], rec["num_ctx"]), []).append(rec)
+
+    standings = []
+    for (model, ctx), recs in groups.items():
+        values = [r[metric] for r in recs]
+        m, half = mean_ci(values, confidence)
+        loads = [r["load_duration"] for r in recs if r.get("load_duration") is not None]
+        standings.append({
+            "model": model, "num_ctx": ctx, "mean": m, "ci": None if math.isinf(half) else half,
+            "n": len(values), "load_ms": (sum(loads) / len(loads) / 1e6) if loads else None,
+            "values": values,
+        })
+    standings.sort(key=lambda s: (s["num_ctx"], -s["mean"]))
+    for ctx in {s["num_ctx"] for s in standings}:
+        ranked = [s for s in standings if s["num_ctx"] == ctx]
+        for rank, s in enumerate(ranked, 1):
+            s["rank"] = rank
+
+    pairs = []
+    for ctx in sorted({s["num_ctx"] for s in standings}):
+        ranked = [s for s in standings if s["num_ctx"] == ctx]
+        ctx_pairs = []
+        for x, y in combinations(ranked, 2):
+            _, _, p = welch_t_test(x["values"], y["values"])
+            ctx_pairs.append({
+                "num_ctx": ctx, "model_x": x["model"], "model_y": y["model"],
+                "mean_x": x["mean"], "mean_y": y["mean"],
+                "diff_pct": (x["mean"] - y["mean"]) / y["mean"] * 100 if y["mean"] else 0,
+                "p_value": p,
+            })
+        for pair, p_adj in zip(ctx_pairs, holm_adjust([p["p_value"] for p in ctx_pairs])):
+            pair["p_adj"] = p_adj
+            pair["significant"] = p_adj < alpha
+            pair["winner"] = (pair["model_x"] if pair["mean_x"] > pair["mean_y"] else pair["model_y"]) if pair["significant"] else None
+        pairs.extend(ctx_pairs)
+    return standings, pairs
@@ -0,0 +1,100 @@
+# Ollama Diamond Studio v12.5
+# Copyright (c) 2026 Marinos
+# Licensed under the MIT License (see LICENSE file for details)
+
+"""Trial controller: warm-up, cold/warm runs και adaptive επανάληψη ανά σημείο."""
+
+import math
+
+import ollama
+
+from .stats import mean_ci
+
+
+class TrialPolicy:
+    """Κανόνες επανάληψης ενός σημείου μέτρησης (π.χ. ενός επιπέδου num_ctx).
+
+    - warmup: αριθμός επαναλήψεων πριν τις μετρήσεις (δεν καταγράφονται).
+    - cold: κάθε trial ξεκινά με unload του μοντέλου και τρέχει με keep_alive=0,
+      ώστε το load_duration να μετριέται σκόπιμα.
+    - min_trials / max_trials: όρια επαναλήψεων.
+    - ci_target: σταματά όταν το μισό πλάτος του CI της μετρικής είναι
+      μικρότερο από αυτό το ποσοστό του μέσου όρου (π.χ. 0.05 = ±5%).
+    """
+
+    def __init__(self, warmup=0, cold=False, min_trials=1, max_trials=1,
+                 ci_target=None, confidence=0.95, metric="eval_tps"):
+        self.warmup = warmup
+        self.cold = cold
+        self.min_trials = max(1, min_trials)
+        self.max_trials = max(self.min_trials, max_trials)
+        self.ci_target = ci_target
+        self.confidence = confidence
+        self.metric = metric
+
+    @classmethod
+    def fixed(cls, trials, **kwargs):
+        """Σταθερός αριθμός επαναλήψεων (η παλιά συμπεριφορά του --repeat)."""
+        return cls(min_trials=trials, max_trials=trials, **kwargs)
+
+    @property
+    def phase(self):
+        return "cold" if self.cold else "warm"
+
+    def stats(self, values):
+        """Τρέχοντα στατιστικά: (μέσος, μισό πλάτος CI, σχετικό CI)."""
+        m, half = mean_ci(values, self.confidence)
+        rel = half / m if m and not math.isinf(half) else math.inf
+        return m, half, rel
+
+    def done(self, values):
+        """True όταν δεν χρειάζονται άλλα trials για αυτό το σημείο."""
+        n = len(values)
+        if n >= self.max_trials:
+            return True
+        if n < self.min_trials:
+            return False
+        return self.ci_target is None or self.converged(values)
+
+    def converged(self, values):
+        """True αν το σχετικό CI έπεσε κάτω από το ci_target (None αν δεν υπάρχει στόχος)."""
+        if self.ci_target is None:
+            return None
+        return self.stats(values)[2] <= self.ci_target
+
+
+def unload_model(model, client=None):
+    """Αφαιρεί το μοντέλο από τη VRAM (generate χωρίς prompt με keep_alive=0)."""
+    client = client or ollama
+    client.generate(model=model, keep_alive=0)
+
+
+def trial_fields(policy, values):
+    """Πεδία τρεχόντων στατιστικών που προστίθενται σε κάθε trial record."""
+    m, half, rel = policy.stats(values)
+    return {
+        "trials_n": len(values),
+        "metric_mean": m,
+        "metric_ci": None if math.isinf(half) else half,
+        "metric_rel_ci": None if math.isinf(rel) else rel,
+        "converged": policy.converged(values),
+    }
+
+
+def aggregate_trials(records):
+    """Συνοψίζει τα trials ενός σημείου σε ένα record (μέσοι όροι, peak = max, min = min)."""
+    ok = [r for r in records if r.get("status") == "ok"]
+    if not ok:
+        return None
+    agg = dict(ok[-1])
+    for key, value in ok[-1].items():
+        if not isinstance(value, (int, float)) or isinstance(value, bool) or key in ("ts", "trial", "num_ctx", "trials_n"):
+            continue
+        values = [r[key] for r in ok if r.get(key) is not None]
+        if key.endswith("_peak"):
+            agg[key] = max(values)
+        elif key.endswith("_min"):
+            agg[key] = min(values)
+        elif not key.startswith("metric_"):
+            agg[key] = sum(values) / len(values)
+    return agg
@@ -0,0 +1,321 @@
+# Ollama Diamond Studio v12.5
+# Copyright (c) 2026 Marinos
+# Licensed under the MIT License (see LICENSE file for details)
+
+"""Pre-flight εκτίμηση VRAM από τα GGUF metadata και το KV-cache.
+
+Το header του GGUF διαβάζεται με mmap κατευθείαν από το blob store του
+Ollama, χωρίς να φορτωθούν τα weights. Από layers, KV heads, head dim και
+quantization προκύπτει η εκτίμηση weights + KV cache + compute graph + overhead
+για οποιοδήποτε num_ctx. Αν το blob δεν είναι τοπικό (απομακρυσμένος
+server), τα ίδια κλειδιά διαβάζονται από το ollama.show().
+
+Κάθε run καταγράφει εκτίμηση και μέτρηση (size_vram του ollama.ps()), ώστε
+ο συντελεστής διόρθωσης να βαθμονομείται με τον χρόνο.
+"""
+
+import json
+import mmap
+import os
+import struct
+import threading
+import time
+
+import ollama
+
+from .engine import _noop_log
+from .paths import blob_path, data_path, ollama_models_dir
+from .stats import percentile
+
+GGUF_MAGIC = b"GGUF"
+MODEL_MEDIA_TYPE = "application/vnd.ollama.image.model"
+
+# GGUF value types -> struct format (8 = string, 9 = array)
+_SCALARS = {0: "B", 1: "b", 2: "H", 3: "h", 4: "I", 5: "i", 6: "f", 7: "?", 10: "Q", 11: "q", 12: "d"}
+_STRING, _ARRAY = 8, 9
+_U64 = struct.Struct("<Q")
+
+# general.file_type -> όνομα quantization (τα συνηθέστερα)
+FILE_TYPES = {
+    0: "F32", 1: "F16", 2: "Q4_0", 3: "Q4_1", 7: "Q8_0", 8: "Q5_0", 9: "Q5_1", 10: "Q2_K",
+    11: "Q3_K_S", 12: "Q3_K_M", 13: "Q3_K_L", 14: "Q4_K_S", 15: "Q4_K_M", 16: "Q5_K_S",
+    17: "Q5_K_M", 18: "Q6_K", 32: "BF16",
+}
+
+# Bytes ανά στοιχείο του KV cache (OLLAMA_KV_CACHE_TYPE)
+KV_BYTES = {"f16": 2.0, "q8_0": 34 / 32, "q4_0": 18 / 32}
+
+# CUDA context, cuBLAS workspace κ.λπ. (MB), ανεξάρτητα από το μοντέλο
+OVERHEAD_MB = 350
+MB = 1024 ** 2
+
+
+class _Reader:
+    def __init__(self, buf):
+        self.buf = buf
+        self.pos = 0
+
+    def unpack(self, fmt):
+        values = struct.unpack_from("<" + fmt, self.buf, self.pos)
+        self.pos += struct.calcsize("<" + fmt)
+        return values[0] if len(values) == 1 else values
+
+    def string(self):
+        n = self.unpack("Q")
+        value = bytes(self.buf[self.pos:self.pos + n]).decode("utf-8", errors="replace")
+        self.pos += n
+        return value
+
+    def value(self, vtype, max_array):
+        if vtype in _SCALARS:
+            return self.unpack(_SCALARS[vtype])
+        if vtype == _STRING:
+            return self.string()
+        if vtype == _ARRAY:
+            item_type, n = self.unpack("I"), self.unpack("Q")
+            if n > max_array:
+                # Μεγάλα arrays (π.χ. tokenizer.ggml.tokens) δεν κρατιούνται· μόνο το μήκος τους
+                if item_type in _SCALARS:
+                    self.pos += n * struct.calcsize(_SCALARS[item_type])
+                elif item_type == _STRING:
+                    # Γρήγορη παράκαμψη: μόνο τα μήκη των strings, χωρίς decode
+                    unpack, buf, pos = _U64.unpack_from, self.buf, self.pos
+                    for _ in range(n):
+                        pos += 8 + unpack(buf, pos)[0]
+                    self.pos = pos
+                else:
+                    for _ in range(n):
+                        self.value(item_type, 0)
+                return {"array_length": n}
+            return [self.value(item_type, max_array) for _ in range(n)]
+        raise ValueError(f"Άγνωστος τύπος GGUF: {vtype}")
+
+
+def read_gguf_metadata(path, max_array=1024):
+    """Τα key/value metadata ενός GGUF (v2/v3) μέσω mmap, χωρίς ανάγνωση των tensors."""
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+        if buf[:4] != GGUF_MAGIC:
+            raise ValueError(f"Δεν είναι GGUF: {path}")
+        r = _Reader(buf)
+        r.pos = 4
+        version = r.unpack("I")
+        if version < 2:
+            raise ValueError(f"Μη υποστηριζόμενη έκδοση GGUF: {version}")
+        _, kv_count = r.unpack("QQ")
+        meta = {}
+        for _ in range(kv_count):
+            key = r.string()
+            meta[key] = r.value(r.unpack("I"), max_array)
+    return meta
+
+
+def manifest_path(model):
+    """Διαδρομή του manifest ενός μοντέλου (π.χ. llama3.2:3b) στο τοπικό Ollama."""
+    name, tag = model, "latest"
+    if ":" in model.rsplit("/", 1)[-1]:
+        name, tag = model.rsplit(":", 1)
+    parts = name.split("/")
+    if len(parts) == 1:
+        parts = ["registry.ollama.ai", "library"] + parts
+    elif len(parts) == 2:
+        parts = ["registry.ollama.ai"] + parts
+    return os.path.join(ollama_models_dir(), "manifests", *parts, tag)
+
+
+def model_blob(model):
+    """Διαδρομή του GGUF blob ενός μοντέλου (None αν δεν υπάρχει τοπικά)."""
+    try:
+        with open(manifest_path(model), encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return None
+    for layer in manifest.get("layers", []):
+        if layer.get("mediaType") == MODEL_MEDIA_TYPE:
+            path = blob_path(layer["digest"])
+            return path if os.path.exists(path) else None
+    return None
+
+
+def model_metadata(model, client=None):
+    """(metadata, bytes weights, πηγή): από το τοπικό blob ή, αλλιώς, από το ollama.show()."""
+    path = model_blob(model)
+    if path:
+        return read_gguf_metadata(path), os.path.getsize(path), "gguf"
+    client = client or ollama
+    meta = dict(client.show(model).modelinfo or {})
+    size = next((m.size for m in client.list().models if m.model == model), None)
+    return meta, size, "show"
+
+
+def _per_layer(value, layers):
+    """Τιμή ανά layer: κάποια μοντέλα δίνουν array (π.χ. head_count_kv ανά layer)."""
+    if isinstance(value, list):
+        return value[:layers] + [value[-1]] * (layers - len(value)) if value else [0] * layers
+    return [value or 0] * layers
+
+
+def estimate_vram(meta, weights_bytes, num_ctx, kv_type=None, num_batch=512, num_parallel=1, factor=1.0):
+    """Εκτίμηση VRAM (MB) για πλήρες offload στη GPU σε ένα num_ctx.
+
+    - KV cache: num_ctx × Σ_layers head_count_kv × (key_length + value_length) × bytes/στοιχείο
+    - compute graph: η ίδια προσέγγιση με τον scheduler του Ollama (μεγαλύτερο από
+      attention scores και logits ενός batch)
+    - overhead: σταθερό κόστος CUDA context
+
+    Ο συντελεστής βαθμονόμησης εφαρμόζεται μόνο στο model_mb (weights + KV
+    cache + graph), το μέρος που αναφέρει το size_vram του ollama ps· το
+    overhead δεν εμφανίζεται εκεί και προστίθεται αμετάβλητο.
+    """
+    arch = meta.get("general.architecture", "llama")
+
+    def get(key, default=None):
+        return meta.get(f"{arch}.{key}", default)
+
+    layers = int(get("block_count", 0) or 0)
+    n_embd = int(get("embedding_length", 0) or 0)
+    heads = _per_layer(get("attention.head_count", 0), layers)
+    heads_kv = _per_layer(get("attention.head_count_kv", get("attention.head_count", 0)), layers)
+    n_head = max(heads) if heads else 0
+    head_k = get("attention.key_length") or (n_embd // n_head if n_head else 0)
+    head_v = get("attention.value_length") or head_k
+    tokens = meta.get("tokenizer.ggml.tokens")
+    n_vocab = get("vocab_size") or (tokens.get("array_length") if isinstance(tokens, dict) else len(tokens or []))
+
+    kv_type = (kv_type or os.environ.get("OLLAMA_KV_CACHE_TYPE") or "f16").lower()
+    per_token = sum(h * (head_k + head_v) for h in heads_kv) * KV_BYTES.get(kv_type, 2.0)
+    ctx = num_ctx * num_parallel
+    kv_cache = ctx * per_token
+    graph = max(4 * num_batch * (1 + 4 * n_embd + ctx * (1 + n_head)), 4 * num_batch * (n_embd + n_vocab))
+    weights = weights_bytes or 0
+    model_mb = (weights + kv_cache + graph) / MB
+    file_type = meta.get("general.file_type")
+    return {
+        "num_ctx": num_ctx,
+        "weights_mb": weights / MB,
+        "kv_cache_mb": kv_cache / MB,
+        "graph_mb": graph / MB,
+        "overhead_mb": OVERHEAD_MB,
+        "model_mb": model_mb,
+        "predicted_mb": model_mb * factor + OVERHEAD_MB,
+        "factor": factor,
+        "layers": layers,
+        "kv_heads": max(heads_kv) if heads_kv else None,
+        "head_dim": head_k,
+        "kv_type": kv_type,
+        "quantization": FILE_TYPES.get(file_type, file_type),
+    }
+
+
+class VramCalibration:
+    """Ζεύγη εκτίμησης/μέτρησης σε JSON· ο συντελεστής είναι η διάμεσος του λόγου τους."""
+
+    def __init__(self, path=None, keep=200, min_samples=3):
+        self.path = path or data_path("vram_calibration.json")
+        self.keep = keep
+        self.min_samples = min_samples
+        self.lock = threading.Lock()
+
+    def _load(self):
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return []
+
+    def add(self, model, digest, num_ctx, predicted_mb, observed_mb):
+        """Ένα ζεύγος: predicted_mb χωρίς overhead (το model_mb) και το size_vram του ps."""
+        with self.lock:
+            samples = self._load()
+            samples.append({"ts": time.time(), "model": model, "digest": digest, "num_ctx": num_ctx,
+                            "predicted_mb": predicted_mb, "observed_mb": observed_mb, "basis": "model"})
+            with open(self.path, "w", encoding="utf-8") as f:
+                json.dump(samples[-self.keep:], f, indent=2)
+
+    def factor(self):
+        """Διάμεσος observed/predicted (1.0 χωρίς αρκετά δείγματα).
+
+        Παλαιότερα δείγματα χωρίς basis είχαν το overhead στην εκτίμηση και αγνοούνται.
+        """
+        with self.lock:
+            ratios = [s["observed_mb"] / s["predicted_mb"] for s in self._load()
+                      if s.get("predicted_mb") and s.get("basis") == "model"]
+        return percentile(ratios, 50) if len(ratios) >= self.min_samples else 1.0
+
+
+def vram_budget(sampler=None, client=None, timeout=2.0):
+    """Διαθέσιμη VRAM (MB) για το Ollama: συνολική μείον ό,τι χρησιμοποιούν άλλες διεργασίες.
+
+    Η χρήση των άλλων διεργασιών είναι η τρέχουσα χρήση μείον το size_vram των
+    μοντέλων που έχει ήδη φορτώσει ο Ollama. None αν δεν υπάρχει GPU telemetry.
+    """
+    if sampler is None:
+        return None
+    deadline = time.monotonic() + timeout
+    sample = sampler.latest()
+    while (not sample or sample.get("total") is None) and time.monotonic() < deadline:
+        time.sleep(0.1)
+        sample = sampler.latest()
+    if not sample or sample.get("total") is None:
+        return None
+    try:
+        loaded = sum(m.size_vram for m in (client or ollama).ps().models) / MB
+    except Exception:
+        loaded = 0
+    others = max(0.0, (sample["used"] or 0) - loaded)
+    return sample["total"] - others
+
+
+def preflight(models, contexts, budget_mb=None, calibration=None, client=None, log=None, **kwargs):
+    """Εκτιμήσεις ανά (μοντέλο, num_ctx) με "fits" (None αν δεν υπάρχει budget ή metadata)."""
+    log = log or _noop_log
+    factor = calibration.factor() if calibration else 1.0
+    estimates = {}
+    for model in models:
+        try:
+            meta, weights, source = model_metadata(model, client)
+        except Exception as e:
+            log(f"⚠️ Pre-flight VRAM {model}: {e}", "error")
+            continue
+        for ctx in contexts:
+            est = estimate_vram(meta, weights, ctx, factor=factor, **kwargs)
+            est["source"] = source
+            est["budget_mb"] = budget_mb
+            est["fits"] = None if budget_mb is None else est["predicted_mb"] <= budget_mb
+            estimates[(model, ctx)] = est
+            if est["fits"] is False:
+                log(f"⚠️ {model} @ {ctx} ctx: εκτίμηση {est['predicted_mb']:.0f} MB > {budget_mb:.0f} MB "
+                    f"διαθέσιμα (KV {est['kv_cache_mb']:.0f} MB) → θα γίνει offload στη CPU", "error")
+    return estimates
+
+
+def fitting_contexts(estimates, models, contexts):
+    """Τα contexts όπου κανένα μοντέλο δεν προβλέπεται να ξεχειλίσει στη CPU."""
+    return [c for c in contexts if all(estimates.get((m, c), {}).get("fits") is not False for m in models)]
+
+
+def annotate_vram(records, estimates, client=None, calibration=None, digests=None):
+    """Προσθέτει vram_predicted / vram_observed (MB) στα records και βαθμονομεί.
+
+    Το observed είναι το size_vram του ollama.ps() στο πρώτο επιτυχημένο trial
+    κάθε (μοντέλο, num_ctx). Δείγματα με μερικό offload δεν χρησιμοποιούνται
+    στη βαθμονόμηση, γιατί εκεί η VRAM είναι κομμένη.
+    """
+    client = client or ollama
+    observed = {}
+    for rec in records:
+        key = (rec.get("model"), rec.get("num_ctx"))
+        est = estimates.get(key)
+        rec["vram_predicted"] = est["predicted_mb"] if est else None
+        if rec.get("status") == "ok" and key not in observed:
+            observed[key] = None
+            try:
+                loaded = next((m for m in client.ps().models if m.model == key[0] or m.name == key[0]), None)
+            except Exception:
+                loaded = None
+            if loaded is not None:
+                observed[key] = loaded.size_vram / MB
+                if calibration is not None and est and loaded.size and loaded.size_vram >= loaded.size:
+                    calibration.add(key[0], (digests or {}).get(key[0]), key[1],
+                                    est["model_mb"], observed[key])
+        rec["vram_observed"] = observed.get(key)
+        yield rec
@@ -0,0 +1,283 @@
+# Ollama Diamond Studio v12.5
+# Copyright (c) 2026 Marinos
+# Licensed under the MIT License (see LICENSE file for details)
+
+"""Watchdog καθυστέρησης του API και επανεκκίνηση του server με έλεγχο ετοιμότητας.
+
+Ο LatencyWatchdog στέλνει ένα ελαφρύ αίτημα (προεπιλογή /api/ps, που περνά
+από τον scheduler του server) ανά `interval` και κρατά ιστορικό latency και
+σφαλμάτων, με p50/p99 και error rate. Όταν ξεπεραστούν τα όρια του
+WatchdogPolicy, γράφει στο log και, αν ζητηθεί, επανεκκινεί τον τοπικό server.
+Η επανεκκίνηση δεν περιμένει σταθερά δευτερόλεπτα: ελέγχει με backoff πότε ο
+server σταμάτησε και πότε αποκρίνεται ξανά.
+"""
+
+import os
+import subprocess
+import sys
+import threading
+import time
+import urllib.request
+from collections import deque
+from urllib.parse import urlparse
+
+from .engine import _noop_log
+from .server import resolve_host
+from .stats import percentile
+from .telemetry import NO_WINDOW
+
+PROBE_ENDPOINT = "/api/ps"
+LOCAL_HOSTS = ("127.0.0.1", "localhost", "::1")
+
+
+def probe(host=None, endpoint=PROBE_ENDPOINT, timeout=2.0, tap=None):
+    """Ένα αίτημα στον server: (latency σε s, None) ή (None, μήνυμα σφάλματος).
+
+    Το tap (αν δοθεί) λαμβάνει το σώμα μιας επιτυχημένης απάντησης, π.χ. τη
+    λίστα του /api/ps για τον metrics exporter, χωρίς δεύτερο αίτημα.
+    """
+    t0 = time.perf_counter()
+    try:
+        with urllib.request.urlopen(f"{resolve_host(host)}{endpoint}", timeout=timeout) as resp:
+            body = resp.read()
+    except Exception as e:
+        return None, str(e) or type(e).__name__
+    latency = time.perf_counter() - t0
+    if tap:
+        tap(body)
+    return latency, None
+
+
+def _poll(check, timeout, first=0.1, factor=1.5, max_delay=2.0, sleep=time.sleep):
+    """Καλεί το check() με εκθετικό backoff μέχρι να επιστρέψει True: δευτερόλεπτα ή None (timeout)."""
+    t0 = time.monotonic()
+    delay = first
+    while True:
+        if check():
+            return time.monotonic() - t0
+        if time.monotonic() - t0 >= timeout:
+            return None
+        sleep(delay)
+        delay = min(delay * factor, max_delay)
+
+
+def wait_ready(host=None, timeout=60.0, sleep=time.sleep):
+    """Περιμένει μέχρι ο server να αποκρίνεται (/api/version): δευτερόλεπτα ή None."""
+    return _poll(lambda: probe(host, "/api/version", 1.0)[1] is None, timeout, sleep=sleep)
+
+
+def wait_down(host=None, timeout=10.0, sleep=time.sleep):
+    """Περιμένει μέχρι ο server να σταματήσει να αποκρίνεται: δευτερόλεπτα ή None."""
+    return _poll(lambda: probe(host, "/api/version", 1.0)[1] is not None, timeout, sleep=sleep)
+
+
+def is_local(host=None):
+    return urlparse(resolve_host(host)).hostname in LOCAL_HOSTS
+
+
+def kill_command():
+    """Εντολή τερματισμού του ollama για το τρέχον λειτουργικό."""
+    if sys.platform == "win32":
+        return ["taskkill", "/f", "/im", "ollama.exe"]
+    return ["pkill", "-x", "ollama"]
+
+
+def restart_server(host=None, ready_timeout=60.0, log=None, sleep=time.sleep, env=None):
+    """Τερματίζει και ξεκινά τον τοπικό `ollama serve`· επιστρέφει ένα record (kind="restart").
+
+    Αν ένας supervisor (systemd, Ollama.app) ξεκινήσει μόνος του τον server
+    μετά τον τερματισμό, δεν ξεκινά δεύτερη διεργασία (και το `env`, π.χ.
+    OLLAMA_FLASH_ATTENTION, δεν εφαρμόζεται· spawned=False στο record).
+    """
+    log = log or _noop_log
+    host = resolve_host(host)
+    rec = {"kind": "restart", "ts": time.time(), "host": host, "killed": False, "down_s": None,
+           "spawned": False, "ready_s": None, "status": None, "error": None}
+    if not is_local(host):
+        rec.update(status="error", error=f"Ο {host} δεν είναι τοπικός· επανεκκίνηση μόνο στον ίδιο υπολογιστή")
+        log(f"❌ {rec['error']}", "error")
+        return rec
+    log("🔄 Επανεκκίνηση υπηρεσίας Ollama...")
+    try:
+        rec["killed"] = subprocess.run(kill_command(), stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                                       creationflags=NO_WINDOW).returncode == 0
+    except OSError as e:
+        log(f"⚠️ Τερματισμός: {e}", "error")
+    rec["down_s"] = wait_down(host, sleep=sleep)
+    if rec["down_s"] is None:
+        rec.update(status="error", error="Ο server αποκρίνεται ακόμα μετά τον τερματισμό")
+        log(f"❌ {rec['error']}", "error")
+        return rec
+    if probe(host, "/api/version", 1.0)[1] is not None:
+        try:
+            popen_kwargs = {"creationflags": NO_WINDOW} if sys.platform == "win32" else {"start_new_session": True}
+            subprocess.Popen(["ollama", "serve"], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                             env={**os.environ, **(env or {})}, **popen_kwargs)
+            rec["spawned"] = True
+        except OSError as e:
+            rec.update(status="error", error=f"ollama serve: {e}")
+            log(f"❌ {rec['error']}", "error")
+            return rec
+    log("⏳ Αναμονή μέχρι ο server να αποκρίνεται...")
+    rec["ready_s"] = wait_ready(host, ready_timeout, sleep=sleep)
+    if rec["ready_s"] is None:
+        rec.update(status="error", error=f"Ο server δεν αποκρίθηκε μέσα σε {ready_timeout:.0f} s")
+        log(f"❌ {rec['error']}", "error")
+    else:
+        rec["status"] = "ok"
+        log(f"✅ Ο Ollama είναι έτοιμος σε {rec['ready_s']:.1f} s.", "success")
+    return rec
+
+
+class WatchdogPolicy:
+    """Όρια του watchdog (None = χωρίς όριο).
+
+    - p99_ms: p99 latency των probes πάνω από το οποίο ο server θεωρείται κολλημένος.
+    - error_rate: κλάσμα αποτυχημένων probes (π.χ. 0.5).
+    - max_failures: συνεχόμενες αποτυχίες (πιάνει έναν server που "πάγωσε" σε δευτερόλεπτα).
+    - min_samples: δείγματα από την τελευταία επανεκκίνηση πριν ελεγχθούν p99 και error rate.
+    - cooldown: ελάχιστα δευτερόλεπτα μεταξύ δύο αυτόματων επανεκκινήσεων.
+    """
+
+    def __init__(self, p99_ms=None, error_rate=None, max_failures=3, min_samples=10, cooldown=120.0,
+                 auto_restart=False):
+        self.p99_ms = p99_ms
+        self.error_rate = error_rate
+        self.max_failures = max_failures
+        self.min_samples = min_samples
+        self.cooldown = cooldown
+        self.auto_restart = auto_restart
+
+
+class LatencyWatchdog:
+    """Περιοδικά probes στον server, ιστορικό latency / σφαλμάτων και (προαιρετικά) αυτόματη επανεκκίνηση."""
+
+    def __init__(self, host=None, interval=5.0, timeout=2.0, window=720, endpoint=PROBE_ENDPOINT,
+                 policy=None, log=None, on_restart=None, tap=None):
+        self.host = resolve_host(host)
+        self.interval = interval
+        self.timeout = timeout
+        self.endpoint = endpoint
+        self.policy = policy or WatchdogPolicy()
+        self.log = log or _noop_log
+        self.on_restart = on_restart
+        self.tap = tap
+        self.lock = threading.Lock()
+        self.restart_lock = threading.Lock()
+        self.history = deque(maxlen=window)
+        self.failures = 0
+        self.since = 0.0
+        self.last_restart = None
+        self.last_breach = None
+        self.stop_event = threading.Event()
+        self.thread = None
+
+    def probe_once(self):
+        """Ένα probe, καταγεγραμμένο στο ιστορικό: {"ts", "latency", "error"}."""
+        latency, error = probe(self.host, self.endpoint, self.timeout, self.tap)
+        sample = {"ts": time.time(), "latency": latency, "error": error}
+        with self.lock:
+            self.history.append(sample)
+            self.failures = self.failures + 1 if error else 0
+        return sample
+
+    def stats(self, since=None):
+        """p50 / p99 (ms) των επιτυχημένων probes, error rate και συνεχόμενες αποτυχίες."""
+        with self.lock:
+            samples = [s for s in self.history if since is None or s["ts"] >= since]
+            failures = self.failures
+        latencies = [s["latency"] * 1000 for s in samples if s["error"] is None]
+        return {
+            "p50_ms": percentile(latencies, 50) if latencies else None,
+            "p99_ms": percentile(latencies, 99) if latencies else None,
+            "error_rate": (len(samples) - len(latencies)) / len(samples) if samples else None,
+            "samples": len(samples),
+            "failures": failures,
+        }
+
+    def breach(self):
+        """Παραβίαση των ορίων (από την τελευταία επανεκκίνηση): (είδος, μήνυμα) ή None.
+
+        Το είδος ("failures", "error_rate", "p99") είναι σταθερό όσο διαρκεί η
+        παραβίαση· το μήνυμα περιέχει τις τρέχουσες τιμές.
+        """
+        p = self.policy
+        st = self.stats(self.since)
+        if p.max_failures and st["failures"] >= p.max_failures:
+            return "failures", f"{st['failures']} συνεχόμενα αποτυχημένα probes"
+        if st["samples"] < p.min_samples:
+            return None
+        if p.error_rate is not None and st["error_rate"] > p.error_rate:
+            return "error_rate", f"error rate {st['error_rate'] * 100:.0f}% > {p.error_rate * 100:.0f}%"
+        if p.p99_ms is not None and st["p99_ms"] is not None and st["p99_ms"] > p.p99_ms:
+            return "p99", f"p99 {st['p99_ms']:.0f} ms > {p.p99_ms:.0f} ms"
+        return None
+
+    def restart(self, reason=None, env=None):
+        """Επανεκκίνηση του server (μία τη φορά)· None αν τρέχει ήδη άλλη."""
+        if not self.restart_lock.acquire(blocking=False):
+            self.log("⏳ Η επανεκκίνηση του Ollama βρίσκεται ήδη σε εξέλιξη.")
+            return None
+        try:
+            if reason:
+                self.log(f"🚨 Watchdog: {reason}", "error")
+            rec = restart_server(self.host, log=self.log, env=env)
+            with self.lock:
+                # Νέα διεργασία: τα όρια ελέγχονται μόνο σε δείγματα μετά την επανεκκίνηση
+                self.since = time.time()
+                self.failures = 0
+            self.last_restart = time.monotonic()
+        finally:
+            self.restart_lock.release()
+        if self.on_restart:
+            self.on_restart(rec)
+        return rec
+
+    @property
+    def restarting(self):
+        return self.restart_lock.locked()
+
+    def run(self, duration=None):
+        """Ο βρόχος του watchdog: ένα record (kind="probe") ανά probe, μέχρι stop() ή `duration` s."""
+        end = time.monotonic() + duration if duration else None
+        while not self.stop_event.is_set() and (end is None or time.monotonic() < end):
+            if self.restarting:
+                # Χειροκίνητη επανεκκίνηση από άλλο thread: τα probes θα μετρούσαν ως σφάλματα
+                self.stop_event.wait(self.interval)
+                continue
+            sample = self.probe_once()
+            kind, reason = self.breach() or (None, None)
+            restarted = False
+            if kind:
+                p = self.policy
+                cooled = self.last_restart is None or time.monotonic() - self.last_restart >= p.cooldown
+                if p.auto_restart and cooled:
+                    restarted = bool(self.restart(reason))
+                elif kind != self.last_breach:
+                    # Μία γραμμή στην αρχή κάθε παραβίασης, όχι σε κάθε probe
+                    self.log(f"⚠️ Watchdog: {reason}", "error")
+            elif self.last_breach:
+                self.log("✅ Watchdog: το API αποκρίνεται ξανά κανονικά.", "success")
+            self.last_breach = None if restarted else kind
+            yield {
+                "kind": "probe", "ts": sample["ts"], "host": self.host, "endpoint": self.endpoint,
+                "latency_ms": sample["latency"] * 1000 if sample["latency"] is not None else None,
+                "status": "error" if sample["error"] else "ok", "error": sample["error"],
+                **self.stats(), "breach": reason, "restarted": restarted,
+            }
+            self.stop_event.wait(self.interval)
+
+    def start(self):
+        """Τρέχει τον βρόχο σε daemon thread (για το GUI)."""
+        if self.thread and self.thread.is_alive():
+            return
+        self.stop_event.clear()
+        self.thread = threading.Thread(target=self._loop, daemon=True)
+        self.thread.start()
+
+    def _loop(self):
+        for _ in self.run():
+            pass
+
+    def stop(self):
+        self.stop_event.set()
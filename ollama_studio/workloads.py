@@ -0,0 +1,173 @@
+# Ollama Diamond Studio v12.5
+# Copyright (c) 2026 Marinos
+# Licensed under the MIT License (see LICENSE file for details)
+
+"""Workloads που γεμίζουν πραγματικά το context.
+
+Ένα σύντομο prompt σε num_ctx=32768 μετρά μόνο την κράτηση του KV cache, όχι
+την επεξεργασία 32K tokens. Ένα Workload χτίζει ντετερμινιστικό prompt που
+καλύπτει ένα ποσοστό του num_ctx (π.χ. 25/50/90%) από ένα corpus (code, chat,
+summarization ή αρχείο με πραγματικό traffic). Το μήκος της εξόδου
+σταθεροποιείται με num_predict, ώστε prefill και decode να μετριούνται χωριστά.
+"""
+
+import random
+
+# Η πρώτη γραμμή κάθε prompt είναι μοναδική ανά trial: έτσι ο Ollama δεν
+# ξαναχρησιμοποιεί το KV cache του προηγούμενου trial και το prefill μετριέται ολόκληρο.
+HEADER = "[benchmark session {seed}-{num_ctx}-{tag}]\n"
+
+# Περιθώριο tokens για το template του μοντέλου και την οδηγία στο τέλος
+PROMPT_MARGIN = 64
+
+
+class Corpus:
+    """Πηγή κειμένου: `chunk(rng)` επιστρέφει ένα κομμάτι, η `instruction` μπαίνει στο τέλος."""
+
+    def __init__(self, name, chunk, instruction, chars_per_token=4.0):
+        self.name = name
+        self.chunk = chunk
+        self.instruction = instruction
+        self.chars_per_token = chars_per_token
+
+
+_NOUNS = ["cache", "request", "buffer", "session", "tensor", "queue", "worker", "layer", "token", "report",
+          "invoice", "customer", "sensor", "schedule", "metric", "policy", "document", "shipment"]
+_VERBS = ["load", "parse", "update", "merge", "validate", "flush", "resolve", "render", "compute", "archive"]
+_ADJ = ["pending", "stale", "active", "remote", "local", "partial", "nightly", "regional", "primary", "cached"]
+
+
+def _code_chunk(rng):
+    verb, noun, adj = rng.choice(_VERBS), rng.choice(_NOUNS), rng.choice(_ADJ)
+    limit = rng.randint(2, 64)
+    return (
+        f"def {verb}_{adj}_{noun}(items, limit={limit}):\n"
+        f"    \"\"\"{verb.capitalize()} every {adj} {noun} up to the limit.\"\"\"\n"
+        f"    result = []\n"
+        f"    for index, item in enumerate(items):\n"
+        f"        if index >= limit:\n"
+        f"            break\n"
+        f"        if item.get(\"{noun}_state\") == \"{adj}\":\n"
+        f"            result.append({verb}_{noun}(item, retries={rng.randint(1, 5)}))\n"
+        f"    return result\n\n"
+    )
+
+
+def _chat_chunk(rng):
+    noun, adj, verb = rng.choice(_NOUNS), rng.choice(_ADJ), rng.choice(_VERBS)
+    return (
+        f"User: Why does the {adj} {noun} fail to {verb} after the last deployment?\n"
+        f"Assistant: The {noun} is probably still marked as {adj}. Try to {verb} it manually, "
+        f"then check the logs for errors around step {rng.randint(1, 20)}.\n"
+        f"User: I did that and it took {rng.randint(2, 90)} seconds. Is that expected?\n"
+        f"Assistant: For {rng.randint(10, 5000)} items that is within the normal range.\n\n"
+    )
+
+
+def _summary_chunk(rng):
+    noun, adj, verb = rng.choice(_NOUNS), rng.choice(_ADJ), rng.choice(_VERBS)
+    pct = rng.randint(3, 60)
+    return (
+        f"In quarter {rng.randint(1, 4)}, the team responsible for the {adj} {noun} pipeline reported that "
+        f"the time needed to {verb} each {noun} changed by {pct} percent. The change was attributed to a new "
+        f"{rng.choice(_ADJ)} {rng.choice(_NOUNS)} strategy that was introduced in {rng.randint(3, 40)} regions. "
+        f"Analysts noted that further work is required before the approach can be applied to every "
+        f"{rng.choice(_NOUNS)}.\n\n"
+    )
+
+
+CORPORA = {
+    "code": Corpus("code", _code_chunk, "Review the code above and list the three most important bugs.", 3.2),
+    "chat": Corpus("chat", _chat_chunk, "Assistant: Summarize the conversation so far in one paragraph.", 4.0),
+    "summarization": Corpus("summarization", _summary_chunk, "Summarize the document above in five bullet points.", 4.5),
+}
+
+
+def corpus_text(corpus, rng, chars):
+    """Κείμενο ~`chars` χαρακτήρων από διαδοχικά κομμάτια του corpus."""
+    parts, size = [], 0
+    while size < chars:
+        chunk = corpus.chunk(rng)
+        parts.append(chunk)
+        size += len(chunk)
+    return "".join(parts)[:max(0, chars)]
+
+
+def register_corpus(corpus):
+    """Προσθέτει ένα corpus στο registry (π.χ. δείγματα από τα δικά μας logs)."""
+    CORPORA[corpus.name] = corpus
+
+
+def file_corpus(path, instruction="Summarize the text above.", chars_per_token=4.0):
+    """Corpus από αρχείο κειμένου: παράγραφοι (χωρισμένες με κενή γραμμή) σε ντετερμινιστική σειρά."""
+    with open(path, encoding="utf-8") as f:
+        paragraphs = [p.strip() + "\n\n" for p in f.read().split("\n\n") if p.strip()]
+    if not paragraphs:
+        raise ValueError(f"Κενό corpus: {path}")
+    return Corpus(f"file:{path}", lambda rng: rng.choice(paragraphs), instruction, chars_per_token)
+
+
+def get_corpus(name):
+    """Corpus από το όνομα του registry ή από "file:<path>"."""
+    if name.startswith("file:"):
+        return file_corpus(name[5:])
+    if name not in CORPORA:
+        raise ValueError(f"Άγνωστο corpus: {name} (διαθέσιμα: {', '.join(CORPORA)}, file:<path>)")
+    return CORPORA[name]
+
+
+class Workload:
+    """Prompt που γεμίζει `fill` × num_ctx, με σταθερό num_predict.
+
+    Το μήκος σε tokens εκτιμάται από χαρακτήρες/token του corpus και
+    διορθώνεται με observe() από το πραγματικό prompt_eval_count (π.χ. στο warm-up).
+    """
+
+    def __init__(self, corpus="summarization", fill=0.5, num_predict=128, seed=0):
+        self.corpus = corpus if isinstance(corpus, Corpus) else get_corpus(corpus)
+        self.fill = fill
+        self.num_predict = num_predict
+        self.seed = seed
+        self.chars_per_token = self.corpus.chars_per_token
+        self.calibrated = False
+        self._bodies = {}
+
+    @property
+    def key(self):
+        """Ταυτότητα του workload για το ιστορικό (ίδιο key = συγκρίσιμα runs)."""
+        return f"{self.corpus.name}@{self.fill:g}/{self.num_predict}"
+
+    def target_tokens(self, num_ctx):
+        return max(1, min(int(num_ctx * self.fill), num_ctx - self.num_predict - PROMPT_MARGIN))
+
+    def _body(self, num_ctx):
+        budget = int(self.target_tokens(num_ctx) * self.chars_per_token) - len(self.corpus.instruction)
+        key = (num_ctx, budget)
+        if key not in self._bodies:
+            # Ίδιο seed + num_ctx -> ίδιο κείμενο σε κάθε run και κάθε μηχάνημα
+            rng = random.Random(f"{self.corpus.name}:{self.seed}:{num_ctx}")
+            self._bodies[key] = corpus_text(self.corpus, rng, budget)
+        return self._bodies[key]
+
+    def prompt(self, num_ctx, tag=0):
+        return HEADER.format(seed=self.seed, num_ctx=num_ctx, tag=tag) + self._body(num_ctx) + "\n\n" + self.corpus.instruction
+
+    def options(self, num_ctx):
+        return {"num_ctx": num_ctx, "num_predict": self.num_predict, "temperature": 0, "seed": self.seed}
+
+    def observe(self, prompt, prompt_eval_count, num_ctx=None):
+        """Διορθώνει τους χαρακτήρες/token από μια πραγματική μέτρηση.
+
+        Η διόρθωση γίνεται μία φορά, ώστε σε ένα τουρνουά όλα τα μοντέλα να
+        παίρνουν το ίδιο κείμενο. Εξαίρεση: αν το prompt κόπηκε από τον server.
+        """
+        if not prompt_eval_count:
+            return
+        truncated = num_ctx and prompt_eval_count >= num_ctx - PROMPT_MARGIN
+        if self.calibrated and not truncated:
+            return
+        self.chars_per_token = len(prompt) / prompt_eval_count
+        if truncated:
+            # Τα πραγματικά tokens ήταν περισσότερα από όσα μετρήθηκαν
+            self.chars_per_token *= 0.8
+        self.calibrated = True